@@ -0,0 +1,200 @@
+"""Peak and retained memory profiling of zincio's read and write paths.
+
+Each stage is run twice: once while a background thread samples the process
+RSS, and once under `tracemalloc`, which is precise about Python allocations
+but far too slow (and too memory hungry itself) to combine with RSS sampling.
+The stages are:
+
+- `read`: `zincio.read` end to end.
+- `build`: `GridBuilder.build` over an already-parsed set of rows.
+- `sanitize`: `_sanitize_series` over every column of an unsanitized frame.
+- `to_zinc`: `Grid.to_zinc` of the resulting grid to a file.
+
+Overheads are reported per cell and relative to the size of the final
+DataFrame as given by `memory_usage(deep=True)`, which is the floor any
+reader producing that DataFrame has to pay.
+"""
+
+import gc
+import io
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+
+import pandas as pd  # type: ignore
+
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+import synthetic
+import zincio
+
+from zincio.grid import GridBuilder, _sanitize_series
+from zincio.zinc_parser import ZincParser
+from zincio.zinc_tokenizer import ZincTokenizer
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def rss() -> int:
+    """Returns the current resident set size of this process, in bytes."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except OSError:
+        # No procfs; fall back to the high-water mark, which never decreases
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+
+class RssSampler:
+    """Samples RSS on a background thread, keeping the maximum seen."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak = max(self.peak, rss())
+            time.sleep(self.interval)
+
+    def __enter__(self) -> 'RssSampler':
+        self.peak = rss()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, rss())
+
+
+def profile(fn: Callable[[], object]) -> Tuple[object, Dict]:
+    """Profiles the memory used by `fn()`.
+
+    Returns:
+        The result of `fn`, which is kept alive for the "retained" figures,
+        and a dict of peak and retained bytes by tracemalloc and by RSS.
+    """
+    gc.collect()
+    base_rss = rss()
+    with RssSampler() as sampler:
+        result = fn()
+    retained_rss = rss() - base_rss
+    del result
+    gc.collect()
+
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    result = fn()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, dict(
+        traced_peak=peak - base,
+        traced_retained=current - base,
+        rss_peak=sampler.peak - base_rss,
+        rss_retained=retained_rss)
+
+
+class _UnsanitizedGridBuilder(GridBuilder):
+    def _sanitize(self, df: pd.DataFrame) -> None:
+        pass
+
+
+def _parse_rows(path: Path, builder_cls=GridBuilder) -> GridBuilder:
+    with open(path, encoding='utf-8') as f:
+        parser = ZincParser(ZincTokenizer(io.StringIO(f.read())))
+    parser._new_builder = builder_cls  # type: ignore
+    gb = parser._parse_header()
+    parser._parse_rows(gb)
+    return gb
+
+
+def _sanitize_all(gb: GridBuilder, df: pd.DataFrame) -> pd.DataFrame:
+    out = {}
+    for colinfo, cname in zip(list(gb.col_meta.values())[1:], df.columns):
+        out[cname] = _sanitize_series(df[cname], colinfo)
+    return pd.DataFrame(out, index=df.index)
+
+
+def _frame_bytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+def run_case(spec: synthetic.GridSpec, data_dir: Path) -> Dict:
+    """Profiles memory of each stage for a single grid spec."""
+    zinc_path, _ = synthetic.generate(spec, data_dir)
+    out_path = data_dir / f"{spec.name}.out.zinc"
+    cells = spec.rows * spec.cols
+    result: Dict = dict(
+        case=spec.name,
+        spec=spec.to_dict(),
+        bytes=zinc_path.stat().st_size,
+        rows=spec.rows,
+        cells=cells)
+
+    def _stage(name: str, fn: Callable[[], object]) -> object:
+        try:
+            out, result[name] = profile(fn)
+            return out
+        except Exception as e:
+            print(f"  {name} failed: {e!r}", file=sys.stderr)
+            result[name] = dict(error=repr(e))
+            return None
+
+    grid = _stage('read', lambda: zincio.read(zinc_path))
+    if grid is None:
+        return result
+    df_bytes = _frame_bytes(grid.data)  # type: ignore
+    result['dataframe_bytes'] = df_bytes
+
+    # profile() runs each stage twice, and a GridBuilder is single-use
+    builders = [_parse_rows(zinc_path) for _ in range(2)]
+    _stage('build', lambda: builders.pop().build())
+    gb = _parse_rows(zinc_path, _UnsanitizedGridBuilder)
+    raw = gb.build().data
+    _stage('sanitize', lambda: _sanitize_all(gb, raw))
+    _stage('to_zinc', lambda: grid.to_zinc(out_path))  # type: ignore
+    try:
+        out_path.unlink()
+    except FileNotFoundError:
+        pass
+
+    for stage in ('read', 'build', 'sanitize', 'to_zinc'):
+        m = result[stage]
+        if 'error' in m:
+            continue
+        m['peak_bytes_per_cell'] = m['traced_peak'] / cells if cells else None
+        m['peak_vs_dataframe'] = (
+            m['traced_peak'] / df_bytes if df_bytes else None)
+    return result
+
+
+def _mb(n: int) -> str:
+    return f"{n / 1e6:9.2f} MB"
+
+
+def format_result(r: Dict) -> str:
+    lines = []
+    if 'dataframe_bytes' in r:
+        lines.append(f"  dataframe  {_mb(r['dataframe_bytes'])}")
+    for stage in ('read', 'build', 'sanitize', 'to_zinc'):
+        m = r.get(stage)
+        if m is None:
+            continue
+        if 'error' in m:
+            lines.append(f"  {stage:<10} error")
+            continue
+        lines.append(
+            f"  {stage:<10} peak {_mb(m['traced_peak'])} "
+            f"(rss {_mb(m['rss_peak'])}), "
+            f"retained {_mb(m['traced_retained'])}, "
+            f"{m['peak_bytes_per_cell']:.1f} B/cell, "
+            f"{m['peak_vs_dataframe']:.1f}x dataframe")
+    return '\n'.join(lines)
@@ -0,0 +1,200 @@
+"""Scalable throughput benchmarks for zincio.
+
+Generates synthetic grids (see `synthetic.py`) over a matrix of rows, columns,
+null densities, unit varieties and column kinds, then measures read, write and
+round-trip throughput, alongside a `pd.read_csv` baseline over equivalent CSV
+as a rough ceiling. Results are written as JSON so that runs can be compared:
+
+    python bench/suite.py --rows 1000 100000 --cols 1 16 -o before.json
+    # ...make changes...
+    python bench/suite.py --rows 1000 100000 --cols 1 16 -o after.json \\
+        --compare before.json
+
+With `--memory`, peak and retained memory are profiled instead of throughput
+(see `memory.py`).
+"""
+
+import argparse
+import itertools
+import json
+import platform
+import sys
+import tempfile
+import time
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import memory
+import synthetic
+import zincio
+
+
+def _best_time(fn: Callable[[], object], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _throughput(seconds: float, nbytes: int, rows: int) -> Dict:
+    return dict(
+        seconds=seconds,
+        mb_per_s=nbytes / seconds / 1e6 if seconds else None,
+        rows_per_s=rows / seconds if seconds else None)
+
+
+def _measure(name: str, fn: Callable[[], object], repeat: int,
+             nbytes: int, rows: int) -> Dict:
+    try:
+        return _throughput(_best_time(fn, repeat), nbytes, rows)
+    except Exception as e:
+        print(f"  {name} failed: {e!r}", file=sys.stderr)
+        return dict(error=repr(e))
+
+
+def run_case(spec: synthetic.GridSpec, data_dir: Path, repeat: int) -> Dict:
+    """Benchmarks a single grid spec."""
+    zinc_path, csv_path = synthetic.generate(spec, data_dir)
+    nbytes = zinc_path.stat().st_size
+    out_path = data_dir / f"{spec.name}.out.zinc"
+    rows = spec.rows
+    result: Dict = dict(
+        case=spec.name,
+        spec=spec.to_dict(),
+        bytes=nbytes,
+        csv_bytes=csv_path.stat().st_size,
+        rows=rows,
+        cells=rows * spec.cols)
+
+    result['read'] = _measure(
+        'read', lambda: zincio.read(zinc_path), repeat, nbytes, rows)
+    try:
+        grid = zincio.read(zinc_path)
+    except Exception:
+        grid = None
+    if grid is not None:
+        result['write'] = _measure(
+            'write', lambda: grid.to_zinc(out_path), repeat, nbytes, rows)
+        result['roundtrip'] = _measure(
+            'roundtrip', lambda: zincio.read(zinc_path).to_zinc(out_path),
+            repeat, nbytes, rows)
+        try:
+            out_path.unlink()
+        except FileNotFoundError:
+            pass
+    else:
+        result['write'] = result['roundtrip'] = dict(error='read failed')
+    result['csv_read'] = _measure(
+        'csv_read', lambda: pd.read_csv(csv_path, index_col=0), repeat,
+        result['csv_bytes'], rows)
+    return result
+
+
+def _environment() -> Dict:
+    return dict(
+        python=platform.python_version(),
+        platform=platform.platform(),
+        pandas=pd.__version__,
+        numpy=np.__version__,
+        time=time.strftime('%Y-%m-%dT%H:%M:%S%z'))
+
+
+def _fmt(m: Dict) -> str:
+    if 'error' in m:
+        return 'error'
+    return f"{m['mb_per_s']:8.2f} MB/s {m['rows_per_s']:12.0f} rows/s"
+
+
+def compare(results: List[Dict], baseline: List[Dict]) -> None:
+    """Prints the change in `results` relative to `baseline`, by case."""
+    old = {r['case']: r for r in baseline}
+    memory_mode = any('dataframe_bytes' in r for r in results)
+    ops: Tuple[str, ...]
+    if memory_mode:
+        ops, key = ('read', 'build', 'sanitize', 'to_zinc'), 'traced_peak'
+        print("\npeak memory reduction vs. baseline (>1 is leaner):")
+    else:
+        ops, key = ('read', 'write', 'roundtrip'), 'seconds'
+        print("\nspeedup vs. baseline (>1 is faster):")
+    for r in results:
+        if r['case'] not in old:
+            continue
+        ratios = []
+        for op in ops:
+            a, b = r.get(op, {}), old[r['case']].get(op, {})
+            if key in a and key in b and a[key]:
+                ratios.append(f"{op}={b[key] / a[key]:.2f}x")
+            else:
+                ratios.append(f"{op}=n/a")
+        print(f"  {r['case']}: {' '.join(ratios)}")
+
+
+def build_specs(args: argparse.Namespace) -> List[synthetic.GridSpec]:
+    specs = []
+    for rows, cols, nulls, units, layout in itertools.product(
+            args.rows, args.cols, args.null_density, args.units,
+            args.layout):
+        entity = layout == 'entity'
+        specs.append(synthetic.GridSpec(
+            rows, cols, null_density=nulls, units=units,
+            kinds=args.kinds, entity=entity, tz=args.tz, seed=args.seed))
+    return specs
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--cols', type=int, nargs='+', default=[1, 16])
+    parser.add_argument(
+        '--null-density', type=float, nargs='+', default=[0.0, 0.5])
+    parser.add_argument('--units', type=int, nargs='+', default=[1])
+    parser.add_argument(
+        '--kinds', type=lambda s: s.split(','), default=None,
+        help=f"comma-separated column kinds, of {synthetic.ALL_KINDS}")
+    parser.add_argument(
+        '--layout', nargs='+', choices=['his', 'entity'], default=['his'])
+    parser.add_argument(
+        '--tz', choices=sorted(synthetic.TIMEZONES), default='UTC')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument(
+        '--memory', action='store_true',
+        help="profile peak and retained memory instead of throughput")
+    parser.add_argument(
+        '--data-dir', type=Path, default=None,
+        help="where to cache generated grids (default: a temporary dir)")
+    parser.add_argument('-o', '--output', type=Path, default=None)
+    parser.add_argument('--compare', type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = args.data_dir or Path(tmp)
+        results = []
+        for spec in build_specs(args):
+            print(f"{spec.name}:")
+            if args.memory:
+                r = memory.run_case(spec, data_dir)
+                print(memory.format_result(r))
+            else:
+                r = run_case(spec, data_dir, args.repeat)
+                for op in ('read', 'write', 'roundtrip', 'csv_read'):
+                    print(f"  {op:<10} {_fmt(r[op])}")
+            results.append(r)
+
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(dict(environment=_environment(), results=results), f,
+                      indent=2)
+    if args.compare is not None:
+        with open(args.compare) as f:
+            compare(results, json.load(f)['results'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,256 @@
+"""Deterministic generator of synthetic Zinc grids for benchmarking.
+
+A `GridSpec` describes a grid along a handful of axes (rows, columns, null
+density, unit variety, column kinds, history vs. entity layout). `write_grid`
+renders it to a Zinc file, and optionally an equivalent CSV file, in chunks of
+rows so that even very large grids can be generated in bounded memory. The
+same spec and seed always produce byte-identical output.
+"""
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+UNITS = ['°F', '°C', '%', 'kW', 'kWh', 'cfm', 'psi', 'ppm', 'gal/min', 'Pa']
+
+# Haystack timezone name -> IANA timezone name
+TIMEZONES = {
+    'UTC': 'UTC',
+    'Los_Angeles': 'America/Los_Angeles',
+    'New_York': 'America/New_York',
+}
+
+HIS_KINDS = ('number',)
+ENTITY_KINDS = ('marker', 'marker', 'marker', 'ref', 'str', 'number')
+ALL_KINDS = ('number', 'str', 'ref', 'bool', 'coord', 'marker')
+
+_KIND_TAGS = {
+    'number': 'Number',
+    'str': 'Str',
+    'ref': 'Ref',
+    'bool': 'Bool',
+    'coord': 'Coord',
+    'marker': 'Marker',
+}
+
+# Number of distinct values in str and ref columns
+_CARDINALITY = 50
+
+
+class GridSpec:
+    """Describes a synthetic grid.
+
+    Attributes:
+        rows: Number of data rows.
+        cols: Number of value columns (history grids), or of tag columns in
+            addition to `id` and `dis` (entity grids).
+        null_density: Fraction of cells that are empty, in [0, 1].
+        units: Number of distinct units used across number columns.
+        kinds: Column kinds, cycled across the columns. Any of `ALL_KINDS`.
+        entity: Whether to generate an entity grid rather than a history grid.
+        tz: Haystack timezone name of the timestamps.
+        interval: Spacing of the timestamps of history grids.
+        seed: Seed for the random number generator.
+    """
+
+    def __init__(
+            self,
+            rows: int = 1000,
+            cols: int = 1,
+            *,
+            null_density: float = 0.0,
+            units: int = 1,
+            kinds: Optional[Sequence[str]] = None,
+            entity: bool = False,
+            tz: str = 'UTC',
+            interval: str = '5min',
+            seed: int = 0):
+        if kinds is None:
+            kinds = ENTITY_KINDS if entity else HIS_KINDS
+        for kind in kinds:
+            if kind not in ALL_KINDS:
+                raise ValueError(f"Unknown column kind {kind}")
+        if tz not in TIMEZONES:
+            raise ValueError(f"Unknown timezone {tz}")
+        self.rows = rows
+        self.cols = cols
+        self.null_density = null_density
+        self.units = max(1, min(units, len(UNITS)))
+        self.kinds = tuple(kinds)
+        self.entity = entity
+        self.tz = tz
+        self.interval = interval
+        self.seed = seed
+
+    @property
+    def name(self) -> str:
+        """A short, unique, filesystem-friendly name for this spec."""
+        layout = 'entity' if self.entity else 'his'
+        return (f"{layout}_r{self.rows}_c{self.cols}_n{self.null_density:g}"
+                f"_u{self.units}_{'-'.join(self.kinds)}_{self.tz}"
+                f"_s{self.seed}")
+
+    def to_dict(self) -> Dict:
+        return dict(
+            rows=self.rows,
+            cols=self.cols,
+            null_density=self.null_density,
+            units=self.units,
+            kinds=list(self.kinds),
+            entity=self.entity,
+            tz=self.tz,
+            interval=self.interval,
+            seed=self.seed)
+
+    def column_kinds(self) -> List[str]:
+        return [self.kinds[i % len(self.kinds)] for i in range(self.cols)]
+
+    def column_unit(self, i: int) -> str:
+        return UNITS[i % self.units]
+
+
+def _format_timestamps(idx: pd.DatetimeIndex, tz: str) -> np.ndarray:
+    # isoformat-style offsets (-08:00 rather than -0800), then the tz name
+    s = idx.strftime('%Y-%m-%dT%H:%M:%S%z')
+    s = s.str[:-2] + ':' + s.str[-2:]
+    s = s.str.replace('+00:00', 'Z', regex=False)
+    return np.asarray(s + ' ' + tz, dtype=object)
+
+
+def _where_null(values: np.ndarray, null: np.ndarray) -> np.ndarray:
+    out = values.astype(object)
+    out[null] = ''
+    return out
+
+
+def _column(
+        kind: str,
+        i: int,
+        n: int,
+        rng: np.random.RandomState,
+        spec: GridSpec) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the (zinc, csv) cell text of `n` cells of a column."""
+    null = rng.random_sample(n) < spec.null_density
+    if kind == 'number':
+        vals = np.round(rng.normal(70, 10, n), 3).astype(str)
+        unit = spec.column_unit(i)
+        return (_where_null(np.char.add(vals, unit), null),
+                _where_null(vals, null))
+    if kind == 'str':
+        codes = rng.randint(0, _CARDINALITY, n).astype(str)
+        vals = np.char.add(np.char.add(f'"c{i}_status', codes), '"')
+        return _where_null(vals, null), _where_null(vals, null)
+    if kind == 'ref':
+        codes = rng.randint(0, _CARDINALITY, n).astype(str)
+        vals = np.char.add(f'@r{i}.', codes)
+        return _where_null(vals, null), _where_null(vals, null)
+    if kind == 'bool':
+        flags = rng.random_sample(n) < 0.5
+        return (_where_null(np.where(flags, 'T', 'F'), null),
+                _where_null(np.where(flags, 'true', 'false'), null))
+    if kind == 'coord':
+        lat = np.round(rng.uniform(-90, 90, n), 6).astype(str)
+        lng = np.round(rng.uniform(-180, 180, n), 6).astype(str)
+        zinc = np.char.add(
+            np.char.add(np.char.add('C(', lat), np.char.add(',', lng)), ')')
+        csv = np.char.add(np.char.add(np.char.add('"', lat), ','),
+                          np.char.add(lng, '"'))
+        return _where_null(zinc, null), _where_null(csv, null)
+    if kind == 'marker':
+        vals = np.full(n, 'M', dtype=object)
+        return _where_null(vals, null), _where_null(np.full(n, 'true'), null)
+    raise ValueError(f"Unknown column kind {kind}")
+
+
+def _header(spec: GridSpec) -> Tuple[str, str]:
+    kinds = spec.column_kinds()
+    if spec.entity:
+        zinc_cols = ['id', 'dis']
+        csv_cols = ['id', 'dis']
+        names = [f"{kind}{i}" for i, kind in enumerate(kinds)]
+        zinc_cols += names
+        csv_cols += names
+        grid_meta = 'ver:"3.0"'
+    else:
+        zinc_cols = [f'ts tz:"{spec.tz}"']
+        csv_cols = ['ts']
+        for i, kind in enumerate(kinds):
+            tags = f'v{i} id:@p.{i} point his kind:"{_KIND_TAGS[kind]}"'
+            if kind == 'number':
+                tags += f' unit:"{spec.column_unit(i)}"'
+            zinc_cols.append(tags + f' tz:"{spec.tz}"')
+            csv_cols.append(f'p.{i}')
+        grid_meta = 'ver:"3.0" hisStart:M hisEnd:M'
+    return grid_meta + '\n' + ','.join(zinc_cols) + '\n', \
+        ','.join(csv_cols) + '\n'
+
+
+def iter_chunks(
+        spec: GridSpec,
+        chunk_rows: int = 100000) -> Iterator[Tuple[str, str]]:
+    """Yields (zinc, csv) text for the grid, header first, in row chunks."""
+    yield _header(spec)
+    rng = np.random.RandomState(spec.seed)
+    tz = TIMEZONES[spec.tz]
+    start = pd.Timestamp('2020-01-01', tz=tz)
+    step = pd.Timedelta(spec.interval)
+    kinds = spec.column_kinds()
+    for offset in range(0, spec.rows, chunk_rows):
+        n = min(chunk_rows, spec.rows - offset)
+        if spec.entity:
+            ids = np.char.add('@e.', np.arange(offset, offset + n).astype(str))
+            dis = np.char.add(np.char.add('"Entity ', ids.astype(str)), '"')
+            zinc_cols = [ids.astype(object), dis.astype(object)]
+            csv_cols = [ids.astype(object), dis.astype(object)]
+        else:
+            idx = pd.date_range(start + offset * step, periods=n, freq=step)
+            ts = _format_timestamps(idx, spec.tz)
+            zinc_cols = [ts]
+            csv_cols = [np.asarray(idx.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                                   dtype=object)]
+        for i, kind in enumerate(kinds):
+            zinc, csv = _column(kind, i, n, rng, spec)
+            zinc_cols.append(zinc)
+            csv_cols.append(csv)
+        yield ('\n'.join(','.join(r) for r in zip(*zinc_cols)) + '\n',
+               '\n'.join(','.join(r) for r in zip(*csv_cols)) + '\n')
+
+
+def write_grid(
+        spec: GridSpec,
+        zinc_path: Path,
+        csv_path: Optional[Path] = None,
+        chunk_rows: int = 100000) -> None:
+    """Writes the grid described by `spec` to Zinc and, optionally, CSV."""
+    with open(zinc_path, 'w', encoding='utf-8') as zf:
+        cf = open(csv_path, 'w', encoding='utf-8') if csv_path else None
+        try:
+            for zinc, csv in iter_chunks(spec, chunk_rows):
+                zf.write(zinc)
+                if cf is not None:
+                    cf.write(csv)
+        finally:
+            if cf is not None:
+                cf.close()
+
+
+def generate(spec: GridSpec, data_dir: Path) -> Tuple[Path, Path]:
+    """Generates Zinc and CSV files for `spec` in `data_dir`, if not present.
+
+    Returns:
+        The paths of the Zinc and CSV files.
+    """
+    data_dir.mkdir(parents=True, exist_ok=True)
+    zinc_path = data_dir / f"{spec.name}.zinc"
+    csv_path = data_dir / f"{spec.name}.csv"
+    if not (zinc_path.exists() and csv_path.exists()):
+        # Write under temporary names so interrupted runs leave no partial
+        # files behind to be mistaken for complete ones.
+        zinc_tmp = zinc_path.with_suffix('.zinc.tmp')
+        csv_tmp = csv_path.with_suffix('.csv.tmp')
+        write_grid(spec, zinc_tmp, csv_tmp)
+        zinc_tmp.replace(zinc_path)
+        csv_tmp.replace(csv_path)
+    return zinc_path, csv_path
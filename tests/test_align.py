@@ -0,0 +1,77 @@
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+import pytest  # type: ignore
+import zincio
+
+
+def his_grid(point, start, values, freq='5min', **tags):
+    index = pd.date_range(
+        start, periods=len(values), freq=freq, tz='America/Los_Angeles',
+        name='ts')
+    return zincio.Grid(
+        version=3,
+        grid_info={'id': zincio.Ref(point)},
+        column_info={'ts': {}, 'val': dict(tags)},
+        data=pd.DataFrame({'val': values}, index=index, dtype=float))
+
+
+def test_concat_aligns_points():
+    a = his_grid('a', '2020-01-01 00:00', [1, 2, 3], unit=zincio.String('°F'))
+    b = his_grid('b', '2020-01-01 00:05', [10, 20, 30])
+    actual = zincio.concat([a, b])
+    assert list(actual.data.columns) == ['@a', '@b']
+    assert len(actual.data) == 4
+    assert str(actual.data.index.tz) == 'America/Los_Angeles'
+    np.testing.assert_array_equal(actual.data['@a'], [1, 2, 3, np.nan])
+    np.testing.assert_array_equal(actual.data['@b'], [np.nan, 10, 20, 30])
+    assert actual.column_info['v0'] == dict(
+        id=zincio.Ref('a'), unit=zincio.String('°F'))
+    assert actual.column_info['v1'] == dict(id=zincio.Ref('b'))
+    assert actual.grid_info == {}
+
+
+def test_concat_inner():
+    a = his_grid('a', '2020-01-01 00:00', [1, 2, 3])
+    b = his_grid('b', '2020-01-01 00:05', [10, 20, 30])
+    actual = zincio.concat([a, b], how='inner')
+    assert len(actual.data) == 2
+    np.testing.assert_array_equal(actual.data['@a'], [2, 3])
+    np.testing.assert_array_equal(actual.data['@b'], [10, 20])
+
+
+def test_concat_deduplicates_overlapping_exports():
+    first = his_grid('a', '2020-01-01 00:00', [1, 2, 3])
+    second = his_grid('a', '2020-01-01 00:10', [30, np.nan, 5])
+    actual = zincio.concat([first, second])
+    assert list(actual.data.columns) == ['@a']
+    np.testing.assert_array_equal(actual.data['@a'], [1, 2, 30, np.nan, 5])
+    assert actual.grid_info == {'id': zincio.Ref('a')}
+
+
+def test_concat_tolerance():
+    a = his_grid('a', '2020-01-01 00:00:00', [1, 2])
+    b = his_grid('b', '2020-01-01 00:00:01', [10, 20])
+    assert len(zincio.concat([a, b]).data) == 4
+    actual = zincio.concat([a, b], tolerance='2s')
+    assert len(actual.data) == 2
+    assert actual.data.index[0] == a.data.index[0]
+    np.testing.assert_array_equal(actual.data['@b'], [10, 20])
+
+
+def test_concat_categorical_columns():
+    s = ('ver:"3.0"\nts,v0 id:@a\n'
+         '2020-01-01T00:00:00Z UTC,"on"\n'
+         '2020-01-01T00:05:00Z UTC,"on"\n')
+    t = ('ver:"3.0"\nts,v0 id:@a\n'
+         '2020-01-01T00:10:00Z UTC,"off"\n'
+         '2020-01-01T00:15:00Z UTC,"off"\n')
+    actual = zincio.concat([zincio.parse(s), zincio.parse(t)]).data['@a']
+    assert actual.dtype == 'category'
+    assert actual.tolist() == ['on', 'on', 'off', 'off']
+
+
+def test_concat_rejects_entity_grids():
+    with pytest.raises(ValueError):
+        zincio.concat([zincio.parse('ver:"3.0"\nid\n@a\n')])
+    with pytest.raises(ValueError):
+        zincio.concat([])
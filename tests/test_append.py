@@ -0,0 +1,107 @@
+import pandas as pd  # type: ignore
+import pytest  # type: ignore
+import shutil
+import sys
+import zincio
+
+from pathlib import Path
+
+
+def get_abspath(relpath):
+    return Path(__file__).parent / relpath
+
+
+FULL_GRID_FILE = get_abspath("full_grid.zinc")
+HISREAD_SERIES_FILE = get_abspath("hisread_series.zinc")
+
+
+def test_append_matches_read_and_concat(tmp_path):
+    path = tmp_path / "grid.zinc"
+    shutil.copyfile(FULL_GRID_FILE, path)
+    before = zincio.read(path)
+    index = pd.date_range(
+        '2020-05-18T01:30', periods=3, freq='15min', tz='America/Los_Angeles')
+    new = before.data.iloc[:3].copy()
+    new.index = index
+    assert zincio.append(path, new) == 3
+    after = zincio.read(path)
+    assert after.column_info == before.column_info
+    assert after.grid_info == before.grid_info
+    pd.testing.assert_frame_equal(
+        after.data.iloc[:5], before.data, check_freq=False)
+    pd.testing.assert_frame_equal(
+        after.data.iloc[5:], new, check_freq=False, check_names=False,
+        check_categorical=False)
+
+
+def test_append_by_point_id_and_column_name(tmp_path):
+    path = tmp_path / "series.zinc"
+    shutil.copyfile(HISREAD_SERIES_FILE, path)
+    index = pd.date_range('2020-04-01T07:15Z', periods=2, freq='5min')
+    zincio.append(path, pd.Series([70.0, 70.5], index=index, name='val'))
+    zincio.append(path, pd.DataFrame(
+        {'@p:q01b001:r:20aad139-beff4e8c': [71.0]},
+        index=index[1:] + pd.Timedelta('5min')))
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert lines[-3:] == [
+        '2020-04-01T00:15:00-07:00 Los_Angeles,70.0°F',
+        '2020-04-01T00:20:00-07:00 Los_Angeles,70.5°F',
+        '2020-04-01T00:25:00-07:00 Los_Angeles,71.0°F',
+    ]
+    assert len(zincio.read(path).data) == 6
+
+
+def test_append_after_trailing_blank_line(tmp_path):
+    path = tmp_path / "series.zinc"
+    path.write_text(
+        'ver:"3.0"\nts,val\n2021-01-01T00:00:00Z UTC,1\n\n', encoding='utf-8')
+    index = pd.DatetimeIndex(['2021-01-01T01:00:00Z'])
+    zincio.append(path, pd.DataFrame({'val': [2]}, index=index))
+    assert zincio.read(path).data['val'].tolist() == [1, 2]
+
+
+def test_append_to_grid_without_rows(tmp_path):
+    path = tmp_path / "empty.zinc"
+    path.write_text('ver:"3.0"\nts tz:"UTC",val unit:"kW"\n', encoding='utf-8')
+    index = pd.DatetimeIndex(['2021-01-01T01:00:00Z'])
+    zincio.append(path, pd.DataFrame({'val': [2.5]}, index=index))
+    assert path.read_text(encoding='utf-8').splitlines()[2:] == [
+        '2021-01-01T01:00:00Z UTC,2.5kW']
+
+
+@pytest.mark.parametrize("data", [
+    # Not after the last row
+    pd.DataFrame({'val': [1.0]}, index=pd.DatetimeIndex(
+        ['2020-04-01T07:10Z'])),
+    # Not in time order
+    pd.DataFrame({'val': [1.0, 2.0]}, index=pd.DatetimeIndex(
+        ['2020-04-02T00:00Z', '2020-04-01T23:00Z'])),
+    # No such column
+    pd.DataFrame({'power': [1.0]}, index=pd.DatetimeIndex(
+        ['2020-04-02T00:00Z'])),
+])
+def test_append_rejects(tmp_path, data):
+    path = tmp_path / "series.zinc"
+    shutil.copyfile(HISREAD_SERIES_FILE, path)
+    with pytest.raises(ValueError):
+        zincio.append(path, data)
+    assert path.read_bytes() == HISREAD_SERIES_FILE.read_bytes()
+
+
+def test_append_leaves_file_unchanged_if_formatting_fails(
+        tmp_path, monkeypatch):
+    path = tmp_path / "series.zinc"
+    path.write_text(
+        'ver:"3.0"\nts,val\n2021-01-01T00:00:00Z UTC,1\n\n', encoding='utf-8')
+    before = path.read_bytes()
+
+    def fail(f, df, column_info):
+        f.write('2021-01-01T01:00:00Z UTC,')
+        raise ValueError("Cannot format")
+
+    # zincio.append is the function, shadowing its module
+    monkeypatch.setattr(sys.modules['zincio.append'], 'write_rows', fail)
+    index = pd.DatetimeIndex(['2021-01-01T01:00:00Z'])
+    with pytest.raises(ValueError):
+        zincio.append(path, pd.DataFrame({'val': [2]}, index=index))
+    assert path.read_bytes() == before
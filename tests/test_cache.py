@@ -0,0 +1,82 @@
+import io
+import os
+import pandas as pd  # type: ignore
+import pytest  # type: ignore
+import shutil
+import zincio
+
+from pathlib import Path
+
+
+def get_abspath(relpath):
+    return Path(__file__).parent / relpath
+
+
+FULL_GRID_FILE = get_abspath("full_grid.zinc")
+SINGLE_SERIES_FILE = get_abspath("single_series_grid.zinc")
+
+
+def test_cached_read_same_as_uncached():
+    cache = zincio.GridCache()
+    expected = zincio.read(FULL_GRID_FILE)
+    for _ in range(2):
+        actual = zincio.read(FULL_GRID_FILE, cache=cache)
+        assert actual.grid_info == expected.grid_info
+        assert actual.column_info == expected.column_info
+        pd.testing.assert_frame_equal(actual.data, expected.data)
+    info = cache.cache_info()
+    assert (info.hits, info.misses, info.entries) == (1, 1, 1)
+    assert info.nbytes > 0
+
+
+def test_cached_grids_are_private_copies():
+    cache = zincio.GridCache()
+    first = zincio.read(SINGLE_SERIES_FILE, cache=cache)
+    first.data.iloc[1, 0] = -1000.0
+    first.grid_info['dis'] = zincio.String("changed")
+    first.column_info['ts']['tz'] = zincio.String("UTC")
+    second = zincio.read(SINGLE_SERIES_FILE, cache=cache)
+    assert second.data.iloc[1, 0] == 68.553
+    assert second.grid_info['dis'] == zincio.String("Mon 18-May-2020")
+    assert second.column_info['ts']['tz'] == zincio.String("Los_Angeles")
+
+
+def test_cache_reloads_modified_file(tmp_path):
+    path = tmp_path / "grid.zinc"
+    shutil.copyfile(SINGLE_SERIES_FILE, path)
+    cache = zincio.GridCache()
+    zincio.read(path, cache=cache)
+    shutil.copyfile(FULL_GRID_FILE, path)
+    # Make sure the modification is visible even on coarse mtime filesystems
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    grid = zincio.read(path, cache=cache)
+    assert len(grid.data.columns) == 5
+    info = cache.cache_info()
+    assert (info.misses, info.entries) == (2, 1)
+
+
+def test_cache_evicts_least_recently_used():
+    nbytes = zincio.read(FULL_GRID_FILE).data.memory_usage(deep=True).sum()
+    cache = zincio.GridCache(max_bytes=int(nbytes) + 1)
+    zincio.read(FULL_GRID_FILE, cache=cache)
+    zincio.read(SINGLE_SERIES_FILE, cache=cache)
+    assert len(cache) == 1
+    zincio.read(SINGLE_SERIES_FILE, cache=cache)
+    assert cache.cache_info().hits == 1
+    assert cache.cache_info().nbytes <= cache.max_bytes
+
+
+def test_cache_skips_grids_larger_than_budget():
+    cache = zincio.GridCache(max_bytes=1)
+    zincio.read(FULL_GRID_FILE, cache=cache)
+    assert len(cache) == 0
+
+
+def test_cache_rejects_buffers_lazy_and_stats():
+    with pytest.raises(ValueError):
+        zincio.read(io.StringIO("ver:\"3.0\"\nts\n"), cache=True)
+    with pytest.raises(ValueError):
+        zincio.read(FULL_GRID_FILE, lazy=True, cache=True)
+    with pytest.raises(ValueError):
+        zincio.read(FULL_GRID_FILE, cache=True, stats=zincio.ParseStats())
@@ -0,0 +1,76 @@
+import csv
+import gzip
+import subprocess
+import sys
+
+import pytest  # type: ignore
+import zincio
+
+from pathlib import Path
+from zincio.cli import main
+
+
+def get_abspath(relpath):
+    return Path(__file__).parent / relpath
+
+
+FULL_GRID_FILE = get_abspath("full_grid.zinc")
+HISREAD_SERIES_FILE = get_abspath("hisread_series.zinc")
+
+
+def test_convert_files(tmp_path, capsys):
+    assert main([
+        'convert', '--to', 'csv', '--workers', '2',
+        str(FULL_GRID_FILE), str(HISREAD_SERIES_FILE), str(tmp_path)]) == 0
+    with open(tmp_path / 'full_grid.csv', encoding='utf-8', newline='') as f:
+        assert len(list(csv.reader(f))) == 6
+    assert (tmp_path / 'hisread_series.csv').exists()
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 3
+    assert lines[0].startswith(f'{FULL_GRID_FILE}: 5 rows in ')
+    assert 'rows/s' in lines[2] and 'MB/s' in lines[2]
+    assert lines[2].startswith('total: 8 rows in ')
+
+
+def test_convert_stdin_to_stdout():
+    with open(FULL_GRID_FILE, 'rb') as f:
+        proc = subprocess.run(
+            [sys.executable, '-m', 'zincio', 'convert', '--to', 'zinc.gz',
+             '-', '-'],
+            stdin=f, capture_output=True, check=True)
+    assert '-: 5 rows in ' in proc.stderr.decode()
+    lines = gzip.decompress(proc.stdout).decode().splitlines()
+    assert lines == zincio.read(FULL_GRID_FILE).to_zinc().splitlines()
+
+
+def test_convert_rejects_stdin_to_directory(tmp_path):
+    with pytest.raises(SystemExit):
+        main(['convert', '-', str(tmp_path)])
+
+
+def test_convert_rejects_clashing_names(tmp_path):
+    (tmp_path / 'a').mkdir()
+    (tmp_path / 'b').mkdir()
+    for d in ('a', 'b'):
+        (tmp_path / d / 'x.zinc').write_bytes(FULL_GRID_FILE.read_bytes())
+    with pytest.raises(SystemExit):
+        main(['convert', str(tmp_path / 'a' / 'x.zinc'),
+              str(tmp_path / 'b' / 'x.zinc'), str(tmp_path / 'out')])
+    assert not (tmp_path / 'out').exists()
+
+
+def test_convert_reports_failures_per_file(tmp_path, capsys):
+    bad = tmp_path / 'bad.zinc'
+    bad.write_text('ver:"3.0"\nval\n"unterminated\n', encoding='utf-8')
+    out = tmp_path / 'out'
+    assert main([
+        'convert', '--workers', '2', str(bad), str(FULL_GRID_FILE),
+        str(HISREAD_SERIES_FILE), str(out)]) == 1
+    assert not (out / 'bad.csv').exists()
+    assert (out / 'full_grid.csv').exists()
+    assert (out / 'hisread_series.csv').exists()
+    captured = capsys.readouterr()
+    assert captured.err.startswith(f'{bad}: failed: ')
+    lines = captured.out.splitlines()
+    assert len(lines) == 3
+    assert lines[2].startswith('total: 8 rows in ')
@@ -0,0 +1,187 @@
+import asyncio
+import json
+
+import pandas as pd  # type: ignore
+import pytest  # type: ignore
+import zincio
+
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+from zincio.client import Client, HaystackClientException
+
+BENCH_FILE = Path(__file__).parent.parent / "bench" / "small_example.zinc"
+
+ENTITY_GRID = (
+    'ver:"3.0"\n'
+    'id,dis,point,his\n'
+    '@p1,"P1",M,M\n'
+    '@p2,"P2",M,M\n')
+
+
+class StandIn:
+    """A local stand-in for a Haystack server, serving the bench Zinc files.
+
+    Args:
+        chunked: Send bodies with chunked transfer encoding rather than a
+            Content-Length.
+        close_idle: Close each connection after its response, without
+            saying so, as servers do with idle connections.
+        json_reads: Answer `read` with Haystack JSON rather than Zinc.
+    """
+
+    def __init__(self, chunked=False, close_idle=False, json_reads=False):
+        self.chunked = chunked
+        self.close_idle = close_idle
+        self.json_reads = json_reads
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = []
+
+    async def start(self):
+        self.server = await asyncio.start_server(
+            self.handle, '127.0.0.1', 0)
+        port = self.server.sockets[0].getsockname()[1]
+        return f'http://127.0.0.1:{port}/api'
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                while (await reader.readline()) not in (b'\r\n', b''):
+                    pass
+                target = line.split()[1].decode()
+                self.requests.append(target)
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                # Let other requests overlap with this one
+                await asyncio.sleep(0.01)
+                status, ctype, body = self.respond(target)
+                self.in_flight -= 1
+                await self.send(writer, status, ctype, body)
+                if self.close_idle:
+                    break
+        finally:
+            writer.close()
+
+    def respond(self, target):
+        url = urlsplit(target)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if url.path == '/api/hisRead':
+            return '200 OK', 'text/zinc', BENCH_FILE.read_bytes()
+        if url.path == '/api/read':
+            grid = zincio.parse(ENTITY_GRID)
+            if self.json_reads:
+                return '200 OK', 'application/json', grid.to_json().encode()
+            return '200 OK', 'text/zinc', ENTITY_GRID.encode()
+        return '404 Not Found', 'text/plain', f'No op {params}'.encode()
+
+    async def send(self, writer, status, ctype, body):
+        head = f'HTTP/1.1 {status}\r\nContent-Type: {ctype}\r\n'
+        if self.chunked:
+            writer.write(f'{head}Transfer-Encoding: chunked\r\n\r\n'.encode())
+            for i in range(0, len(body), 1000):
+                chunk = body[i:i + 1000]
+                writer.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+                await writer.drain()
+            writer.write(b'0\r\n\r\n')
+        else:
+            writer.write(
+                f'{head}Content-Length: {len(body)}\r\n\r\n'.encode() + body)
+        await writer.drain()
+
+
+def run(server, fn):
+    async def main():
+        url = await server.start()
+        try:
+            return await fn(url)
+        finally:
+            await server.stop()
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize("chunked", [False, True])
+def test_his_read_many_pools_connections(chunked):
+    server = StandIn(chunked=chunked)
+
+    async def fn(url):
+        async with Client(url, max_connections=4) as client:
+            return await client.his_read_many(
+                [f'p{i}' for i in range(8)], 'yesterday')
+
+    grids = run(server, fn)
+    expected = zincio.read(BENCH_FILE)
+    assert len(grids) == 8
+    for grid in grids:
+        assert grid.column_info == expected.column_info
+        pd.testing.assert_frame_equal(grid.data, expected.data)
+    assert server.connections <= 4
+    assert server.max_in_flight == 4
+    assert sorted(server.requests)[0] == (
+        '/api/hisRead?id=%40p0&range=yesterday')
+
+
+def test_read_zinc_and_json():
+    for json_reads in (False, True):
+        server = StandIn(json_reads=json_reads)
+
+        async def fn(url):
+            async with Client(url) as client:
+                return await client.read('point and his', limit=10)
+
+        grid = run(server, fn)
+        assert list(grid.data.index) == ['p1', 'p2']
+        assert grid.data['point'].all()
+        assert server.requests == [
+            '/api/read?filter=point+and+his&limit=10']
+
+
+def test_reconnects_when_server_closes_idle_connection():
+    server = StandIn(close_idle=True)
+
+    async def fn(url):
+        async with Client(url, max_connections=1) as client:
+            first = await client.read('point')
+            # Let the close reach the client
+            await asyncio.sleep(0.05)
+            second = await client.read('point')
+            return first, second
+
+    first, second = run(server, fn)
+    assert len(first.data) == len(second.data) == 2
+    assert server.connections == 2
+
+
+def test_http_error():
+    server = StandIn()
+
+    async def fn(url):
+        async with Client(url) as client:
+            await client.call('nope')
+
+    with pytest.raises(HaystackClientException) as excinfo:
+        run(server, fn)
+    assert excinfo.value.status == 404
+
+
+def test_error_grid():
+    server = StandIn()
+    server.respond = lambda target: (
+        '200 OK', 'application/json',
+        json.dumps({'meta': {'ver': '3.0', 'err': {'_kind': 'marker'}},
+                    'cols': [{'name': 'empty'}], 'rows': []}).encode())
+
+    async def fn(url):
+        async with Client(url) as client:
+            await client.read('point')
+
+    with pytest.raises(zincio.ZincErrorGridException):
+        run(server, fn)
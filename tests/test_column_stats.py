@@ -0,0 +1,65 @@
+import io
+import pandas as pd  # type: ignore
+import zincio
+
+from pathlib import Path
+
+
+def get_abspath(relpath):
+    return Path(__file__).parent / relpath
+
+
+FULL_GRID_FILE = get_abspath("full_grid.zinc")
+
+
+def test_stats_of_his_grid():
+    grid = zincio.read(FULL_GRID_FILE, column_stats=True)
+    v0, v1 = grid.data.columns[:2]
+    stats = grid.column_stats[v0]
+    assert stats.count == 3
+    assert stats.null_count == 2
+    assert stats.min == 68.553
+    assert stats.max == 69.723
+    assert abs(stats.mean - (68.553 + 68.554 + 69.723) / 3) < 1e-9
+    assert stats.first_ts == pd.Timestamp('2020-05-17T23:55:00-07:00')
+    assert stats.last_ts == pd.Timestamp('2020-05-18T00:05:00-07:00')
+    occupancy = grid.column_stats[v1]
+    assert occupancy.count == 2
+    assert occupancy.min is None
+    assert occupancy.last_ts == pd.Timestamp('2020-05-18T01:13:09-07:00')
+
+
+def test_stats_are_off_by_default():
+    assert zincio.read(FULL_GRID_FILE).column_stats is None
+
+
+def test_merged_chunk_stats_equal_whole_file_stats():
+    whole = zincio.read(FULL_GRID_FILE, column_stats=True).column_stats
+    chunks = zincio.read_chunked(
+        FULL_GRID_FILE, chunksize=2, column_stats=True)
+    merged = zincio.merge_column_stats(c.column_stats for c in chunks)
+    assert merged.keys() == whole.keys()
+    for col, stats in whole.items():
+        assert merged[col].count == stats.count
+        assert merged[col].min == stats.min
+        assert merged[col].max == stats.max
+        assert merged[col].last_ts == stats.last_ts
+        if stats.sum is not None:
+            assert abs(merged[col].sum - stats.sum) < 1e-9
+
+
+def test_stats_requested_of_cached_grid():
+    cache = zincio.GridCache()
+    zincio.read(FULL_GRID_FILE, cache=cache)
+    grid = zincio.read(FULL_GRID_FILE, cache=cache, column_stats=True)
+    air_flow = grid.data.columns[4]
+    assert grid.column_stats[air_flow].count == 2
+
+
+def test_entity_markers_count_only_where_present():
+    text = 'ver:"3.0"\nid,site,area\n@a,M,10\n@b,,\n@c,M,30\n'
+    grid = zincio.read(io.StringIO(text), column_stats=True)
+    assert grid.column_stats['site'] == zincio.ColumnStats(
+        count=2, null_count=1, min=True, max=True, sum=2)
+    assert grid.column_stats['area'].sum == 40
+    assert grid.column_stats['area'].first_ts is None
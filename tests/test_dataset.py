@@ -0,0 +1,94 @@
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+import pytest  # type: ignore
+import zincio
+
+from zincio import dataset
+
+
+def make_grid(days=3):
+    index = pd.date_range(
+        '2021-03-13', pd.Timestamp('2021-03-13') + pd.Timedelta(days=days),
+        freq='h', tz='America/New_York', inclusive='left')
+    df = pd.DataFrame({
+        'power': np.arange(len(index), dtype=float),
+        'energy': np.arange(len(index), dtype=float) * 2,
+    }, index=index)
+    return zincio.Grid.from_pandas(
+        df, units={'power': 'kW', 'energy': 'kWh'},
+        point_ids={'power': 'p1', 'energy': 'p2'},
+        grid_info={'dis': zincio.String('Site 1')})
+
+
+def test_to_zinc_partitioned(tmp_path):
+    paths = make_grid().to_zinc_partitioned(tmp_path / 'site1')
+    assert [p.name for p in paths] == [
+        '2021-03-13.zinc', '2021-03-14.zinc', '2021-03-15.zinc']
+    # DST starts on the 14th, which is an hour short
+    lengths = [len(zincio.read(p).data) for p in paths]
+    assert lengths == [24, 23, 24]
+    meta = zincio.read(paths[1], lazy=True).grid_info
+    assert str(meta['hisStart']) == '2021-03-14T00:00:00-05:00 New_York'
+    assert str(meta['hisEnd']) == '2021-03-15T00:00:00-04:00 New_York'
+    assert meta['dis'] == zincio.String('Site 1')
+
+
+def test_to_zinc_partitioned_weekly(tmp_path):
+    grid = make_grid(days=10)
+    paths = grid.to_zinc_partitioned(tmp_path, freq='W')
+    # Weeks end on Sunday: the 13th is a Saturday
+    assert [p.name for p in paths] == [
+        '2021-03-08.zinc', '2021-03-15.zinc', '2021-03-22.zinc']
+    actual = zincio.read_dataset(tmp_path)
+    assert len(actual.data) == len(grid.data)
+
+
+def test_read_dataset_roundtrip(tmp_path):
+    grid = make_grid()
+    grid.to_zinc_partitioned(tmp_path, freq='D')
+    actual = zincio.read_dataset(tmp_path, workers=2)
+    expected = grid.data.rename(columns={'power': '@p1', 'energy': '@p2'})
+    pd.testing.assert_frame_equal(
+        actual.data, expected, check_names=False, check_freq=False)
+    assert str(actual.grid_info['hisStart']) == (
+        '2021-03-13T00:00:00-05:00 New_York')
+    assert str(actual.grid_info['hisEnd']) == (
+        '2021-03-16T00:00:00-04:00 New_York')
+
+
+def test_read_dataset_prunes_by_header(tmp_path, monkeypatch):
+    make_grid().to_zinc_partitioned(tmp_path)
+    read = []
+
+    def spy(path, lo, hi, usecols):
+        read.append(path.rsplit('/', 1)[-1])
+        return original(path, lo, hi, usecols)
+
+    original = dataset._read_partition
+    monkeypatch.setattr(dataset, '_read_partition', spy)
+    actual = zincio.read_dataset(
+        tmp_path, '2021-03-14T12:00:00-04:00', '2021-03-15T06:00:00-04:00',
+        usecols=['p2'], workers=1)
+    assert read == ['2021-03-14.zinc', '2021-03-15.zinc']
+    assert list(actual.data.columns) == ['@p2']
+    assert actual.column_info['v0']['unit'] == zincio.String('kWh')
+    assert len(actual.data) == 18
+    same = zincio.read_dataset(
+        tmp_path, '2021-03-14T12:00:00-04:00', '2021-03-15T06:00:00-04:00',
+        usecols=['@p2'], workers=1)
+    pd.testing.assert_frame_equal(same.data, actual.data)
+    assert actual.data.index[0] == pd.Timestamp('2021-03-14T12:00-04:00')
+    assert str(actual.grid_info['hisStart']) == (
+        '2021-03-14T12:00:00-04:00 New_York')
+
+
+def test_read_dataset_no_overlap(tmp_path):
+    make_grid().to_zinc_partitioned(tmp_path)
+    with pytest.raises(ValueError):
+        zincio.read_dataset(tmp_path, '2022-01-01', '2022-01-02')
+
+
+def test_partition_entity_grid_raises(tmp_path):
+    grid = zincio.parse('ver:"3.0"\nid,dis\n@p1,"P1"\n')
+    with pytest.raises(ValueError):
+        grid.to_zinc_partitioned(tmp_path)
@@ -0,0 +1,111 @@
+import pytest  # type: ignore
+import zincio
+
+from pathlib import Path
+
+
+def get_abspath(relpath):
+    return Path(__file__).parent / relpath
+
+
+FULL_GRID_FILE = get_abspath("full_grid.zinc")
+
+ENTITY_GRID = zincio.parse(
+    'ver:"3.0"\n'
+    'id,dis,site,equip,point,his,siteRef,equipRef,curVal,area\n'
+    '@s1 "Site 1","Site 1",M,,,,,,,5000ft²\n'
+    '@s2 "Site 2","Site 2",M,,,,,,,100ft²\n'
+    '@e1 "AHU","AHU",,M,,,@s1 "Site 1",,,\n'
+    '@e2 "VAV","VAV",,M,,,@s2,,,\n'
+    '@p1,"Temp",,,M,M,@s1,@e1 "AHU",72.5°F,\n'
+    '@p2,"Temp 2",,,M,M,@s1,@e1 "AHU",70°F,\n'
+    '@p3,"Flow",,,M,,@s2,@e2,300cfm,\n')
+
+
+@pytest.mark.parametrize("flt,expected", [
+    ('site', ['s1', 's2']),
+    ('not point', ['s1', 's2', 'e1', 'e2']),
+    ('point and his and siteRef==@s1 and curVal > 70°F', ['p1']),
+    ('curVal >= 70°F', ['p1', 'p2']),
+    ('curVal > 70°C', []),
+    ('curVal > 100', ['p3']),
+    ('curVal > 1e2', ['p3']),
+    ('curVal >= 7.25E1°F', ['p1']),
+    ('siteRef != @s1', ['e2', 'p3']),
+    ('dis == "AHU" or id == @p3', ['e1', 'p3']),
+    ('(site or equip) and dis < "B"', ['e1']),
+    ('equipRef->dis == "AHU"', ['p1', 'p2']),
+    ('equipRef->siteRef->area > 1000ft²', ['p1', 'p2']),
+    ('missingTag', []),
+])
+def test_filter_entity_grid(flt, expected):
+    assert ENTITY_GRID.filter(flt).data.index.tolist() == expected
+
+
+MIXED_GRID = zincio.parse(
+    'ver:"3.0"\n'
+    'id,dis,enabled,equipRef,reading\n'
+    '@a,"Alpha",T,@e1,5kW\n'
+    '@b,"beta",F,@e2,7W\n'
+    '@c,,T,@e3,9\n'
+    '@d,"Delta",,@e4,"n/a"\n')
+
+
+@pytest.mark.parametrize("flt,expected", [
+    # Object columns of strs, bools and Refs, each compared as one array
+    ('dis == "beta"', ['b']),
+    ('dis >= "Beta"', ['b', 'd']),
+    ('dis != "Alpha"', ['b', 'd']),
+    ('enabled == true', ['a', 'c']),
+    ('enabled != true', ['b']),
+    ('equipRef == @e3', ['c']),
+    ('equipRef > @e2', ['c', 'd']),
+    # Mixed kinds, compared cell by cell
+    ('reading > 6', ['b', 'c']),
+    ('reading > 6kW', ['c']),
+    ('reading == "n/a"', ['d']),
+])
+def test_filter_object_columns(flt, expected):
+    assert MIXED_GRID.filter(flt).data.index.tolist() == expected
+
+
+def test_filter_keeps_metadata():
+    actual = ENTITY_GRID.filter('point')
+    assert actual.column_info == ENTITY_GRID.column_info
+    assert actual.grid_info == ENTITY_GRID.grid_info
+
+
+def test_compiled_filter_is_cached_and_reusable():
+    flt = zincio.compile_filter('point and his')
+    assert zincio.compile_filter('point and his') is flt
+    assert ENTITY_GRID.filter(flt).data.index.tolist() == ['p1', 'p2']
+
+
+@pytest.mark.parametrize("flt", ['', 'point and', 'a == ', '(site', 'a ==='])
+def test_invalid_filter(flt):
+    with pytest.raises(zincio.FilterParseException):
+        zincio.compile_filter(flt)
+
+
+def test_select_columns():
+    grid = zincio.read(FULL_GRID_FILE)
+    actual = grid.select_columns('kind == "Number" and unit != "°C"')
+    assert list(actual.column_info) == ['ts', 'v0', 'v2', 'v4']
+    assert actual.data.columns.tolist() == [
+        grid.data.columns[0], grid.data.columns[2], grid.data.columns[4]]
+    assert actual.grid_info == grid.grid_info
+
+
+def test_select_columns_by_id():
+    grid = zincio.read(FULL_GRID_FILE)
+    actual = grid.select_columns('id == @p:q01b001:r:e69a7401-f4b340ff')
+    assert list(actual.column_info) == ['ts', 'v1']
+    assert len(actual.data.columns) == 1
+
+
+def test_select_columns_entity_grid():
+    # curVal has mixed units, so it has no unit tag
+    actual = ENTITY_GRID.select_columns('unit')
+    assert list(actual.column_info) == ['id', 'area']
+    assert actual.data.columns.tolist() == ['area']
+    assert actual.data.index.equals(ENTITY_GRID.data.index)
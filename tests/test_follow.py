@@ -0,0 +1,97 @@
+import pandas as pd  # type: ignore
+import pytest  # type: ignore
+import zincio
+
+from pathlib import Path
+
+
+def get_abspath(relpath):
+    return Path(__file__).parent / relpath
+
+
+HISREAD_SERIES_FILE = get_abspath("hisread_series.zinc")
+
+HEADER = 'ver:"3.0"\nts tz:"New_York",power unit:"kW",state\n'
+
+
+def row(minute, power):
+    return f'2021-01-01T00:{minute:02d}:00-05:00 New_York,{power}kW,"ok"\n'
+
+
+def append(path, text):
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(text)
+
+
+def test_poll_parses_only_appended_rows(tmp_path):
+    path = tmp_path / 'live.zinc'
+    follower = zincio.ZincFollower(path)
+    assert follower.poll().empty
+
+    append(path, HEADER[:12])
+    assert follower.poll().empty
+    assert follower.column_info == {}
+
+    append(path, HEADER[12:] + row(0, 1.5) + row(1, 2.5)[:20])
+    first = follower.poll()
+    assert first['power'].tolist() == [1.5]
+    assert [str(v) for v in first['state']] == ['ok']
+    assert str(follower.column_info['power']['unit']) == 'kW'
+    # The partial row is left for the next poll
+    assert follower.offset == len((HEADER + row(0, 1.5)).encode())
+
+    append(path, row(1, 2.5)[20:] + '\n' + row(2, 3.5))
+    second = follower.poll()
+    assert second['power'].tolist() == [2.5, 3.5]
+    assert list(second.index) == [
+        pd.Timestamp('2021-01-01T00:01:00-05:00'),
+        pd.Timestamp('2021-01-01T00:02:00-05:00')]
+    assert follower.poll().empty
+
+
+def test_polls_add_up_to_read(tmp_path):
+    text = HISREAD_SERIES_FILE.read_text(encoding='utf-8')
+    path = tmp_path / 'live.zinc'
+    follower = zincio.ZincFollower(path)
+    chunks = []
+    for i in range(0, len(text), 40):
+        append(path, text[i:i + 40])
+        chunks.append(follower.poll())
+    append(path, '\n')
+    chunks.append(follower.poll())
+    expected = zincio.read(HISREAD_SERIES_FILE)
+    assert follower.grid_info == expected.grid_info
+    pd.testing.assert_frame_equal(
+        pd.concat([c for c in chunks if len(c)]), expected.data)
+
+
+def test_rewritten_file_is_followed_from_the_start(tmp_path):
+    path = tmp_path / 'live.zinc'
+    path.write_text(HEADER + row(0, 1.0) + row(1, 2.0), encoding='utf-8')
+    follower = zincio.ZincFollower(path)
+    assert len(follower.poll()) == 2
+    path.write_text(HEADER + row(5, 9.0), encoding='utf-8')
+    assert follower.poll()['power'].tolist() == [9.0]
+
+
+def test_appended_grid_header_is_an_error(tmp_path):
+    path = tmp_path / 'live.zinc'
+    path.write_text(HEADER + row(0, 1.0), encoding='utf-8')
+    follower = zincio.ZincFollower(path)
+    follower.poll()
+    append(path, HEADER)
+    with pytest.raises(zincio.ZincParseException):
+        follower.poll()
+
+
+def test_rows_that_fail_to_parse_are_not_skipped(tmp_path):
+    path = tmp_path / 'live.zinc'
+    path.write_text(HEADER + row(0, 1.0), encoding='utf-8')
+    follower = zincio.ZincFollower(path)
+    follower.poll()
+    offset = follower.offset
+    append(path, '2021-01-01T00:01:00-05:00 New_York,2.0kW,"ok",extra\n')
+    for _ in range(2):
+        with pytest.raises(zincio.ZincParseException):
+            follower.poll()
+        assert follower.offset == offset
@@ -1,4 +1,10 @@
+import io
+import os
+import pandas as pd  # type: ignore
+import pytest  # type: ignore
+import shutil
 import zincio
+
 from pathlib import Path
 
 
@@ -7,6 +13,7 @@ def get_abspath(relpath):
 
 
 SINGLE_SERIES_FILE = get_abspath("single_series_grid.zinc")
+HISREAD_SERIES_FILE = get_abspath("hisread_series.zinc")
 
 
 def test_grid_to_zinc_string():
@@ -24,3 +31,136 @@ def test_grid_to_zinc_file(tmp_path):
     with open(output_file, encoding="utf-8") as f:
         actual = f.read()
     assert actual == expected
+
+
+FULL_GRID_FILE = get_abspath("full_grid.zinc")
+
+
+def test_lazy_grid_has_metadata_without_data():
+    eager = zincio.read(FULL_GRID_FILE)
+    lazy = zincio.read(FULL_GRID_FILE, lazy=True)
+    assert not lazy.loaded
+    assert lazy.version == eager.version
+    assert lazy.grid_info == eager.grid_info
+    assert lazy.column_info == eager.column_info
+    assert not lazy.loaded
+
+
+def test_lazy_grid_parses_data_on_first_access():
+    eager = zincio.read(FULL_GRID_FILE)
+    lazy = zincio.read(FULL_GRID_FILE, lazy=True)
+    pd.testing.assert_frame_equal(lazy.to_pandas(), eager.data)
+    assert lazy.loaded
+
+
+def test_lazy_grid_from_buffer():
+    with open(FULL_GRID_FILE, encoding="utf-8") as f:
+        raw = f.read()
+    lazy = zincio.read(io.StringIO(raw), lazy=True)
+    assert lazy.to_zinc() == raw
+    pd.testing.assert_frame_equal(
+        lazy.data, zincio.read(FULL_GRID_FILE).data)
+
+
+def test_untouched_lazy_grid_to_zinc_copies_source(tmp_path):
+    with open(FULL_GRID_FILE, encoding="utf-8") as f:
+        expected = f.read()
+    lazy = zincio.read(FULL_GRID_FILE, lazy=True)
+    assert lazy.to_zinc() == expected
+    output_file = tmp_path / "output.zinc"
+    lazy.to_zinc(output_file)
+    with open(output_file, encoding="utf-8") as f:
+        assert f.read() == expected
+    assert not lazy.loaded
+
+
+def test_lazy_grid_with_changed_source_is_reserialized(tmp_path):
+    source = tmp_path / "source.zinc"
+    shutil.copyfile(HISREAD_SERIES_FILE, source)
+    lazy = zincio.read(source, lazy=True)
+    text = source.read_text(encoding="utf-8")
+    source.write_text(text.replace('66.092', '99.999'), encoding="utf-8")
+    # Same size; make sure the modification time differs too
+    st = os.stat(source)
+    os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert lazy.to_zinc() == zincio.read(source).to_zinc()
+    assert lazy.loaded
+
+
+def test_lazy_grid_with_modified_metadata_is_reserialized():
+    lazy = zincio.read(SINGLE_SERIES_FILE, lazy=True)
+    lazy.grid_info['dis'] = zincio.String("Renamed")
+    assert 'dis:"Renamed"' in lazy.to_zinc()
+    assert lazy.loaded
+
+
+def test_grid_from_pandas():
+    index = pd.date_range(
+        '2021-03-14', periods=4, freq='h', tz='America/New_York', name='ts')
+    df = pd.DataFrame(
+        {'power': [1.5, None, 3.0, 4.0], 'count': [1, 2, 3, 4]}, index=index)
+    grid = zincio.Grid.from_pandas(
+        df, units={'power': 'kW'},
+        point_ids={'power': 'p1', 'count': zincio.Ref('p2', 'Count')})
+    assert grid.data is df
+    assert grid.column_info == {
+        'ts': {'tz': zincio.String('New_York')},
+        'v0': {
+            'id': zincio.Ref('p1'),
+            'kind': zincio.String('Number'),
+            'unit': zincio.String('kW'),
+        },
+        'v1': {
+            'id': zincio.Ref('p2', 'Count'),
+            'kind': zincio.String('Number'),
+        },
+    }
+    # 02:00 does not exist on the day DST starts
+    assert grid.to_zinc().splitlines()[2:] == [
+        '2021-03-14T00:00:00-05:00 New_York,1.5kW,1',
+        '2021-03-14T01:00:00-05:00 New_York,,2',
+        '2021-03-14T03:00:00-04:00 New_York,3.0kW,3',
+        '2021-03-14T04:00:00-04:00 New_York,4.0kW,4',
+    ]
+
+
+def test_grid_from_pandas_converts_to_tz():
+    index = pd.date_range('2021-01-01', periods=2, freq='h', tz='UTC')
+    series = pd.Series([1.0, 2.0], index=index, name='power')
+    grid = zincio.Grid.from_pandas(series, tz='Los_Angeles')
+    assert grid.to_zinc().splitlines()[2:] == [
+        '2020-12-31T16:00:00-08:00 Los_Angeles,1.0',
+        '2020-12-31T17:00:00-08:00 Los_Angeles,2.0',
+    ]
+
+
+def test_grid_from_pandas_names_ts_index():
+    index = pd.date_range('2021-01-01', periods=4, freq='15min', tz='UTC')
+    df = pd.DataFrame({'power': [1.0, 2.0, 3.0, 4.0]}, index=index)
+    grid = zincio.Grid.from_pandas(df)
+    assert grid.data.index.name == 'ts'
+    assert df.index.name is None
+    assert grid.rollup('1h', 'sum').data.iloc[0, 0] == 10.0
+    assert len(zincio.concat([grid, grid]).data) == 4
+
+
+def test_grid_from_pandas_point_ids_round_trip():
+    index = pd.date_range('2021-01-01', periods=2, freq='h', tz='UTC')
+    df = pd.DataFrame({'a': [1.0, 2.0], 'b': [3.0, 4.0]}, index=index)
+    grid = zincio.Grid.from_pandas(
+        df, point_ids={'a': '@p1', 'b': '@p2 "Temp \\"2\\""'})
+    parsed = zincio.parse(grid.to_zinc())
+    assert parsed.column_info['v0']['id'] == zincio.Ref('p1')
+    assert parsed.column_info['v1']['id'] == zincio.Ref('p2', 'Temp "2"')
+    # Columns as read names them serve as point ids as they are
+    again = zincio.Grid.from_pandas(
+        parsed.data, point_ids={c: c for c in parsed.data.columns})
+    assert again.column_info == parsed.column_info
+    assert zincio.parse(again.to_zinc()).column_info == parsed.column_info
+
+
+def test_grid_from_pandas_rejects_unknown_columns():
+    index = pd.date_range('2021-01-01', periods=2, freq='h', tz='UTC')
+    df = pd.DataFrame({'power': [1.0, 2.0]}, index=index)
+    with pytest.raises(ValueError):
+        zincio.Grid.from_pandas(df, units={'energy': 'kWh'})
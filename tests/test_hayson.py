@@ -0,0 +1,136 @@
+import io
+import json
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+import pytest  # type: ignore
+import zincio
+
+from pathlib import Path
+
+
+def get_abspath(relpath):
+    return Path(__file__).parent / relpath
+
+
+FULL_GRID_FILE = get_abspath("full_grid.zinc")
+
+ENTITY_GRID = (
+    'ver:"3.0"\n'
+    'id,dis,site,equip,curVal,mod,siteRef,area\n'
+    '@s1 "S","Site",M,,5kW,2020-01-01T00:00:00-05:00 New_York,,1000ft²\n'
+    '@p1,"P",,M,3kW,,@s1 "S",\n'
+    '@p2,"Q",,M,,,@s1 "S",\n')
+
+
+def assert_grids_equal(actual, expected):
+    assert actual.version == expected.version
+    assert actual.grid_info == expected.grid_info
+    assert actual.column_info == expected.column_info
+    assert actual.id_dis == expected.id_dis
+    pd.testing.assert_frame_equal(actual.data, expected.data)
+
+
+def test_his_grid_roundtrip(tmp_path):
+    expected = zincio.read(FULL_GRID_FILE)
+    path = tmp_path / "grid.json"
+    expected.to_json(path)
+    assert_grids_equal(zincio.read_json(path), expected)
+
+
+def test_entity_grid_roundtrip():
+    expected = zincio.parse(ENTITY_GRID)
+    actual = zincio.read_json(io.StringIO(expected.to_json()))
+    assert_grids_equal(actual, expected)
+    assert isinstance(actual.data['siteRef'].dtype, pd.CategoricalDtype)
+    assert actual.data['siteRef'].iloc[1] == zincio.Ref('s1', 'S')
+    assert actual.id_dis == {'s1': 'S'}
+    assert actual.to_zinc() == expected.to_zinc()
+
+
+def test_his_grid_str_column_roundtrip():
+    # Too few rows to dictionary-encode the strings
+    expected = zincio.parse(
+        'ver:"3.0"\nts,mode\n'
+        '2020-01-01T00:00:00Z UTC,"heat"\n'
+        '2020-01-01T00:05:00Z UTC,"cool"\n'
+        '2020-01-01T00:10:00Z UTC,"heat"\n')
+    assert expected.data['mode'].dtype == object
+    actual = zincio.read_json(io.StringIO(expected.to_json()))
+    assert_grids_equal(actual, expected)
+
+
+def test_to_json():
+    doc = json.loads(zincio.parse(ENTITY_GRID).to_json())
+    assert doc['meta'] == {'ver': '3.0'}
+    assert doc['cols'][4] == {'name': 'curVal', 'meta': {'unit': 'kW'}}
+    assert doc['rows'][1] == {
+        'id': {'_kind': 'ref', 'val': 'p1'},
+        'dis': 'P',
+        'equip': {'_kind': 'marker'},
+        'curVal': {'_kind': 'number', 'val': 3.0, 'unit': 'kW'},
+        'siteRef': {'_kind': 'ref', 'val': 's1', 'dis': 'S'},
+    }
+
+
+def test_read_json_number_forms():
+    doc = {
+        '_kind': 'grid',
+        'meta': {'ver': '3.0'},
+        'cols': [
+            {'name': 'ts', 'meta': {'tz': 'New_York'}},
+            {'name': 'v0', 'meta': {'kind': 'Number', 'unit': 'kW'}},
+        ],
+        'rows': [
+            {'ts': {'_kind': 'dateTime', 'val': '2020-01-01T00:00:00-05:00',
+                    'tz': 'New_York'},
+             'v0': {'_kind': 'number', 'val': 'INF', 'unit': 'kW'}},
+            {'ts': {'_kind': 'dateTime', 'val': '2020-01-01T00:15:00-05:00',
+                    'tz': 'New_York'},
+             'v0': 2},
+            {'ts': {'_kind': 'dateTime', 'val': '2020-01-01T00:30:00-05:00',
+                    'tz': 'New_York'}},
+        ],
+    }
+    grid = zincio.read_json(io.StringIO(json.dumps(doc)))
+    expected = zincio.parse(
+        'ver:"3.0"\nts tz:"New_York",v0 kind:"Number" unit:"kW"\n'
+        '2020-01-01T00:00:00-05:00 New_York,INF\n'
+        '2020-01-01T00:15:00-05:00 New_York,2kW\n'
+        '2020-01-01T00:30:00-05:00 New_York,\n')
+    pd.testing.assert_frame_equal(grid.data, expected.data)
+
+
+def test_read_json_null_ts_and_whole_numbers():
+    doc = {
+        '_kind': 'grid',
+        'meta': {'ver': '3.0'},
+        'cols': [{'name': 'ts'}, {'name': 'v0'}, {'name': 'v1'}],
+        'rows': [
+            {'ts': {'_kind': 'dateTime', 'val': '2020-01-01T00:00:00Z',
+                    'tz': 'UTC'},
+             'v0': 1, 'v1': 1},
+            {'v0': 2, 'v1': {'_kind': 'number', 'val': 'NaN'}},
+            {'ts': {'_kind': 'dateTime', 'val': '2020-01-01T00:30:00Z'},
+             'v0': 3, 'v1': 2.5},
+        ],
+    }
+    grid = zincio.read_json(io.StringIO(json.dumps(doc)))
+    expected = zincio.parse(
+        'ver:"3.0"\nts,v0,v1\n'
+        '2020-01-01T00:00:00Z UTC,1,1\n'
+        ',2,NaN\n'
+        '2020-01-01T00:30:00Z UTC,3,2.5\n')
+    pd.testing.assert_frame_equal(grid.data, expected.data)
+    assert grid.data['v0'].dtype == np.int64
+
+
+def test_read_json_error_grid():
+    doc = {
+        '_kind': 'grid',
+        'meta': {'ver': '3.0', 'err': {'_kind': 'marker'}, 'dis': 'Oops'},
+        'cols': [{'name': 'empty'}],
+        'rows': [],
+    }
+    with pytest.raises(zincio.ZincErrorGridException):
+        zincio.read_json(io.StringIO(json.dumps(doc)))
@@ -0,0 +1,60 @@
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+import pytest  # type: ignore
+import zincio
+
+
+def make_frame():
+    index = pd.date_range(
+        '2021-03-14', periods=4, freq='h', tz='America/New_York')
+    return pd.DataFrame(
+        {'power': [1.5, np.nan, np.inf, 4e20], 'count': [1, 2, 3, 4]},
+        index=index)
+
+
+def test_encode_his_write_per_point():
+    payloads = zincio.encode_his_write(
+        make_frame(),
+        {'power': 'p1', 'count': zincio.Ref('p2', 'Count')},
+        units={'power': 'kW'})
+    assert [p.decode().splitlines() for p in payloads] == [
+        [
+            'ver:"3.0" id:@p1',
+            'ts,val',
+            '2021-03-14T00:00:00-05:00 New_York,1.5kW',
+            '2021-03-14T03:00:00-04:00 New_York,INF',
+            '2021-03-14T04:00:00-04:00 New_York,4e+20kW',
+        ],
+        [
+            'ver:"3.0" id:@p2',
+            'ts,val',
+            '2021-03-14T00:00:00-05:00 New_York,1.0',
+            '2021-03-14T01:00:00-05:00 New_York,2.0',
+            '2021-03-14T03:00:00-04:00 New_York,3.0',
+            '2021-03-14T04:00:00-04:00 New_York,4.0',
+        ],
+    ]
+    grid = zincio.parse(payloads[0])
+    assert grid.grid_info['id'] == zincio.Ref('p1')
+    np.testing.assert_array_equal(grid.data['val'], [1.5, np.inf, 4e20])
+
+
+def test_encode_his_write_multi_point():
+    frame = make_frame()
+    frame.iloc[1, 1] = np.nan
+    [payload] = zincio.encode_his_write(
+        frame, ['p1', '@p2'], tz='Chicago', multi_point=True)
+    assert payload.decode().splitlines() == [
+        'ver:"3.0"',
+        'ts,v0 id:@p1,v1 id:@p2',
+        '2021-03-13T23:00:00-06:00 Chicago,1.5,1.0',
+        '2021-03-14T01:00:00-06:00 Chicago,INF,3.0',
+        '2021-03-14T03:00:00-05:00 Chicago,4e+20,4.0',
+    ]
+    grid = zincio.parse(payload)
+    assert list(grid.data.columns) == ['@p1', '@p2']
+
+
+def test_encode_his_write_checks_point_ids():
+    with pytest.raises(ValueError):
+        zincio.encode_his_write(make_frame(), ['p1'])
@@ -0,0 +1,78 @@
+import numpy as np  # type: ignore
+import pytest  # type: ignore
+import zincio
+
+from zincio.refs import RefIndex
+
+
+SITES = zincio.parse(
+    'ver:"3.0"\n'
+    'id,dis,site,area\n'
+    '@s1 "Site 1","Site 1",M,5000ft²\n'
+    '@s2 "Site 2","Site 2",M,100ft²\n')
+
+EQUIPS = zincio.parse(
+    'ver:"3.0"\n'
+    'id,dis,equip,siteRef\n'
+    '@e1,"AHU",M,@s1 "Site 1"\n'
+    '@e2,"VAV",M,@s2\n'
+    '@e3,"Orphan",M,@s9\n')
+
+POINTS = zincio.parse(
+    'ver:"3.0"\n'
+    'id,dis,point,equipRef\n'
+    '@p1,"Temp",M,@e1\n'
+    '@p2,"Temp 2",M,@e1\n'
+    '@p3,"Flow",M,@e2\n'
+    '@p4,"Loose",M,\n'
+    '@p5,"Dangling",M,@e3\n')
+
+
+def test_ref_index():
+    index = RefIndex([zincio.Ref('a'), 'b', zincio.Ref('a', 'dup'), None])
+    assert len(index) == 4
+    assert zincio.Ref('b') in index
+    assert 'c' not in index
+    assert index.get('a') == 0
+    assert index.get(zincio.Ref('c')) == -1
+    np.testing.assert_array_equal(
+        index.positions(['b', None, zincio.Ref('a'), 'x']), [1, -1, 0, -1])
+
+
+def test_grid_ref_index_is_cached():
+    assert EQUIPS.ref_index is EQUIPS.ref_index
+    assert EQUIPS.ref_index.get(zincio.Ref('e2')) == 1
+
+
+def test_ref_index_requires_id():
+    grid = zincio.parse('ver:"3.0"\ndis\n"x"\n')
+    with pytest.raises(ValueError):
+        grid.ref_index
+
+
+def test_follow():
+    equips = POINTS.follow('equipRef', EQUIPS)
+    assert equips.data.index.tolist() == ['p1', 'p2', 'p3', 'p4', 'p5']
+    assert equips.data['dis'].tolist()[:3] == ['AHU', 'AHU', 'VAV']
+    assert equips.data['dis'].isna().tolist() == [
+        False, False, False, True, False]
+
+    sites = equips.follow('siteRef', SITES)
+    assert sites.data.index.tolist() == ['p1', 'p2', 'p3', 'p4', 'p5']
+    assert sites.data['area'].tolist()[:3] == [5000, 5000, 100]
+    assert sites.data['area'].isna().tolist()[3:] == [True, True]
+    assert sites.column_info['area']['unit'] == zincio.String('ft²')
+
+
+def test_follow_multiple_targets():
+    targets = POINTS.follow('equipRef', SITES, EQUIPS)
+    assert targets.data['dis'].tolist()[:3] == ['AHU', 'AHU', 'VAV']
+    assert targets.data['site'].isna().all()
+
+
+def test_referrers():
+    ahus = EQUIPS.filter('dis == "AHU"')
+    assert ahus.referrers(POINTS, 'equipRef').data.index.tolist() == [
+        'p1', 'p2']
+    assert SITES.referrers(EQUIPS, 'siteRef').data.index.tolist() == [
+        'e1', 'e2']
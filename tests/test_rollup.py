@@ -0,0 +1,107 @@
+import io
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+import pytest  # type: ignore
+import zincio
+
+from pathlib import Path
+
+
+def get_abspath(relpath):
+    return Path(__file__).parent / relpath
+
+
+HISREAD_SERIES_FILE = get_abspath("hisread_series.zinc")
+
+
+def his_grid(index, values, **tags):
+    return zincio.Grid(
+        version=3,
+        grid_info={},
+        column_info={'ts': {}, 'v0': dict(tags)},
+        data=pd.DataFrame({'v0': values}, index=index, dtype=float))
+
+
+@pytest.mark.parametrize("fold", zincio.rollup.FOLDS)
+def test_rollup_matches_resample(fold):
+    grid = zincio.read(HISREAD_SERIES_FILE)
+    actual = grid.rollup('1h', fold).data['val']
+    how = dict(avg='mean').get(fold, fold)
+    expected = getattr(grid.data['val'].resample('1h'), how)()
+    np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy())
+    assert (actual.index == expected.index).all()
+
+
+def test_rollup_keeps_units_and_tz():
+    index = pd.date_range(
+        '2020-01-01', periods=8, freq='15min', tz='America/Los_Angeles',
+        name='ts')
+    grid = his_grid(index, [1, 2, 3, 4, 5, np.nan, 7, 8],
+                    unit=zincio.String('kW'))
+    actual = grid.rollup('1h', 'avg')
+    assert actual.column_info['v0'] == dict(unit=zincio.String('kW'))
+    assert str(actual.data.index.tz) == 'America/Los_Angeles'
+    np.testing.assert_allclose(actual.data['v0'], [2.5, 20 / 3])
+    counts = grid.rollup('1h', 'count')
+    assert counts.column_info['v0'] == {}
+    np.testing.assert_array_equal(counts.data['v0'], [4, 3])
+
+
+def test_rollup_across_dst():
+    index = pd.date_range(
+        '2020-11-01', '2020-11-02', freq='15min', tz='America/Los_Angeles',
+        inclusive='left', name='ts')
+    grid = his_grid(index, np.ones(len(index)))
+    hourly = grid.rollup('1h', 'count').data['v0']
+    # The day DST ends has 25 hours, the repeated one kept apart
+    assert len(hourly) == 25
+    assert (hourly == 4).all()
+    daily = grid.rollup('1D', 'sum').data['v0']
+    assert daily.index.tolist() == [
+        pd.Timestamp('2020-11-01', tz='America/Los_Angeles')]
+    assert daily.tolist() == [100]
+
+
+def test_rollup_chunked_read():
+    with open(HISREAD_SERIES_FILE, encoding='utf-8') as f:
+        text = f.read()
+    expected = zincio.parse(text).rollup('1h', 'max')
+    rollup = zincio.Rollup('1h', 'max')
+    chunks = list(zincio.read_chunked(io.StringIO(text), chunksize=1))
+    assert len(chunks) > 1
+    for chunk in chunks:
+        rollup.add(chunk)
+    pd.testing.assert_frame_equal(rollup.result().data, expected.data)
+
+
+@pytest.mark.parametrize("fold", zincio.rollup.FOLDS)
+def test_rollup_chunks_out_of_order(fold):
+    index = pd.date_range(
+        '2020-01-01', periods=60, freq='7min', tz='America/New_York',
+        name='ts')
+    values = np.arange(60.0)
+    values[::11] = np.nan
+    expected = his_grid(index, values).rollup('1h', fold)
+    rollup = zincio.Rollup('1h', fold)
+    # Chunks that split intervals, added in time order, then going back
+    bounds = [0, 5, 9, 30, 31, 50, 60]
+    for i in [0, 1, 2, 5, 3, 4]:
+        chunk = slice(bounds[i], bounds[i + 1])
+        rollup.add(his_grid(index[chunk], values[chunk]))
+    pd.testing.assert_frame_equal(rollup.result().data, expected.data)
+
+
+def test_rollup_of_empty_grid():
+    index = pd.DatetimeIndex([], tz='UTC', name='ts')
+    actual = his_grid(index, []).rollup('1h', 'avg')
+    assert len(actual.data) == 0
+
+
+def test_rollup_rejects_bad_arguments():
+    with pytest.raises(ValueError):
+        zincio.Rollup('1h', 'median')
+    with pytest.raises(ValueError):
+        zincio.Rollup('1h', 'avg').result()
+    with pytest.raises(ValueError):
+        zincio.parse('ver:"3.0"\nid\n@a\n').rollup('1h')
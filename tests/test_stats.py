@@ -0,0 +1,52 @@
+import io
+import pandas as pd  # type: ignore
+import zincio
+
+from pathlib import Path
+from zincio.tokens import TokenType
+
+
+def get_abspath(relpath):
+    return Path(__file__).parent / relpath
+
+
+FULL_GRID_FILE = get_abspath("full_grid.zinc")
+
+
+def test_read_with_stats_same_as_without():
+    stats = zincio.ParseStats()
+    actual = zincio.read(FULL_GRID_FILE, stats=stats)
+    expected = zincio.read(FULL_GRID_FILE)
+    assert actual.grid_info == expected.grid_info
+    assert actual.column_info == expected.column_info
+    pd.testing.assert_frame_equal(actual.data, expected.data)
+
+
+def test_read_with_stats_counts():
+    stats = zincio.ParseStats()
+    zincio.read(FULL_GRID_FILE, stats=stats)
+    assert stats.bytes_read == FULL_GRID_FILE.stat().st_size
+    assert stats.rows == 5
+    assert stats.cells == 30
+    assert stats.tokens[TokenType.DATETIME] == 7
+    assert stats.tokens[TokenType.EOF] >= 1
+    assert stats.peak_memory is None
+    for phase in zincio.stats.PHASES:
+        assert stats.phase_times[phase] >= 0
+    assert stats.phase_times['total'] >= (
+        stats.phase_times['io'] + stats.phase_times['tokenize'])
+
+
+def test_read_with_stats_traces_memory():
+    stats = zincio.ParseStats(trace_memory=True)
+    zincio.read(FULL_GRID_FILE, stats=stats)
+    assert stats.peak_memory > 0
+
+
+def test_read_with_stats_reports_progress():
+    seen = []
+    stats = zincio.ParseStats(
+        progress=lambda s: seen.append(s.rows), progress_every=2)
+    with open(FULL_GRID_FILE, encoding="utf-8") as f:
+        zincio.read(io.StringIO(f.read()), stats=stats)
+    assert seen == [2, 4]
@@ -0,0 +1,92 @@
+import csv
+import gzip
+import io
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+import pytest  # type: ignore
+import zincio
+
+from pathlib import Path
+
+
+def get_abspath(relpath):
+    return Path(__file__).parent / relpath
+
+
+FULL_GRID_FILE = get_abspath("full_grid.zinc")
+
+
+def test_transcode_his_grid(tmp_path):
+    output_file = tmp_path / "output.csv"
+    assert zincio.transcode(FULL_GRID_FILE, output_file, chunksize=2) == 5
+    with open(output_file, encoding='utf-8', newline='') as f:
+        rows = list(csv.reader(f))
+    assert len(rows) == 6
+    assert rows[0][0] == 'ts'
+    assert rows[0][1].startswith('@p:q01b001:r:0197767d-c51944e4')
+    assert rows[1] == ['2020-05-18T06:47:08Z', '', 'Occupied', '', '', '']
+    assert rows[2] == [
+        '2020-05-18T06:55:00Z', '68.553', '', '3.0', '-1.984', '118.65']
+    assert rows[3][3] == '7.0'
+
+
+def test_transcode_entity_grid():
+    src = io.StringIO(
+        'ver:"3.0"\n'
+        'id,dis,site,curVal,mod,siteRef\n'
+        '@s1 "S","Site",M,5kW,2020-01-01T00:00:00-05:00 New_York,\n'
+        '@p1,"P",,3W,,@s1 "S"\n')
+    out = io.StringIO()
+    assert zincio.transcode(src, out) == 2
+    assert out.getvalue().splitlines() == [
+        'id,dis,site,curVal,mod,siteRef',
+        '@s1,Site,True,5,2020-01-01T05:00:00Z,',
+        '@p1,P,False,3,,@s1',
+    ]
+
+
+def test_transcode_entity_grid_npz():
+    src = io.StringIO(
+        'ver:"3.0"\n'
+        'id,siteRef\n'
+        '@s1,\n'
+        ',@s1\n')
+    out = io.BytesIO()
+    assert zincio.transcode(src, out, 'npz') == 2
+    out.seek(0)
+    arrays = np.load(out)
+    assert list(arrays['index']) == ['@s1', '']
+    assert list(arrays['c0']) == ['', '@s1']
+
+
+def test_transcode_rejects_unknown_format():
+    with pytest.raises(ValueError):
+        zincio.transcode(FULL_GRID_FILE, io.StringIO(), format='parquet')
+
+
+def test_transcode_zinc_gz(tmp_path):
+    output_file = tmp_path / "output.zinc.gz"
+    assert zincio.transcode(
+        FULL_GRID_FILE, output_file, 'zinc.gz', chunksize=2) == 5
+    with gzip.open(output_file, 'rt', encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    expected = zincio.read(FULL_GRID_FILE).to_zinc().splitlines()
+    # The header is written once, followed by every chunk's rows
+    assert len(lines) == len(expected) == 7
+    assert lines[:4] == expected[:4]
+    pd.testing.assert_frame_equal(
+        zincio.parse('\n'.join(lines)).data,
+        zincio.read(FULL_GRID_FILE).data)
+
+
+def test_transcode_npz():
+    out = io.BytesIO()
+    assert zincio.transcode(FULL_GRID_FILE, out, 'npz') == 5
+    out.seek(0)
+    arrays = np.load(out)
+    assert arrays['index'][1] == np.datetime64('2020-05-18T06:55:00')
+    assert arrays['columns'][0].startswith('@p:q01b001:r:0197767d-c51944e4')
+    np.testing.assert_array_equal(
+        arrays['c0'], [np.nan, 68.553, 68.554, 69.723, np.nan])
+    assert list(arrays['c1']) == ['Occupied', '', '', '', 'Unoccupied']
@@ -0,0 +1,146 @@
+import io
+
+import pandas as pd  # type: ignore
+import pytest  # type: ignore
+import zincio
+
+from zincio.tz import format_index, haystack_tz, iana_zone, localize
+
+
+@pytest.mark.parametrize("name,zone", [
+    ('Los_Angeles', 'America/Los_Angeles'),
+    ('New_York', 'America/New_York'),
+    ('London', 'Europe/London'),
+    ('GMT-10', 'Etc/GMT-10'),
+    ('UTC', 'Etc/UTC'),
+    ('Europe/Berlin', 'Europe/Berlin'),
+    ('Nowhere', None),
+])
+def test_iana_zone(name, zone):
+    assert iana_zone(name) == zone
+
+
+def test_haystack_tz():
+    assert haystack_tz('America/Los_Angeles') == 'Los_Angeles'
+    assert haystack_tz('Etc/GMT+5') == 'GMT+5'
+    assert haystack_tz('UTC') == 'UTC'
+    assert haystack_tz('UTC-07:00') is None
+
+
+# The hour repeated when DST ends in New York
+DST_END = [
+    '2020-11-01T00:30:00-04:00 New_York',
+    '2020-11-01T01:30:00-04:00 New_York',
+    '2020-11-01T01:30:00-05:00 New_York',
+    '2020-11-01T02:30:00-05:00 New_York',
+]
+
+
+def test_localize_across_dst():
+    index = localize(DST_END)
+    assert str(index.tz) == 'America/New_York'
+    expected = pd.date_range(
+        '2020-11-01 04:30', periods=4, freq='1h', tz='UTC')
+    assert (index == expected).all()
+    assert str(localize(DST_END, 'UTC').tz) == 'Etc/UTC'
+
+
+def test_format_index_round_trips():
+    assert format_index(localize(DST_END)) == DST_END
+    index = pd.DatetimeIndex(['2020-01-01T00:00:00.5Z'])
+    assert format_index(index) == ['2020-01-01T00:00:00.500Z UTC']
+
+
+def test_parse_localizes_ts_to_declared_tz():
+    grid = zincio.parse(
+        'ver:"3.0"\nts tz:"New_York",v0\n' +
+        '\n'.join(f'{ts},{i}' for i, ts in enumerate(DST_END)) + '\n')
+    assert str(grid.data.index.tz) == 'America/New_York'
+    assert grid.data.index.is_monotonic_increasing
+    assert grid.to_zinc().splitlines()[2:] == [
+        f'{ts},{i}' for i, ts in enumerate(DST_END)]
+
+
+# Five-minute readings through the end of DST in New York
+REGULAR = pd.date_range(
+    '2020-11-01T04:00Z', periods=48, freq='5min').tz_convert(
+        'America/New_York')
+
+
+def test_localize_regular_series_sets_freq():
+    index = localize(format_index(REGULAR))
+    assert index.freq == pd.Timedelta('5min')
+    assert (index == REGULAR).all()
+
+
+def test_localize_regular_series_with_irregular_ends():
+    text = format_index(REGULAR)
+    text[0] = '2020-10-31T23:47:08-04:00 New_York'
+    text[-1] = '2020-11-01T02:57:59-05:00 New_York'
+    index = localize(text)
+    assert index.freq is None
+    assert format_index(index) == text
+    assert (index[1:-1] == REGULAR[1:-1]).all()
+
+
+def test_localize_regular_series_without_zone_names():
+    index = localize(format_index(REGULAR, ''), 'New_York')
+    assert index.freq == pd.Timedelta('5min')
+    assert (index == REGULAR).all()
+    assert str(index.tz) == 'America/New_York'
+
+
+def test_localize_series_with_gap():
+    text = format_index(REGULAR.delete(20))
+    assert localize(text).freq is None
+    assert format_index(localize(text)) == text
+
+
+@pytest.mark.parametrize("index", [
+    REGULAR,
+    REGULAR.tz_convert('UTC'),
+    pd.date_range('1965-06-01', periods=20, freq='250ms', tz='Europe/Paris'),
+    pd.DatetimeIndex([REGULAR[0] - pd.Timedelta('1d')]).append(REGULAR[1:]),
+])
+def test_format_regular_index_as_any_index(index):
+    # As formatted one timestamp at a time
+    irregular = pd.DatetimeIndex(list(index), freq=None)[::-1]
+    assert format_index(index) == format_index(irregular)[::-1]
+
+
+def test_parsed_regular_grid_has_freq_and_round_trips():
+    rows = [f'{ts},{i}' for i, ts in enumerate(format_index(REGULAR))]
+    text = 'ver:"3.0"\nts tz:"New_York",v0\n' + '\n'.join(rows) + '\n'
+    grid = zincio.parse(text)
+    assert grid.data.index.freq == pd.Timedelta('5min')
+    assert grid.to_zinc() == text
+
+
+def test_localize_mixed_precision():
+    text = [f'2020-01-01T00:00:{i:02d}{".5" if i % 3 else ""}Z UTC'
+            for i in range(12)]
+    index = localize(text)
+    assert index[1] == pd.Timestamp('2020-01-01T00:00:01.5Z')
+    assert index[3] == pd.Timestamp('2020-01-01T00:00:03Z')
+
+
+def test_parse_null_ts_is_nat():
+    grid = zincio.parse(
+        'ver:"3.0"\nts,v0\n2020-01-01T00:00:00Z UTC,1\n,2\n'
+        '2020-01-01T00:00:00.5Z UTC,3\n')
+    index = grid.data.index
+    assert str(index.tz) == 'Etc/UTC'
+    assert index[1] is pd.NaT
+    assert index[2] == pd.Timestamp('2020-01-01T00:00:00.5Z')
+
+
+def test_null_ts_round_trips():
+    grid = zincio.parse(
+        'ver:"3.0"\nts,v0\nN,1\n2020-01-01T00:00:00Z UTC,2\n'
+        '2020-01-01T00:05:00Z UTC,3\n')
+    text = grid.to_zinc()
+    assert text.splitlines()[2:] == [
+        ',1', '2020-01-01T00:00:00Z UTC,2', '2020-01-01T00:05:00Z UTC,3']
+    pd.testing.assert_frame_equal(zincio.parse(text).data, grid.data)
+    as_json = io.StringIO(grid.to_json())
+    pd.testing.assert_frame_equal(zincio.read_json(as_json).data, grid.data)
@@ -1,4 +1,5 @@
 # coding: utf-8
+import concurrent.futures
 import io
 import numpy as np  # type: ignore
 import pandas as pd  # type: ignore
@@ -7,6 +8,8 @@ import zincio
 
 from pandas.api.types import CategoricalDtype  # type: ignore
 from pathlib import Path
+from zincio.zinc_parser import ZincParser
+from zincio.zinc_tokenizer import ZincTokenizer
 
 
 def get_abspath(relpath):
@@ -143,9 +146,9 @@ def test_read_zinc_grid():
             haystackPoint=zincio.MARKER,
             writeVal=zincio.Number(-10.0),
             actions=zincio.String(
-                'ver:\\"3.0\\"\\ndis,expr\\n\\"Override\\",'
-                '\\"pointOverride(\\$self, \\$val, \\$duration)\\"\\n'
-                '\\"Auto\\",\\"pointAuto(\\$self)\\"\\n')
+                'ver:"3.0"\ndis,expr\n"Override",'
+                '"pointOverride($self, $val, $duration)"\n'
+                '"Auto","pointAuto($self)"\n')
         ),
         v4=dict(
             id=zincio.Ref('p:q01b001:r:260ce2bb-2ef5065f',
@@ -174,7 +177,7 @@ def test_read_zinc_grid():
             pd.to_datetime('2020-05-18T00:05:00-07:00'),
             pd.to_datetime('2020-05-18T01:13:09-07:00'),
         ],
-        name='ts')
+        name='ts').tz_convert('America/Los_Angeles')
     expected_dataframe = pd.DataFrame(
         index=expected_index,
         data={
@@ -259,7 +262,7 @@ def test_read_zinc_single_series():
                 pd.to_datetime('2020-05-18T01:13:09-07:00'),
             ],
             name='ts',
-        ))
+        ).tz_convert('America/Los_Angeles'))
     expected = zincio.Grid(
         version=3,
         grid_info=expected_grid_info,
@@ -288,7 +291,7 @@ def test_read_zinc_deficient_column_info():
                 pd.to_datetime('2020-04-01T00:10:00-07:00'),
             ],
             name='ts',
-        ))
+        ).tz_convert('America/Los_Angeles'))
     expected = zincio.Grid(
         version=3,
         grid_info=expected_grid_info,
@@ -333,7 +336,7 @@ def test_read_zinc_minimal_colinfo():
                 pd.to_datetime("2018-03-21T14:45:00+10:00"),
             ],
             name='ts'
-        )
+        ).dt.tz_convert('Etc/GMT-10')
     )
     expected = zincio.Grid(
         version=2,
@@ -368,7 +371,7 @@ def test_parse_grid_with_sentinels():
                 pd.to_datetime('2018-03-21T15:55:00+10:00'),
             ],
             name='ts',
-        ),
+        ).dt.tz_convert('Etc/GMT-10'),
     )
     expected = zincio.Grid(
         version=3,
@@ -443,7 +446,10 @@ def test_parse_kitchen_sink_data():
         ),
         v2=dict(
             id=zincio.Ref('point.boolean'),
-            actions=zincio.String(long_action_str.strip('"')),
+            actions=zincio.String(
+                'ver:"3.0"\ndis,expr\n"Override",'
+                '"pointOverride($self, $val, $duration)"\n'
+                '"Auto","pointAuto($self)"\n'),
         ),
         v3=dict(id=zincio.Ref('point.sometimes_inf_nan'))
     )
@@ -465,7 +471,7 @@ def test_parse_kitchen_sink_data():
                 pd.to_datetime('2020-05-18T03:15:00-07:00'),
             ],
             name='ts',
-        ),
+        ).dt.tz_convert('Etc/GMT-8'),
     )
     expected = zincio.Grid(
         version=3,
@@ -474,3 +480,169 @@ def test_parse_kitchen_sink_data():
         data=expected_data)
     actual = zincio.parse(s)
     assert_grid_equal(actual, expected)
+
+
+ENTITY_GRID = (
+    'ver:"3.0"\n'
+    'id,dis,site,equip,point,siteRef,equipRef,curVal,enabled\n'
+    '@s1 "Site 1","Site 1",M,,,,,,\n'
+    '@e1 "AHU","AHU",,M,,@s1 "Site 1",,,T\n'
+    '@p1,"Temp",,,M,@s1,@e1 "AHU",72.5°F,\n'
+    '@p2,"Temp 2",,,M,@s1,@e1 "AHU",70°F,F\n')
+
+
+def test_parse_entity_grid():
+    actual = zincio.parse(ENTITY_GRID)
+    assert actual.grid_info == {}
+    assert list(actual.column_info) == [
+        'id', 'dis', 'site', 'equip', 'point', 'siteRef', 'equipRef',
+        'curVal', 'enabled']
+    assert actual.column_info['curVal'] == dict(unit=zincio.String('°F'))
+    df = actual.data
+    pd.testing.assert_index_equal(
+        df.index, pd.Index(['s1', 'e1', 'p1', 'p2'], name='id'))
+    assert df['site'].tolist() == [True, False, False, False]
+    assert df['point'].tolist() == [False, False, True, True]
+    assert df['dis'].tolist() == ['Site 1', 'AHU', 'Temp', 'Temp 2']
+    assert df['siteRef'].tolist()[1:] == [
+        zincio.Ref('s1', 'Site 1'), zincio.Ref('s1'), zincio.Ref('s1')]
+    assert pd.isna(df['siteRef'].iloc[0])
+    assert df['equipRef'].dtype == 'category'
+    np.testing.assert_array_equal(
+        df['curVal'].to_numpy(), [np.nan, np.nan, 72.5, 70.0])
+    assert df['enabled'].tolist() == [None, True, None, False]
+
+
+def test_parse_entity_grid_sparse_columns():
+    rows = [f'@p{i},{"M" if i % 100 == 0 else ""}' for i in range(1000)]
+    s = 'ver:"3.0"\nid,rare\n' + '\n'.join(rows) + '\n'
+    rare = zincio.parse(s).data['rare']
+    assert isinstance(rare.dtype, pd.SparseDtype)
+    assert rare.sum() == 10
+    assert rare.array.sp_index.npoints == 10
+
+
+def test_parse_entity_grid_dense_marker_columns():
+    rows = [f'@p{i},{"M" if i % 2 == 0 else ""}' for i in range(1000)]
+    s = 'ver:"3.0"\nid,common\n' + '\n'.join(rows) + '\n'
+    common = zincio.parse(s).data['common']
+    assert common.dtype == bool
+    assert common.sum() == 500
+
+
+def test_parse_entity_grid_without_id():
+    actual = zincio.parse('ver:"3.0"\ndis,site\n"A",M\n"B",\n')
+    pd.testing.assert_index_equal(actual.data.index, pd.RangeIndex(2))
+    assert actual.data['site'].tolist() == [True, False]
+
+
+def test_parse_dictionary_encodes_repeated_strings_and_refs():
+    rows = [
+        f'2020-01-01T00:{i:02d}:00Z UTC,"{["ok", "fault"][i % 2]}",'
+        f'@r{i % 3},"u{i}",' + ('M' if i else '"x"')
+        for i in range(20)]
+    s = 'ver:"3.0"\nts,status,ref,unique,mixed\n' + '\n'.join(rows) + '\n'
+    df = zincio.parse(s).data
+    assert df['status'].dtype == 'category'
+    assert list(df['status'].cat.categories) == ['ok', 'fault']
+    assert df['status'].tolist()[:3] == ['ok', 'fault', 'ok']
+    assert df['ref'].dtype == 'category'
+    assert df['ref'].tolist()[:3] == [
+        zincio.Ref('r0'), zincio.Ref('r1'), zincio.Ref('r2')]
+    assert df['unique'].dtype == object
+    assert df['mixed'].dtype == object
+
+
+def test_parse_high_cardinality_strs_are_plain_strs():
+    rows = [f'2020-01-01T00:{i:02d}:00Z UTC,' + (f'"u{i}"' if i else '')
+            for i in range(20)]
+    df = zincio.parse('ver:"3.0"\nts,unique\n' + '\n'.join(rows)).data
+    assert df['unique'].dtype == object
+    assert df['unique'].tolist()[:3] == [None, 'u1', 'u2']
+
+
+def test_parse_row():
+    line = '2020-01-01T00:00:00-08:00 Los_Angeles,,72.5°F,"a,b",\n'
+    parser = ZincParser(ZincTokenizer(io.StringIO(line)))
+    ts, empty, num, text = parser.parse_row()
+    assert ts.tz == 'Los_Angeles'
+    assert empty is zincio.dtypes.NULL
+    assert num == zincio.dtypes.Number(72.5, '°F')
+    assert text == zincio.dtypes.String('a,b')
+
+
+def test_parse_does_not_confuse_str_and_ref_of_same_text():
+    cells = ['"abc"', '@abc', '@abc', '"abc"']
+    his = zincio.parse(
+        'ver:"3.0"\nts,v\n' + '\n'.join(
+            f'2020-01-01T00:0{i}:00Z UTC,{c}'
+            for i, c in enumerate(cells)) + '\n').data
+    entities = zincio.parse(
+        'ver:"3.0"\nid,v\n' + '\n'.join(
+            f'@e{i},{c}' for i, c in enumerate(cells)) + '\n').data
+    for df in (his, entities):
+        values = df['v'].tolist()
+        assert [isinstance(v, zincio.Ref) for v in values] == [
+            False, True, True, False]
+        assert [str(v).lstrip('@') for v in values] == ['abc'] * 4
+
+
+def test_parse_entity_grid_high_cardinality_strings():
+    rows = [f'@p{i},"Point {i}",{"@e1" if i % 2 else ""}' for i in range(10)]
+    s = 'ver:"3.0"\nid,dis,equipRef\n' + '\n'.join(rows) + '\n'
+    df = zincio.parse(s).data
+    assert df['dis'].dtype == object
+    assert df['dis'].tolist()[:2] == ['Point 0', 'Point 1']
+    assert df['equipRef'].dtype == 'category'
+    assert df['equipRef'].isna().sum() == 5
+
+
+def test_read_chunked():
+    expected = zincio.read(FULL_GRID_FILE)
+    chunks = list(zincio.read_chunked(FULL_GRID_FILE, chunksize=2))
+    assert [len(c.data) for c in chunks] == [2, 2, 1]
+    for chunk in chunks:
+        assert chunk.grid_info == expected.grid_info
+        assert chunk.column_info == expected.column_info
+    pd.testing.assert_frame_equal(
+        pd.concat([c.data for c in chunks]), expected.data)
+
+
+def test_read_chunked_empty_grid():
+    chunks = list(zincio.read_chunked(io.StringIO('ver:"3.0"\nid,dis\n')))
+    assert len(chunks) == 1
+    assert chunks[0].data.empty
+
+
+def test_read_all_grids_back_to_back(tmp_path):
+    with open(FULL_GRID_FILE, encoding='utf-8') as f:
+        his = f.read().rstrip('\n') + '\n'
+    # Separated by a blank line, not at all, and by a final empty grid
+    path = tmp_path / "stream.zinc"
+    path.write_text(
+        his + '\n' + ENTITY_GRID + his + 'ver:"3.0"\nid,dis\n',
+        encoding='utf-8')
+    grids = zincio.read_all(path)
+    assert [len(g.data) for g in grids] == [5, 4, 5, 0]
+    pd.testing.assert_frame_equal(
+        grids[0].data, zincio.read(FULL_GRID_FILE).data)
+    assert grids[1].data.index.name == 'id'
+
+
+def test_iter_grids_is_lazy():
+    stream = io.StringIO(ENTITY_GRID + 'ver:"3.0"\nid\n@p1,@p2\n')
+    grids = zincio.iter_grids(stream)
+    assert len(next(grids).data) == 4
+    with pytest.raises(zincio.ZincParseException):
+        next(grids)
+
+
+def num_rows(grid):
+    return len(grid.data)
+
+
+def test_iter_grids_can_be_pickled_to_workers():
+    stream = io.StringIO(ENTITY_GRID + '\n' + ENTITY_GRID)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=2) as pool:
+        sizes = list(pool.map(num_rows, zincio.iter_grids(stream)))
+    assert sizes == [4, 4]
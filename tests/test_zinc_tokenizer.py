@@ -81,9 +81,9 @@ def test_tokenize_long_string_valued_tag():
         tokens.COLON,
         Token(
             TokenType.STRING,
-            ('ver:\\"3.0\\"\\ndis,expr\\n\\"Override\\",\\"pointOverride(\\$'
-             'self, \\$val, \\$duration)\\"\\n\\"Auto\\",\\"pointAuto(\\$self)'
-             '\\"\\n')
+            ('ver:"3.0"\ndis,expr\n"Override","pointOverride($'
+             'self, $val, $duration)"\n"Auto","pointAuto($self)'
+             '"\n')
         ),
         tokens.EOF,
     ]
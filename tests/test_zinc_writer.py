@@ -0,0 +1,136 @@
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+import pytest  # type: ignore
+import zincio
+
+from pathlib import Path
+
+
+def get_abspath(relpath):
+    return Path(__file__).parent / relpath
+
+
+FULL_GRID_FILE = get_abspath("full_grid.zinc")
+
+ENTITY_GRID = (
+    'ver:"3.0"\n'
+    'id,dis,site,equip,point,siteRef,equipRef,curVal,enabled,mod\n'
+    '@s1,"Site \\"1\\"",M,,,,,,,2020-01-01T00:00:00-05:00 New_York\n'
+    '@e1,"AHU",,M,,@s1 "Site 1",,,T,\n'
+    '@p1,"Temp",,,M,@s1,@e1 "AHU",72.5°F,,\n'
+    '@p2,"Temp 2",,,M,@s1,@e1 "AHU",INF,F,\n')
+
+
+def test_entity_grid_roundtrip():
+    expected = zincio.parse(ENTITY_GRID)
+    actual = zincio.parse(expected.to_zinc())
+    assert actual.column_info == expected.column_info
+    pd.testing.assert_frame_equal(actual.data, expected.data)
+
+
+def test_entity_grid_rows():
+    lines = zincio.parse(ENTITY_GRID).to_zinc().splitlines()
+    assert lines[2:] == [
+        '@s1,"Site \\"1\\"",M,,,,,,,2020-01-01T00:00:00-05:00 New_York',
+        '@e1,"AHU",,M,,@s1 "Site 1",,,T,',
+        '@p1,"Temp",,,M,@s1,@e1 "AHU",72.5°F,,',
+        '@p2,"Temp 2",,,M,@s1,@e1 "AHU",INF,F,',
+    ]
+
+
+def test_id_display_names_round_trip():
+    text = (
+        'ver:"3.0"\n'
+        'id,site\n'
+        '@s1 "Site \\"1\\"",M\n'
+        '@s2,M\n'
+        '@s3 "Three",\n')
+    grid = zincio.parse(text)
+    assert grid.data.index.tolist() == ['s1', 's2', 's3']
+    assert grid.id_dis == {'s1': 'Site "1"', 's3': 'Three'}
+    assert grid.to_zinc() == text
+    sites = grid.filter('site')
+    assert sites.to_zinc().splitlines()[2:] == [
+        '@s1 "Site \\"1\\"",M', '@s2,M']
+
+
+def test_sparse_markers():
+    n = 1000
+    rare = pd.arrays.SparseArray(np.arange(n) % 100 == 0, fill_value=False)
+    df = pd.DataFrame(
+        {'rare': rare, 'area': pd.arrays.SparseArray(
+            np.where(np.arange(n) == 3, 10.0, np.nan))},
+        index=[f'p{i}' for i in range(n)])
+    grid = zincio.Grid.from_pandas(df, units={'area': 'ft²'})
+    lines = grid.to_zinc().splitlines()
+    assert lines[1] == 'id,rare,area unit:"ft²"'
+    assert lines[2:6] == ['@p0,M,', '@p1,,', '@p2,,', '@p3,,10.0ft²']
+    actual = zincio.parse('\n'.join(lines)).data
+    assert actual['rare'].sum() == 10
+
+
+def test_from_pandas_entity_frame():
+    df = pd.DataFrame({
+        'dis': ['A "1"', 'B\nb'],
+        'point': [True, False],
+        'siteRef': pd.Categorical([zincio.Ref('s1'), None]),
+        'curVal': [1.5, np.nan],
+    }, index=pd.Index(['a', 'b'], name='id'))
+    grid = zincio.Grid.from_pandas(df, units={'curVal': 'kW'})
+    assert grid.data is df
+    assert list(grid.column_info) == [
+        'id', 'dis', 'point', 'siteRef', 'curVal']
+    assert grid.to_zinc().splitlines()[2:] == [
+        '@a,"A \\"1\\"",M,@s1,1.5kW',
+        '@b,"B\\nb",,,',
+    ]
+
+
+TRICKY_STRS = ['C:\\path', 'ends\\', 'bs\\"q', 'tab\tcr\r', '$self', 'A "1"']
+
+
+def test_strs_round_trip_with_backslashes_and_quotes():
+    df = pd.DataFrame(
+        {'dis': TRICKY_STRS, 'navName': TRICKY_STRS[::-1]},
+        index=pd.Index([f'p{i}' for i in range(6)], name='id'))
+    df['navName'] = df['navName'].astype('category')
+    text = zincio.Grid.from_pandas(df).to_zinc()
+    assert text.splitlines()[2] == '@p0,"C:\\\\path","A \\"1\\""'
+    actual = zincio.parse(text).data
+    assert actual['dis'].tolist() == TRICKY_STRS
+    assert [str(v) for v in actual['navName']] == TRICKY_STRS[::-1]
+
+
+def test_metadata_and_ref_names_round_trip():
+    ref = zincio.Ref('s1', 'Site \\ "One"')
+    grid = zincio.Grid(
+        version=3,
+        grid_info={'dis': zincio.String('C:\\x "y"\n')},
+        column_info={'id': {}, 'siteRef': {'doc': zincio.String('a\\')}},
+        data=pd.DataFrame(
+            {'siteRef': [ref]}, index=pd.Index(['p1'], name='id')))
+    actual = zincio.parse(grid.to_zinc())
+    assert actual.grid_info['dis'] == zincio.String('C:\\x "y"\n')
+    assert actual.column_info['siteRef']['doc'] == zincio.String('a\\')
+    assert actual.data['siteRef'].tolist() == [ref]
+
+
+def test_from_pandas_entity_frame_without_ids():
+    df = pd.DataFrame({'dis': ['A', 'B'], 'site': [True, False]})
+    grid = zincio.Grid.from_pandas(df)
+    assert list(grid.column_info) == ['dis', 'site']
+    assert grid.to_zinc().splitlines()[1:] == ['dis,site', '"A",M', '"B",']
+
+
+def test_from_pandas_entity_frame_rejects_point_ids():
+    df = pd.DataFrame({'dis': ['A']}, index=['a'])
+    with pytest.raises(ValueError):
+        zincio.Grid.from_pandas(df, point_ids={'dis': 'p1'})
+
+
+def test_his_grid_strs_are_quoted():
+    expected = zincio.read(FULL_GRID_FILE)
+    text = expected.to_zinc()
+    assert ',"Occupied",' in text
+    actual = zincio.parse(text)
+    pd.testing.assert_frame_equal(actual.data, expected.data)
@@ -11,10 +11,27 @@ from .dtypes import (
     String,
     Uri,
 )
+from .align import concat
+from .append import append
+from .cache import GridCache
+from .client import Client, HaystackClientException
+from .column_stats import ColumnStats, merge_column_stats
+from .dataset import read_dataset
+from .follow import ZincFollower
+from .filter import compile_filter, FilterParseException
 from .grid import Grid
+from .hayson import read_json
+from .his_write import encode_his_write
+from .refs import RefIndex
+from .rollup import Rollup
+from .stats import ParseStats
+from .transcode import transcode
 from .zinc_parser import (
+    iter_grids,
     parse,
     read,
+    read_all,
+    read_chunked,
     ZincErrorGridException,
     ZincParseException,
 )
@@ -31,9 +48,29 @@ __all__ = [
     'Ref',
     'String',
     'Uri',
+    'append',
+    'Client',
+    'ColumnStats',
     'Grid',
+    'GridCache',
+    'concat',
+    'ParseStats',
+    'RefIndex',
+    'Rollup',
+    'compile_filter',
+    'encode_his_write',
+    'merge_column_stats',
+    'FilterParseException',
+    'HaystackClientException',
+    'iter_grids',
     'parse',
     'read',
+    'read_all',
+    'read_chunked',
+    'read_dataset',
+    'read_json',
+    'transcode',
+    'ZincFollower',
     'ZincParseException',
     'ZincErrorGridException',
 ]
@@ -0,0 +1,155 @@
+"""Time alignment of many history grids into one."""
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .dtypes import Scalar
+from .grid import Grid, ID_COLTAG
+from .refs import ref_uid
+
+
+def concat(
+        grids: Iterable[Grid],
+        how: str = 'outer',
+        tolerance: Optional[Union[str, pd.Timedelta]] = None) -> Grid:
+    """Aligns history grids on `ts` into a single wide Grid.
+
+    The `ts` indexes are merged once, and every column is scattered straight
+    into a preallocated array, so the cost is linear in the number of cells
+    however many grids there are; repeated `pd.concat` or `join` calls would
+    copy the growing frame for every grid.
+
+    Columns are matched across grids by the `id` of their point: the `id` in
+    their column_info or, for a single-column grid such as a `hisRead`
+    result, the `id` in its grid_info. Grids covering the same point, e.g.
+    consecutive exports, fill the same column. Where their time windows
+    overlap, the value from the later grid wins unless it is missing.
+
+    Args:
+        grids: History grids, i.e. with a `ts` index.
+        how: 'outer' keeps every timestamp, 'inner' only timestamps present
+            in every grid.
+        tolerance: If given, timestamps no further than this apart from the
+            previous one are taken to be the same, and aligned on the
+            earliest. This absorbs clock jitter between exports, and should
+            be well below the sampling interval.
+    Returns:
+        A Grid whose column_info carries over each column's tags from the
+        first grid it appears in, and whose `ts` index is in the time zone of
+        the first grid.
+    """
+    grids = list(grids)
+    if not grids:
+        raise ValueError("No grids to concatenate")
+    if how not in ('outer', 'inner'):
+        raise ValueError(f"how must be 'outer' or 'inner', not {how!r}")
+    for grid in grids:
+        if grid.data.index.name != 'ts':
+            raise ValueError("Only history grids with a ts index can be "
+                             "aligned")
+
+    stamps = [_utc_nanos(grid.data.index) for grid in grids]
+    # The inputs are sorted runs, which a stable sort (timsort) detects and
+    # merges in a single k-way pass
+    merged = np.sort(np.concatenate(stamps), kind='stable')
+    tol = 0 if tolerance is None else pd.Timedelta(tolerance).value
+    starts = np.ones(len(merged), dtype=bool)
+    starts[1:] = np.diff(merged) > tol
+    keys = merged[starts]
+    positions = [np.searchsorted(keys, s, side='right') - 1 for s in stamps]
+
+    if how == 'inner':
+        present = np.zeros(len(keys), dtype=np.int64)
+        for pos in positions:
+            seen = np.zeros(len(keys), dtype=bool)
+            seen[pos] = True
+            present += seen
+        keep = present == len(grids)
+        remap = np.cumsum(keep) - 1
+        positions = [
+            np.where(keep[pos], remap[pos], -1) for pos in positions]
+        keys = keys[keep]
+
+    n = len(keys)
+    columns: Dict[str, List[Tuple[pd.Series, np.ndarray]]] = {}
+    labels: Dict[str, Any] = {}
+    column_info: Dict[str, Dict[str, Any]] = {}
+    for grid, pos in zip(grids, positions):
+        for key, label, info, series in _columns(grid):
+            if key not in columns:
+                columns[key] = []
+                labels[key] = label
+                column_info[f'v{len(column_info)}'] = info
+            columns[key].append((series, pos))
+
+    data = {labels[k]: _scatter(parts, n) for k, parts in columns.items()}
+    tz = getattr(grids[0].data.index, 'tz', None)
+    index = pd.DatetimeIndex(keys, tz='UTC', name='ts')
+    if tz is not None:
+        index = index.tz_convert(tz)
+    ts_info = dict(grids[0].column_info.get('ts', {}))
+    return Grid(
+        version=grids[0].version,
+        grid_info=_common_tags([grid.grid_info for grid in grids]),
+        column_info={'ts': ts_info, **column_info},
+        data=pd.DataFrame(data, index=index))
+
+
+def _utc_nanos(index: pd.Index) -> np.ndarray:
+    if not isinstance(index, pd.DatetimeIndex) or index.tz is None:
+        index = pd.to_datetime(index, utc=True)
+    utc = index.tz_convert('UTC').tz_localize(None)
+    return utc.to_numpy(dtype='datetime64[ns]').view(np.int64)
+
+
+def _columns(grid: Grid):
+    """Yields the identity key, label, tags and values of each data column."""
+    infos = list(grid.column_info.values())[1:]
+    single = len(grid.data.columns) == 1
+    for info, col in zip(infos, grid.data.columns):
+        info = dict(info)
+        label = col
+        ref = info.get(ID_COLTAG)
+        if ref is None and single and ID_COLTAG in grid.grid_info:
+            ref = info[ID_COLTAG] = grid.grid_info[ID_COLTAG]
+            label = str(ref)
+        key = ref_uid(ref) if ref is not None else str(label)
+        yield key, label, info, grid.data[col]
+
+
+def _scatter(parts: List[Tuple[pd.Series, np.ndarray]], n: int) -> Any:
+    """Scatters each series into one preallocated array of length `n`."""
+    dtypes = [series.dtype for series, _ in parts]
+    if all(isinstance(d, pd.CategoricalDtype) for d in dtypes):
+        categories = pd.Index(list(dict.fromkeys(
+            c for d in dtypes for c in d.categories)))
+        codes = np.full(
+            n, -1, dtype=np.min_scalar_type(-len(categories) - 1))
+        for series, pos in parts:
+            cat = series.array
+            # Maps each source code to a code in the union; -1 stays -1
+            mapping = np.append(categories.get_indexer(cat.categories), -1)
+            src = mapping[cat.codes]
+            ok = (pos >= 0) & (src >= 0)
+            codes[pos[ok]] = src[ok]
+        return pd.Categorical.from_codes(codes, categories)
+    na: Any = None
+    dtype: Any = object
+    if all(pd.api.types.is_numeric_dtype(d) for d in dtypes):
+        na, dtype = np.nan, float
+    out = np.full(n, na, dtype=dtype)
+    for series, pos in parts:
+        values = series.to_numpy(dtype=dtype, na_value=na)
+        ok = (pos >= 0) & series.notna().to_numpy()
+        # Later parts overwrite earlier ones where both have a value
+        out[pos[ok]] = values[ok]
+    return out
+
+
+def _common_tags(metas: List[Dict[str, Scalar]]) -> Dict[str, Scalar]:
+    first, rest = metas[0], metas[1:]
+    return {
+        k: v for k, v in first.items()
+        if all(k in m and m[k] == v for m in rest)}
@@ -0,0 +1,183 @@
+"""Appending rows to an existing Zinc history file, in place."""
+
+import io
+import os
+
+from os import PathLike
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+from .dtypes import Datetime, Number, String
+from .grid import (
+    GridBuilder,
+    ID_COLTAG,
+    TS_COLTAG,
+    TZ_COLTAG,
+    UNIT_COLTAG,
+)
+from .refs import ref_uid
+from .zinc_parser import ZincParser
+from .zinc_tokenizer import ZincTokenizer
+from .zinc_writer import write_rows
+
+# Bytes read at a time when looking for the last row from the end
+_TAIL_BLOCK = 64 * 1024
+
+
+def append(
+        path: Union[str, PathLike],
+        data: Union[pd.DataFrame, pd.Series]) -> int:
+    """Appends rows to a Zinc history file without rewriting it.
+
+    Only the two header lines and the last row of the file are read: the
+    header to match the incoming columns against the file's, and the last
+    row to check that time keeps moving forward. The new rows are formatted
+    with the file's own units and time zone and written at the end, so the
+    cost is that of the new rows, whatever the size of the file. The grid
+    meta, e.g. `hisEnd`, is left as it is.
+
+    Args:
+        path: Path of a Zinc history grid file.
+        data: Rows to append, with a DatetimeIndex; a naive index is taken
+            to be UTC. Each column is matched to a column of the file by
+            name, e.g. `v0` or `val`, or by the Ref or id of its point, e.g.
+            `@p1` as `zincio.read` names them. Columns of the file that
+            `data` lacks are left empty.
+    Returns:
+        The number of rows appended.
+    Raises:
+        ValueError: if the file is not a history grid, a column of `data`
+            is not in the file, or `data` does not start after the last row
+            of the file or is not in time order.
+    """
+    if isinstance(data, pd.Series):
+        data = data.to_frame()
+    if not isinstance(data.index, pd.DatetimeIndex):
+        raise ValueError("Only frames with a DatetimeIndex can be appended")
+    if not data.index.is_monotonic_increasing:
+        raise ValueError("Rows to append must be in time order")
+
+    with open(path, 'r+b') as f:
+        header, header_end = _read_header(f)
+        if TS_COLTAG not in header.col_meta:
+            raise ValueError(f"{path} is not a history grid")
+        frame = _align_columns(data, header)
+        end, last = _last_row(f, header_end)
+        column_info = {k: dict(v) for k, v in header.col_meta.items()}
+        if last is not None:
+            last_ts = _follow_row(column_info, last)
+        if last is not None and len(data):
+            first = data.index[0]
+            if first.tz is None:
+                first = first.tz_localize('UTC')
+            if first <= last_ts:
+                raise ValueError(
+                    f"Rows to append start at {first}, not after the last "
+                    f"row of {path} at {last_ts}")
+        # Formatted in full first, so a failure leaves the file as it was
+        text = io.StringIO()
+        if last is not None:
+            text.write('\n')
+        write_rows(text, frame, column_info)
+        # Drop any blank lines ending the grid, which would end it early
+        f.seek(end)
+        f.truncate()
+        f.write(text.getvalue().encode('utf-8'))
+    return len(data)
+
+
+def _read_header(f: Any) -> Tuple[GridBuilder, int]:
+    """Parses the two header lines, returning them and their length."""
+    lines = [f.readline(), f.readline()]
+    if not lines[1].endswith(b'\n'):
+        raise ValueError("The file has no complete header")
+    header_text = b''.join(lines)
+    parser = ZincParser(ZincTokenizer(io.StringIO(
+        header_text.decode('utf-8'))))
+    return parser.parse_header(), len(header_text)
+
+
+def _align_columns(data: pd.DataFrame, header: GridBuilder) -> pd.DataFrame:
+    """Returns `data` with one column per data column of the file, in order.
+    """
+    names = [name for name in header.col_meta if name != TS_COLTAG]
+    keys: Dict[Any, int] = {}
+    for i, name in enumerate(names):
+        keys[name] = i
+        ref = header.col_meta[name].get(ID_COLTAG)
+        if ref is None and len(names) == 1:
+            # hisRead results give the point's id in the grid meta
+            ref = header.grid_meta.get(ID_COLTAG)
+        if ref is not None:
+            keys['@' + _uid(ref)] = i
+    positions: List[Optional[int]] = [None] * len(names)
+    for j, col in enumerate(data.columns):
+        found = keys.get(col)
+        if found is None and ref_uid(col) is not None:
+            found = keys.get('@' + _uid(col))
+        if found is None:
+            raise ValueError(f"No column {col!r} in the file")
+        if positions[found] is not None:
+            raise ValueError(f"More than one column for {names[found]!r}")
+        positions[found] = j
+    columns = {
+        i: (data.iloc[:, j] if j is not None
+            else pd.Series(np.nan, index=data.index))
+        for i, j in enumerate(positions)}
+    return pd.DataFrame(columns, index=data.index, copy=False)
+
+
+def _follow_row(
+        column_info: Dict[str, Dict[str, Any]], line: str) -> pd.Timestamp:
+    """Takes the time zone and units of the last row where the header has
+    none, so that appended rows are written alike.
+
+    Returns:
+        The timestamp of the row.
+    """
+    cells = ZincParser(ZincTokenizer(io.StringIO(line))).parse_row()
+    ts = None
+    for (name, info), cell in zip(column_info.items(), cells):
+        if name == TS_COLTAG and isinstance(cell, Datetime):
+            ts = cell.value
+            if TZ_COLTAG not in info and cell.tz:
+                info[TZ_COLTAG] = String(cell.tz)
+        elif isinstance(cell, Number) and cell.units:
+            info.setdefault(UNIT_COLTAG, String(cell.units))
+    if ts is None:
+        raise ValueError(f"The last row has no ts: {line!r}")
+    return ts
+
+
+def _uid(ref: Any) -> str:
+    # '@p1 "Dis"' as zincio.read names columns, or a Ref, to p1
+    return str(ref_uid(ref)).lstrip('@').split(' ', 1)[0]
+
+
+def _last_row(f: Any, header_end: int) -> Tuple[int, Optional[str]]:
+    """Finds the last non-blank line after the header, from the end.
+
+    Returns:
+        The offset just past it, before its newline, and the line; or the
+        end of the header and None if the file has no rows.
+    """
+    size = f.seek(0, os.SEEK_END)
+    pos = size
+    tail = b''
+    while pos > header_end:
+        step = min(_TAIL_BLOCK, pos - header_end)
+        pos -= step
+        f.seek(pos)
+        tail = f.read(step) + tail
+        stripped = tail.rstrip(b'\r\n \t')
+        start = stripped.rfind(b'\n')
+        if start >= 0 or pos == header_end:
+            if not stripped:
+                if pos == header_end:
+                    break
+                continue
+            line = stripped[start + 1:]
+            return pos + len(stripped), line.decode('utf-8')
+    return header_end, None
@@ -0,0 +1,145 @@
+"""In-process cache of parsed Grids."""
+
+import os
+import threading
+import pandas as pd  # type: ignore
+
+from collections import OrderedDict
+from os import PathLike
+from typing import Callable, NamedTuple, Tuple, Union
+
+from .grid import Grid
+
+# (size, mtime in ns, inode, device)
+FileIdentity = Tuple[int, int, int, int]
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    entries: int
+    nbytes: int
+    max_bytes: int
+
+
+def _file_identity(path: str) -> FileIdentity:
+    st = os.stat(path)
+    return (st.st_size, st.st_mtime_ns, st.st_ino, st.st_dev)
+
+
+def _copy_on_write_enabled() -> bool:
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    return getattr(pd.options.mode, 'copy_on_write', False) is True
+
+
+def _frame_nbytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+def _private_copy(grid: Grid) -> Grid:
+    # Under pandas' copy-on-write mode a shallow copy is already isolated from
+    # the cached frame; otherwise the array data has to be copied. The Scalars
+    # in the metadata are shared, and are treated as immutable throughout.
+    data = grid.data.copy(deep=not _copy_on_write_enabled())
+    copy = Grid(
+        version=grid.version,
+        grid_info=dict(grid.grid_info),
+        column_info={k: dict(v) for k, v in grid.column_info.items()},
+        data=data,
+        id_dis=dict(grid.id_dis))
+    if grid.column_stats is not None:
+        copy.column_stats = dict(grid.column_stats)
+    return copy
+
+
+class GridCache:
+    """A least-recently-used cache of Grids parsed from files.
+
+    Entries are keyed by resolved path, and are only served while the file's
+    size, modification time, inode and device are unchanged. The cache is
+    bounded by the estimated memory of the cached DataFrames; least recently
+    used entries are evicted to make room, and grids too large to fit at all
+    are never cached.
+
+    Every lookup hands out a private copy of the cached Grid, so callers may
+    freely modify what they get back without corrupting the shared entry.
+    Under pandas' copy-on-write mode, these copies are nearly free.
+
+    It is safe to share a GridCache between threads. Concurrent misses on the
+    same file may each parse it; the last one to finish wins.
+
+    Usage:
+        cache = GridCache(max_bytes=64 * 1024 * 1024)
+        grid = zincio.read(path, cache=cache)
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[str, Tuple[FileIdentity, Grid, int]]' = (
+            OrderedDict())
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+            self,
+            path: Union[str, bytes, PathLike],
+            loader: Callable[[str], Grid]) -> Grid:
+        """Returns a copy of the cached Grid for `path`, loading on a miss.
+
+        Args:
+            path: Path of the Zinc file.
+            loader: Called with the resolved path to parse the file on a miss.
+        """
+        key = os.path.realpath(os.fsdecode(path))
+        identity = _file_identity(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == identity:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return _private_copy(entry[1])
+            self._misses += 1
+        grid = loader(key)
+        nbytes = _frame_nbytes(grid.data)
+        with self._lock:
+            self._discard(key)
+            if nbytes <= self.max_bytes:
+                self._entries[key] = (identity, grid, nbytes)
+                self._nbytes += nbytes
+                while self._nbytes > self.max_bytes:
+                    self._discard(next(iter(self._entries)))
+        return _private_copy(grid)
+
+    def invalidate(self, path: Union[str, bytes, PathLike]) -> None:
+        """Drops any entry for `path`."""
+        with self._lock:
+            self._discard(os.path.realpath(os.fsdecode(path)))
+
+    def clear(self) -> None:
+        """Drops all entries and resets the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = self._hits = self._misses = 0
+
+    def cache_info(self) -> CacheInfo:
+        """Returns hit, miss, entry and size statistics."""
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, len(self._entries),
+                             self._nbytes, self.max_bytes)
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._nbytes -= entry[2]
+
+
+# Process-wide cache used by `zincio.read(..., cache=True)`.
+DEFAULT_CACHE = GridCache()
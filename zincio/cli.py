@@ -0,0 +1,141 @@
+"""Command line interface, e.g. `zincio convert --to csv *.zinc out/`."""
+
+import argparse
+import io
+import os
+import sys
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .transcode import FORMATS, transcode
+
+STDIO = '-'
+
+# rows, bytes read, seconds
+Result = Tuple[int, int, float]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='zincio')
+    commands = parser.add_subparsers(dest='command', required=True)
+    convert = commands.add_parser(
+        'convert',
+        help="convert Zinc files to another format",
+        description="Converts each SRC to DST/<name>.<format>, one worker "
+                    "process per file. A SRC that fails is reported and the "
+                    "others are still converted. Use - for SRC and DST to "
+                    "convert stdin to stdout.")
+    convert.add_argument('--to', choices=FORMATS, default='csv',
+                         help="output format (default: %(default)s)")
+    convert.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                         help="number of files to convert at once "
+                              "(default: %(default)s)")
+    convert.add_argument('--chunksize', type=int, default=10_000,
+                         help="rows per batch (default: %(default)s)")
+    convert.add_argument('src', nargs='+', metavar='SRC')
+    convert.add_argument('dst', metavar='DST')
+    args = parser.parse_args(argv)
+
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if STDIO in args.src and (len(args.src) > 1 or args.dst != STDIO):
+        parser.error("- for SRC converts stdin to stdout, so DST must be -")
+    if args.dst == STDIO and len(args.src) > 1:
+        parser.error("only one SRC can be written to stdout")
+
+    if args.dst == STDIO:
+        try:
+            result = _convert_one(
+                args.src[0], STDIO, args.to, args.chunksize)
+        except BrokenPipeError:
+            # The reader went away, e.g. `| head`; stop quietly
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return 1
+        # stdout carries the data
+        _report(sys.stderr, args.src[0], result)
+        return 0
+
+    dst = Path(args.dst)
+    jobs = [
+        (src, str(dst / f'{Path(src).stem}.{args.to}'))
+        for src in args.src]
+    sources: Dict[str, List[str]] = {}
+    for src, out in jobs:
+        sources.setdefault(out, []).append(src)
+    clashes = [srcs for srcs in sources.values() if len(srcs) > 1]
+    if clashes:
+        parser.error("SRCs would be written to the same file: " + "; ".join(
+            ", ".join(srcs) for srcs in clashes))
+    dst.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    results: List[Result] = []
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [
+            pool.submit(_convert_one, src, out, args.to, args.chunksize)
+            for src, out in jobs]
+        for (src, out), future in zip(jobs, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                failed += 1
+                print(f"{src}: failed: {e}", file=sys.stderr)
+                # Don't leave a partial file that looks converted
+                try:
+                    os.remove(out)
+                except FileNotFoundError:
+                    pass
+                continue
+            _report(sys.stdout, src, results[-1])
+    if len(results) > 1:
+        _report(sys.stdout, 'total', (
+            sum(r[0] for r in results),
+            sum(r[1] for r in results),
+            time.perf_counter() - start))
+    return 1 if failed else 0
+
+
+def _convert_one(src: str, dst: str, fmt: str, chunksize: int) -> Result:
+    """Converts one file, in a worker process."""
+    start = time.perf_counter()
+    source: Any = src
+    if src == STDIO:
+        counter = _Counting(sys.stdin.buffer)
+        source = io.TextIOWrapper(
+            io.BufferedReader(counter), encoding='utf-8')
+    target: Any = dst
+    if dst == STDIO:
+        target = sys.stdout if fmt == 'csv' else sys.stdout.buffer
+    rows = transcode(source, target, format=fmt, chunksize=chunksize)
+    if dst == STDIO:
+        target.flush()
+    size = counter.size if src == STDIO else os.path.getsize(src)
+    return rows, size, time.perf_counter() - start
+
+
+class _Counting(io.RawIOBase):
+    """Wraps a binary stream to count the bytes read through it."""
+
+    def __init__(self, raw: Any):
+        self._raw = raw
+        self.size = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b: Any) -> int:
+        data = self._raw.read1(len(b))
+        b[:len(data)] = data
+        self.size += len(data)
+        return len(data)
+
+
+def _report(out: Any, name: str, result: Result) -> None:
+    rows, size, seconds = result
+    seconds = max(seconds, 1e-9)
+    print(f"{name}: {rows} rows in {seconds:.2f}s "
+          f"({rows / seconds:,.0f} rows/s, "
+          f"{size / seconds / 1e6:,.1f} MB/s)", file=out)
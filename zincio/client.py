@@ -0,0 +1,331 @@
+"""An asyncio client for Haystack servers, over pooled HTTP connections.
+
+Only the standard library is used: connections are asyncio streams speaking
+HTTP/1.1 with keep-alive. Responses are parsed as their bytes arrive, by a
+parser running in a worker thread, so parsing overlaps with the transfer
+instead of waiting for it.
+
+    async with zincio.Client('http://host/api', max_connections=8) as c:
+        points = await c.read('point and his')
+        grids = await c.his_read_many(points.data.index, 'yesterday')
+    wide = zincio.concat(grids)
+"""
+
+import asyncio
+import codecs
+import io
+import queue
+import ssl
+
+from typing import (
+    Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple)
+from urllib.parse import urlencode, urlsplit
+
+from .dtypes import Ref
+from .grid import Grid
+from .hayson import read_json
+from .zinc_parser import read
+
+# Bytes read from a connection at a time
+_READ_SIZE = 64 * 1024
+
+_Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class HaystackClientException(Exception):
+    """Raised when a Haystack server responds with an HTTP error."""
+
+    def __init__(self, status: int, reason: str, body: str = ''):
+        message = f"HTTP {status} {reason}"
+        if body:
+            message += f": {body[:200]}"
+        super().__init__(message)
+        self.status = status
+        self.reason = reason
+        self.body = body
+
+
+class Client:
+    """A Haystack client that runs many requests concurrently.
+
+    Up to `max_connections` requests are in flight at once, each on its own
+    connection. Connections are kept alive and reused by later requests, so
+    reading thousands of points costs `max_connections` connection setups
+    rather than thousands.
+
+    Use it as an async context manager, or call `close` when done.
+
+    Args:
+        url: Base URL of the Haystack API, e.g. `https://host/api/demo`.
+            Ops are requested as `<url>/<op>`.
+        max_connections: Maximum number of concurrent requests, and of open
+            connections.
+        headers: Extra request headers, e.g. an `Authorization` bearer
+            token.
+        timeout: Seconds allowed for each request, or None for no limit.
+        ssl_context: SSLContext for https URLs. Defaults to the system's
+            trusted certificates.
+    """
+
+    def __init__(
+            self,
+            url: str,
+            *,
+            max_connections: int = 8,
+            headers: Optional[Dict[str, str]] = None,
+            timeout: Optional[float] = 60.0,
+            ssl_context: Optional[ssl.SSLContext] = None):
+        if max_connections < 1:
+            raise ValueError("max_connections must be at least 1")
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f"Unsupported URL scheme {parts.scheme!r}")
+        self.url = url
+        self.timeout = timeout
+        self._host = parts.hostname or 'localhost'
+        self._port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self._ssl: Any = None
+        if parts.scheme == 'https':
+            self._ssl = ssl_context or ssl.create_default_context()
+        self._path = parts.path.rstrip('/')
+        self._headers = {
+            'Host': parts.netloc,
+            'Accept': 'text/zinc',
+            'Connection': 'keep-alive',
+            **(headers or {}),
+        }
+        self.max_connections = max_connections
+        # Made on first use, in the event loop of the caller
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._idle: List[_Connection] = []
+
+    async def __aenter__(self) -> 'Client':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Closes all idle connections."""
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            writer.close()
+        for _, writer in idle:
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+    async def call(self, op: str, **params: Any) -> Grid:
+        """Calls a Haystack op with GET, and returns the response grid.
+
+        Args:
+            op: Name of the op, e.g. `about` or `read`.
+            params: Query parameters. Refs are written as `@id`.
+        Raises:
+            HaystackClientException: if the server responds with an error.
+            ZincErrorGridException: if the server responds with an error
+                grid.
+        """
+        query = urlencode({
+            k: f'@{v.uid}' if isinstance(v, Ref) else str(v)
+            for k, v in params.items()})
+        target = f'{self._path}/{op}' + (f'?{query}' if query else '')
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_connections)
+        async with self._slots:
+            return await asyncio.wait_for(self._get(target), self.timeout)
+
+    async def read(self, filter: str, limit: Optional[int] = None) -> Grid:
+        """Reads the entities matching a Haystack filter."""
+        if limit is None:
+            return await self.call('read', filter=filter)
+        return await self.call('read', filter=filter, limit=limit)
+
+    async def his_read(self, point: Any, range: str) -> Grid:
+        """Reads the history of one point.
+
+        Args:
+            point: Ref or id of the point.
+            range: A Haystack range, e.g. `yesterday` or
+                `2020-05-01,2020-06-01`.
+        """
+        if not isinstance(point, Ref):
+            point = Ref(str(point).lstrip('@'))
+        return await self.call('hisRead', id=point, range=range)
+
+    async def his_read_many(
+            self, points: Iterable[Any], range: str) -> List[Grid]:
+        """Reads the histories of many points concurrently.
+
+        At most `max_connections` reads are in flight at once. The grids are
+        returned in the order of `points`, ready for `zincio.concat`.
+        """
+        return list(await asyncio.gather(
+            *(self.his_read(point, range) for point in points)))
+
+    async def _get(self, target: str) -> Grid:
+        head = ''.join(
+            [f'GET {target} HTTP/1.1\r\n']
+            + [f'{k}: {v}\r\n' for k, v in self._headers.items()]
+            + ['\r\n']).encode('latin-1')
+        while True:
+            conn, reused = await self._connect()
+            try:
+                grid, keep_alive = await self._exchange(conn, head)
+            except _StaleConnection:
+                conn[1].close()
+                if reused:
+                    # The server closed it while idle; try a new one
+                    continue
+                raise ConnectionError("Connection closed by server")
+            except BaseException:
+                conn[1].close()
+                raise
+            if keep_alive:
+                self._idle.append(conn)
+            else:
+                conn[1].close()
+            return grid
+
+    async def _connect(self) -> Tuple[_Connection, bool]:
+        while self._idle:
+            conn = self._idle.pop()
+            if not conn[0].at_eof():
+                return conn, True
+            conn[1].close()
+        conn = await asyncio.open_connection(
+            self._host, self._port, ssl=self._ssl)
+        return conn, False
+
+    async def _exchange(
+            self,
+            conn: _Connection,
+            head: bytes) -> Tuple[Grid, bool]:
+        reader, writer = conn
+        writer.write(head)
+        await writer.drain()
+        status_line = await reader.readline()
+        if not status_line:
+            raise _StaleConnection()
+        version, status, reason = _parse_status(status_line)
+        headers = await _read_headers(reader)
+        keep_alive = (
+            version == 'HTTP/1.1'
+            and headers.get('connection', '').lower() != 'close'
+            and ('content-length' in headers
+                 or headers.get('transfer-encoding', '').lower() == 'chunked'))
+        chunks = _body(reader, headers)
+        if status != 200:
+            body = b''.join([chunk async for chunk in chunks])
+            raise HaystackClientException(
+                status, reason, body.decode('utf-8', 'replace'))
+
+        stream = _BodyStream()
+        is_json = 'json' in headers.get('content-type', '')
+        loop = asyncio.get_running_loop()
+        parsing = loop.run_in_executor(
+            None, read_json if is_json else read, stream)
+        try:
+            async for chunk in chunks:
+                stream.feed(chunk)
+        except BaseException:
+            stream.end()
+            # The parser stops for want of input; its error is moot
+            parsing.add_done_callback(lambda f: f.exception())
+            raise
+        stream.end()
+        return await parsing, keep_alive
+
+
+class _StaleConnection(Exception):
+    """The connection was closed before any response arrived."""
+
+
+class _BodyStream(io.TextIOBase):
+    """The text of a response body, read by a parser as it arrives.
+
+    The event loop `feed`s bytes in as they are received; the parser, in a
+    worker thread, blocks in `read` until there is text for it.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: 'queue.Queue[Optional[str]]' = queue.Queue()
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._cur = io.StringIO()
+        self._eof = False
+
+    def feed(self, data: bytes) -> None:
+        text = self._decoder.decode(data)
+        if text:
+            self._chunks.put(text)
+
+    def end(self) -> None:
+        text = self._decoder.decode(b'', final=True)
+        if text:
+            self._chunks.put(text)
+        self._chunks.put(None)
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: Optional[int] = -1) -> str:
+        if size is None:
+            size = -1
+        out = self._cur.read(size)
+        while (size < 0 or len(out) < size) and not self._eof:
+            text = self._chunks.get()
+            if text is None:
+                self._eof = True
+                break
+            self._cur = io.StringIO(text)
+            out += self._cur.read(size - len(out) if size >= 0 else -1)
+        return out
+
+
+def _parse_status(line: bytes) -> Tuple[str, int, str]:
+    parts = line.decode('latin-1').rstrip('\r\n').split(' ', 2)
+    if len(parts) < 2 or not parts[0].startswith('HTTP/'):
+        raise ConnectionError(f"Invalid HTTP status line {line!r}")
+    return parts[0], int(parts[1]), parts[2] if len(parts) > 2 else ''
+
+
+async def _read_headers(reader: asyncio.StreamReader) -> Dict[str, str]:
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            return headers
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+
+async def _body(
+        reader: asyncio.StreamReader,
+        headers: Dict[str, str]) -> AsyncIterator[bytes]:
+    """Yields the body of a response as it arrives."""
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            if size == 0:
+                # Skip any trailers
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                return
+            yield await reader.readexactly(size)
+            await reader.readexactly(2)
+    elif 'content-length' in headers:
+        remaining = int(headers['content-length'])
+        while remaining:
+            chunk = await reader.read(min(remaining, _READ_SIZE))
+            if not chunk:
+                raise ConnectionError("Connection closed mid-response")
+            remaining -= len(chunk)
+            yield chunk
+    else:
+        # Delimited by the server closing the connection
+        while True:
+            chunk = await reader.read(_READ_SIZE)
+            if not chunk:
+                return
+            yield chunk
@@ -0,0 +1,227 @@
+"""Datasets of history kept as one Zinc file per time period.
+
+    grid.to_zinc_partitioned('site1/', freq='D')
+    week = zincio.read_dataset('site1/', '2021-03-01', '2021-03-08')
+
+Each file carries the `hisStart` and `hisEnd` of its period in its grid meta,
+so a reader can tell which files overlap a time range from their headers
+alone, and parse only those.
+"""
+
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+from os import PathLike
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+from .align import concat
+from .dtypes import Datetime
+from .grid import Grid, ID_COLTAG, TS_COLTAG, TZ_COLTAG
+from .refs import ref_uid
+from .tz import haystack_tz, iana_zone
+from .zinc_parser import read
+
+HIS_START = 'hisStart'
+HIS_END = 'hisEnd'
+
+# Extension of the partition files
+_SUFFIX = '.zinc'
+
+TimeLike = Union[str, pd.Timestamp]
+
+
+def write_partitioned(
+        grid: Grid,
+        directory: Union[str, PathLike],
+        freq: str = 'D') -> List[Path]:
+    """Writes a history grid as one Zinc file per period.
+
+    See `Grid.to_zinc_partitioned`.
+    """
+    index = grid.data.index
+    if not isinstance(index, pd.DatetimeIndex):
+        raise ValueError("Only history grids can be partitioned by time")
+    tz, zone = _grid_zone(grid)
+    local = index.tz_localize('UTC') if index.tz is None else index
+    local = local.tz_convert(zone)
+    periods = local.tz_localize(None).to_period(freq)
+    codes, uniques = pd.factorize(periods, sort=True)
+    # Rows of each period, in their original order
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+
+    out = Path(directory)
+    out.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for k, period in enumerate(uniques):
+        rows = order[bounds[k]:bounds[k + 1]]
+        grid_info = dict(grid.grid_info)
+        grid_info[HIS_START] = _datetime(period.start_time, zone, tz)
+        grid_info[HIS_END] = _datetime((period + 1).start_time, zone, tz)
+        part = Grid(
+            version=grid.version,
+            grid_info=grid_info,
+            column_info=grid.column_info,
+            data=grid.data.iloc[rows])
+        path = out / (_period_name(period) + _SUFFIX)
+        part.to_zinc(path)
+        paths.append(path)
+    return paths
+
+
+def read_dataset(
+        directory: Union[str, PathLike],
+        start: Optional[TimeLike] = None,
+        end: Optional[TimeLike] = None,
+        usecols: Optional[Sequence[Any]] = None,
+        workers: Optional[int] = None) -> Grid:
+    """Reads the rows of a partitioned dataset that fall in a time range.
+
+    Only the header of each file is parsed to find the files whose
+    `hisStart`/`hisEnd` overlap the range; files without them are always
+    read. The remaining files are parsed in parallel, one worker process
+    each, and their rows concatenated with `zincio.concat`.
+
+    Args:
+        directory: Directory of `.zinc` files, as written by
+            `Grid.to_zinc_partitioned`.
+        start: Earliest time to read, inclusive. A naive time is taken to be
+            UTC. Defaults to the start of the dataset.
+        end: Time to read up to, exclusive. Defaults to the end of the
+            dataset.
+        usecols: Data columns to read, by name or by the Ref or id of their
+            point. Defaults to all of them.
+        workers: Number of worker processes. Defaults to the number of CPUs;
+            1 reads every file in this process.
+    Returns:
+        A history Grid with the rows of every matching file in `ts` order,
+        whose `hisStart` and `hisEnd` span the files read, within the range.
+    Raises:
+        ValueError: if no file overlaps the range.
+    """
+    lo, hi = _utc(start), _utc(end)
+    if lo is not None and hi is not None and hi <= lo:
+        raise ValueError("end must be after start")
+    paths = sorted(Path(directory).glob('*' + _SUFFIX))
+    spans = []
+    for path in paths:
+        span = _his_span(path)
+        if span is not None:
+            if lo is not None and span[1] is not None and span[1] <= lo:
+                continue
+            if hi is not None and span[0] is not None and span[0] >= hi:
+                continue
+        spans.append((path, span))
+    if not spans:
+        raise ValueError(f"No files in {directory} overlap {start}-{end}")
+
+    jobs = [(str(path), lo, hi, usecols) for path, _ in spans]
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers == 1:
+        grids = [_read_partition(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            grids = list(pool.map(_read_partition, *zip(*jobs)))
+
+    grid = concat(grids)
+    _set_span(grid, [span for _, span in spans], lo, hi)
+    return grid
+
+
+def _read_partition(
+        path: str,
+        lo: Optional[pd.Timestamp],
+        hi: Optional[pd.Timestamp],
+        usecols: Optional[Sequence[Any]]) -> Grid:
+    """Reads one file, keeping only the rows and columns asked for."""
+    grid = read(path)
+    df = grid.data
+    rows = np.ones(len(df), dtype=bool)
+    if lo is not None:
+        rows &= df.index >= lo
+    if hi is not None:
+        rows &= df.index < hi
+    infos = list(grid.column_info.items())
+    cols = list(range(df.shape[1]))
+    if usecols is not None:
+        wanted = set(usecols)
+        uids = {str(ref_uid(c)).lstrip('@') for c in usecols}
+        cols = [
+            i for i in cols
+            if df.columns[i] in wanted
+            or ref_uid(infos[i + 1][1].get(ID_COLTAG)) in uids]
+    grid.column_info = dict([infos[0]] + [infos[i + 1] for i in cols])
+    if rows.all() and usecols is None:
+        return grid
+    grid.data = df.iloc[np.flatnonzero(rows), cols]
+    return grid
+
+
+def _his_span(
+        path: Path) -> Optional[Tuple[Optional[pd.Timestamp],
+                                      Optional[pd.Timestamp]]]:
+    """Reads the hisStart and hisEnd of a file from its header alone."""
+    grid_info = read(path, lazy=True).grid_info
+    start, end = grid_info.get(HIS_START), grid_info.get(HIS_END)
+    if not isinstance(start, Datetime) and not isinstance(end, Datetime):
+        return None
+    return (
+        _utc(start.value) if isinstance(start, Datetime) else None,
+        _utc(end.value) if isinstance(end, Datetime) else None)
+
+
+def _set_span(
+        grid: Grid,
+        spans: List[Any],
+        lo: Optional[pd.Timestamp],
+        hi: Optional[pd.Timestamp]) -> None:
+    """Sets hisStart and hisEnd to the extent of the files read."""
+    if any(span is None or None in span for span in spans):
+        return
+    start = min(span[0] for span in spans)
+    end = max(span[1] for span in spans)
+    if lo is not None:
+        start = max(start, lo)
+    if hi is not None:
+        end = min(end, hi)
+    tz, zone = _grid_zone(grid)
+    grid.grid_info[HIS_START] = Datetime(start.tz_convert(zone), tz)
+    grid.grid_info[HIS_END] = Datetime(end.tz_convert(zone), tz)
+
+
+def _grid_zone(grid: Grid) -> Tuple[str, str]:
+    """Returns the Haystack and IANA names of a history grid's time zone."""
+    ts_info: Dict[str, Any] = grid.column_info.get(TS_COLTAG, {})
+    tz = str(ts_info[TZ_COLTAG]) if TZ_COLTAG in ts_info else None
+    if tz is None:
+        index_tz = grid.data.index.tz
+        tz = haystack_tz(index_tz) if index_tz is not None else None
+    tz = tz or 'UTC'
+    return tz, iana_zone(tz) or 'UTC'
+
+
+def _datetime(wall: pd.Timestamp, zone: str, tz: str) -> Datetime:
+    # Periods start at midnight, which DST can skip or repeat
+    ts = wall.tz_localize(
+        zone, ambiguous=True, nonexistent='shift_forward')
+    return Datetime(ts, tz)
+
+
+def _period_name(period: pd.Period) -> str:
+    # e.g. 2021-03-14, or 2021-03-14T0100 for hourly periods. Weeks print
+    # as 2021-03-08/2021-03-14 and are named by their first day.
+    name = str(period).split('/', 1)[0]
+    return name.replace(' ', 'T').replace(':', '')
+
+
+def _utc(t: Any) -> Optional[pd.Timestamp]:
+    if t is None:
+        return None
+    ts = pd.Timestamp(t)
+    if ts.tz is None:
+        return ts.tz_localize('UTC')
+    return ts.tz_convert('UTC')
@@ -145,7 +145,11 @@ class Ref(Scalar):
         self.uid = uid
         self.display_name = None
         if display_name:
-            self.display_name = display_name.strip('"')
+            if (len(display_name) > 1 and display_name[0] == '"'
+                    and display_name[-1] == '"'):
+                # Quoted, as in Zinc; the name itself may hold quotes
+                display_name = display_name[1:-1]
+            self.display_name = display_name
 
     def __eq__(self, other):
         if not isinstance(other, type(self)):
@@ -155,13 +159,16 @@ class Ref(Scalar):
         return (
             self.uid == other.uid and self.display_name == other.display_name)
 
+    def __hash__(self):
+        return hash(self.uid)
+
     def __repr__(self):
         return f"{type(self).__name__}({self.uid}, \"{self.display_name}\")"
 
     def __str__(self):
         s = '@' + self.uid
         if self.display_name is not None:
-            s += f' "{self.display_name}"'
+            s += ' ' + quote(self.display_name)
         return s
 
 
@@ -179,3 +186,20 @@ class XStr(Scalar):
 
 class Id(Scalar):
     pass
+
+
+# Characters escaped in Zinc Str literals
+_STR_ESCAPES = str.maketrans({
+    '\\': '\\\\', '"': '\\"', '$': '\\$', '\n': '\\n', '\r': '\\r',
+    '\t': '\\t', '\b': '\\b', '\f': '\\f',
+})
+
+
+def escape(s: str) -> str:
+    """Escapes a str for the inside of a Zinc Str literal."""
+    return s.translate(_STR_ESCAPES)
+
+
+def quote(s: str) -> str:
+    """Formats a str as a Zinc Str literal, quoted and escaped."""
+    return '"' + s.translate(_STR_ESCAPES) + '"'
@@ -0,0 +1,450 @@
+"""Haystack filters, compiled to vectorized boolean masks.
+
+A filter such as `point and his and siteRef==@s1 and curVal > 70°F` is
+parsed once into a plan (see `compile_filter`), which is then evaluated over
+all rows of a DataFrame at once with numpy/pandas operations. Categorical
+columns are compared once per category rather than once per row, and object
+columns of strs, bools, Refs or Numbers are unwrapped into a single array.
+
+FMI: https://project-haystack.org/doc/Filters
+"""
+
+import functools
+import operator
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from . import tokens
+from .dtypes import (
+    BOOL_FALSE,
+    BOOL_TRUE,
+    Boolean,
+    Datetime,
+    Number,
+    Ref,
+    Scalar,
+    String,
+    Uri,
+)
+from .refs import RefIndex, ref_uid
+from .tokens import NumberToken, Token, TokenType
+from .zinc_tokenizer import tokenize
+
+
+ColumnInfo = Dict[str, Dict[str, Any]]
+
+_OPS: Dict[TokenType, Callable[[Any, Any], Any]] = {
+    TokenType.EQUALS: operator.eq,
+    TokenType.NOTEQUALS: operator.ne,
+    TokenType.LT: operator.lt,
+    TokenType.LTEQ: operator.le,
+    TokenType.GT: operator.gt,
+    TokenType.GTEQ: operator.ge,
+}
+
+
+_UID = operator.attrgetter('uid')
+_UNITS = operator.attrgetter('units')
+_VALUE = operator.attrgetter('value')
+
+
+class FilterParseException(Exception):
+    pass
+
+
+class _Column:
+    """A column resolved for evaluation, possibly through ref dereferences.
+
+    Attributes:
+        series: The values, positionally aligned with the rows being filtered.
+            Where `present` is False the values are meaningless.
+        present: Boolean array of the rows on which the tag is present.
+        unit: Unit of the column, if known.
+    """
+
+    def __init__(self, series: pd.Series, present: np.ndarray,
+                 unit: Optional[str]):
+        self.series = series
+        self.present = present
+        self.unit = unit
+
+
+def _is_marker_column(series: pd.Series) -> bool:
+    dtype = series.dtype
+    if isinstance(dtype, pd.SparseDtype):
+        dtype = dtype.subtype
+    return dtype == np.dtype(bool)
+
+
+def _present(series: pd.Series) -> np.ndarray:
+    if _is_marker_column(series):
+        return np.asarray(series, dtype=bool)
+    return series.notna().to_numpy()
+
+
+class Path:
+    """A tag name, optionally dereferenced through refs, e.g. `equipRef->dis`.
+
+    Each dereference looks the ref up in the index of the frame being
+    filtered, which is expected to hold the `id`s of its rows.
+    """
+
+    def __init__(self, names: List[str]):
+        self.names = names
+
+    def __repr__(self) -> str:
+        return '->'.join(self.names)
+
+    def resolve(self, df: pd.DataFrame,
+                column_info: ColumnInfo) -> Optional[_Column]:
+        col = self._lookup(df, column_info, self.names[0])
+        for name in self.names[1:]:
+            if col is None:
+                return None
+            target = self._lookup(df, column_info, name)
+            if target is None:
+                return None
+            positions = _ref_positions(col, df.index)
+            found = positions >= 0
+            safe = np.where(found, positions, 0)
+            col = _Column(
+                target.series.iloc[safe].reset_index(drop=True),
+                found & target.present[safe],
+                target.unit)
+        return col
+
+    @staticmethod
+    def _lookup(df: pd.DataFrame, column_info: ColumnInfo,
+                name: str) -> Optional[_Column]:
+        if name in df.columns:
+            series = df[name].reset_index(drop=True)
+        elif name == df.index.name:
+            series = df.index.to_series().reset_index(drop=True)
+        else:
+            return None
+        unit = column_info.get(name, {}).get('unit')
+        return _Column(
+            series, _present(series), None if unit is None else str(unit))
+
+
+def _ref_positions(col: _Column, index: pd.Index) -> np.ndarray:
+    """Positions in `index` of the refs in `col`, or -1 where not found."""
+    positions = RefIndex(index).positions(col.series)
+    return np.where(col.present, positions, -1)
+
+
+class Node:
+    """A node of a compiled filter plan."""
+
+    def mask(self, df: pd.DataFrame, column_info: ColumnInfo) -> np.ndarray:
+        raise NotImplementedError
+
+
+class Has(Node):
+    def __init__(self, path: Path):
+        self.path = path
+
+    def __repr__(self) -> str:
+        return f"Has({self.path})"
+
+    def mask(self, df: pd.DataFrame, column_info: ColumnInfo) -> np.ndarray:
+        col = self.path.resolve(df, column_info)
+        if col is None:
+            return np.zeros(len(df), dtype=bool)
+        return col.present
+
+
+class Missing(Has):
+    def __repr__(self) -> str:
+        return f"Missing({self.path})"
+
+    def mask(self, df: pd.DataFrame, column_info: ColumnInfo) -> np.ndarray:
+        return ~super().mask(df, column_info)
+
+
+class And(Node):
+    def __init__(self, children: List[Node]):
+        self.children = children
+
+    def __repr__(self) -> str:
+        return f"And({', '.join(map(repr, self.children))})"
+
+    def mask(self, df: pd.DataFrame, column_info: ColumnInfo) -> np.ndarray:
+        out = self.children[0].mask(df, column_info)
+        for child in self.children[1:]:
+            if not out.any():
+                break
+            out = out & child.mask(df, column_info)
+        return out
+
+
+class Or(And):
+    def __repr__(self) -> str:
+        return f"Or({', '.join(map(repr, self.children))})"
+
+    def mask(self, df: pd.DataFrame, column_info: ColumnInfo) -> np.ndarray:
+        out = self.children[0].mask(df, column_info)
+        for child in self.children[1:]:
+            if out.all():
+                break
+            out = out | child.mask(df, column_info)
+        return out
+
+
+def _cmp_value(x: Any, op: Callable[[Any, Any], Any], val: Scalar,
+               unit: Optional[str]) -> bool:
+    """Compares a single cell value with a filter value."""
+    if isinstance(x, Scalar) and not isinstance(x, Ref):
+        if isinstance(x, Number):
+            unit = x.units
+        x = x.value
+    try:
+        if isinstance(val, Number):
+            if isinstance(x, bool) or not isinstance(x, (int, float)):
+                return False
+            if val.units is not None and unit is not None and (
+                    val.units != unit):
+                return False
+            return bool(op(x, val.value))
+        if isinstance(val, Ref):
+            uid = ref_uid(x)
+            return uid is not None and bool(op(uid, val.uid))
+        if isinstance(val, Boolean):
+            return isinstance(x, (bool, np.bool_)) and bool(op(x, val.value))
+        if isinstance(val, Datetime):
+            return isinstance(x, pd.Timestamp) and bool(op(x, val.value))
+        # String, Uri
+        return isinstance(x, str) and bool(op(x, val.value))
+    except TypeError:
+        return False
+
+
+class Cmp(Node):
+    def __init__(self, path: Path, op: Token, val: Scalar):
+        self.path = path
+        self.op = op
+        self.val = val
+
+    def __repr__(self) -> str:
+        return f"Cmp({self.path} {self.op.val} {self.val!r})"
+
+    def mask(self, df: pd.DataFrame, column_info: ColumnInfo) -> np.ndarray:
+        col = self.path.resolve(df, column_info)
+        if col is None:
+            return np.zeros(len(df), dtype=bool)
+        op = _OPS[self.op.ttype]
+        val = self.val
+        series = col.series
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            per_cat = np.array(
+                [_cmp_value(c, op, val, col.unit)
+                 for c in series.cat.categories] + [False], dtype=bool)
+            return per_cat[series.cat.codes.to_numpy()] & col.present
+        if (isinstance(val, Number)
+                and pd.api.types.is_numeric_dtype(series.dtype)
+                and not _is_marker_column(series)):
+            if val.units is not None and col.unit is not None and (
+                    val.units != col.unit):
+                return np.zeros(len(df), dtype=bool)
+            with np.errstate(invalid='ignore'):
+                values = series.to_numpy(dtype=float, na_value=np.nan)
+                return op(values, val.value) & col.present
+        if isinstance(val, Datetime) and pd.api.types.is_datetime64_any_dtype(
+                series.dtype):
+            return np.asarray(op(series, val.value), dtype=bool) & col.present
+        if series.dtype == object:
+            rows = np.flatnonzero(col.present)
+            out = np.zeros(len(df), dtype=bool)
+            out[rows] = _object_mask(
+                series.to_numpy()[rows], op, val, col.unit)
+            return out
+        return np.zeros(len(df), dtype=bool)
+
+
+def _object_mask(values: np.ndarray, op: Callable[[Any, Any], Any],
+                 val: Scalar, unit: Optional[str]) -> np.ndarray:
+    """Compares the values of an object column with a filter value.
+
+    A column holding a single kind of value, e.g. the strs of `dis` or the
+    Numbers of a column with mixed units, is unwrapped once into an array
+    that is compared in one vectorized step. Only columns mixing kinds of
+    value are compared cell by cell.
+    """
+    none = np.zeros(len(values), dtype=bool)
+    inferred = pd.api.types.infer_dtype(values, skipna=False)
+    if inferred == 'string':
+        if isinstance(val, (String, Uri)):
+            return np.asarray(op(values, val.value), dtype=bool)
+        if isinstance(val, Ref):
+            # strs are taken to be uids, e.g. in the id index
+            return np.asarray(op(values, val.uid), dtype=bool)
+        return none
+    if inferred == 'boolean':
+        if isinstance(val, Boolean):
+            return op(values.astype(bool), val.value)
+        return none
+    kinds = set(map(type, values))
+    if kinds <= {Ref}:
+        if isinstance(val, Ref):
+            uids = np.array(list(map(_UID, values)), dtype=object)
+            return np.asarray(op(uids, val.uid), dtype=bool)
+        return none
+    if kinds <= {Number}:
+        if not isinstance(val, Number):
+            return none
+        numbers = np.fromiter(
+            map(_VALUE, values), dtype=float, count=len(values))
+        with np.errstate(invalid='ignore'):
+            out = op(numbers, val.value)
+        if val.units is not None:
+            units = np.array(list(map(_UNITS, values)), dtype=object)
+            out &= pd.isna(units) | (units == val.units)
+        return out
+    return np.fromiter(
+        (_cmp_value(x, op, val, unit) for x in values),
+        dtype=bool, count=len(values))
+
+
+class Filter:
+    """A compiled Haystack filter.
+
+    Obtain instances via `compile_filter`.
+    """
+
+    def __init__(self, expr: str, root: Node):
+        self.expr = expr
+        self.root = root
+
+    def __repr__(self) -> str:
+        return f"Filter({self.expr!r}: {self.root!r})"
+
+    def mask(self, df: pd.DataFrame,
+             column_info: Optional[ColumnInfo] = None) -> np.ndarray:
+        """Evaluates the filter over all rows of `df`.
+
+        Args:
+            df: The rows to filter. Tags are looked up among the columns and
+                the index name; refs are dereferenced through the index.
+            column_info: Column metadata, used for the units of columns.
+        Returns:
+            A boolean numpy array, True for the rows matching the filter.
+        """
+        return np.asarray(
+            self.root.mask(df, column_info or {}), dtype=bool)
+
+
+class _FilterParser:
+    def __init__(self, expr: str):
+        self._toks = [t for t in tokenize(expr) if t is not tokens.NEWLINE]
+        self._pos = 0
+
+    @property
+    def _cur(self) -> Token:
+        return self._toks[self._pos]
+
+    def _consume(self) -> Token:
+        tok = self._toks[self._pos]
+        if tok is not tokens.EOF:
+            self._pos += 1
+        return tok
+
+    def _is_keyword(self, word: str) -> bool:
+        return self._cur.ttype is TokenType.ID and self._cur.val == word
+
+    def parse(self) -> Node:
+        node = self._parse_or()
+        if self._cur is not tokens.EOF:
+            raise FilterParseException(f"Unexpected token {self._cur}")
+        return node
+
+    def _parse_or(self) -> Node:
+        children = [self._parse_and()]
+        while self._is_keyword('or'):
+            self._consume()
+            children.append(self._parse_and())
+        return children[0] if len(children) == 1 else Or(children)
+
+    def _parse_and(self) -> Node:
+        children = [self._parse_term()]
+        while self._is_keyword('and'):
+            self._consume()
+            children.append(self._parse_term())
+        return children[0] if len(children) == 1 else And(children)
+
+    def _parse_term(self) -> Node:
+        if self._cur is tokens.LPAREN:
+            self._consume()
+            node = self._parse_or()
+            if self._consume() is not tokens.RPAREN:
+                raise FilterParseException("Expected closing parenthesis")
+            return node
+        if self._is_keyword('not'):
+            self._consume()
+            return Missing(self._parse_path())
+        path = self._parse_path()
+        if self._cur.ttype in _OPS:
+            op = self._consume()
+            return Cmp(path, op, self._parse_val())
+        return Has(path)
+
+    def _parse_path(self) -> Path:
+        names = [self._parse_name()]
+        while self._cur is tokens.ARROW:
+            self._consume()
+            names.append(self._parse_name())
+        return Path(names)
+
+    def _parse_name(self) -> str:
+        tok = self._consume()
+        if tok.ttype is not TokenType.ID or tok.val in ('and', 'or', 'not'):
+            raise FilterParseException(f"Expected tag name but found {tok}")
+        return tok.val
+
+    def _parse_val(self) -> Scalar:
+        tok = self._consume()
+        if tok.ttype is TokenType.ID and tok.val in ('true', 'false'):
+            return BOOL_TRUE if tok.val == 'true' else BOOL_FALSE
+        if tok is tokens.TRUE or tok is tokens.FALSE:
+            return BOOL_TRUE if tok is tokens.TRUE else BOOL_FALSE
+        if isinstance(tok, NumberToken):
+            try:
+                return Number(*tok.quantity())
+            except ValueError:
+                raise FilterParseException(f"Invalid number {tok.val}")
+        if tok.ttype is TokenType.REF:
+            parts = tok.val.split(" ", maxsplit=1)
+            return Ref(*parts)
+        if tok.ttype is TokenType.STRING:
+            return String(tok.val)
+        if tok.ttype is TokenType.URI:
+            return Uri(tok.val)
+        if tok.ttype is TokenType.DATETIME:
+            parts = tok.val.split(" ")
+            return Datetime(pd.to_datetime(parts[0]), *parts[1:2])
+        raise FilterParseException(f"Unsupported filter value {tok}")
+
+
+@functools.lru_cache(maxsize=256)
+def compile_filter(expr: str) -> Filter:
+    """Parses a Haystack filter into a reusable, vectorized Filter.
+
+    Results are cached, so compiling the same expression twice is free.
+
+    Raises:
+        FilterParseException: if `expr` is not a valid filter.
+    """
+    try:
+        return Filter(expr, _FilterParser(expr).parse())
+    except FilterParseException:
+        raise
+    except Exception as e:
+        raise FilterParseException(f"Invalid filter {expr!r}: {e}") from e
+
+
+FilterLike = Union[str, Filter]
+
+
+def as_filter(flt: FilterLike) -> Filter:
+    return compile_filter(flt) if isinstance(flt, str) else flt
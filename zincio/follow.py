@@ -0,0 +1,106 @@
+"""Incremental reading of a Zinc file as rows are appended to it."""
+
+import io
+import os
+
+from os import PathLike
+from typing import Any, Dict, Optional, Union
+
+import pandas as pd  # type: ignore
+
+from .grid import GridBuilder
+from .zinc_parser import ZincParser
+from .zinc_tokenizer import ZincTokenizer
+
+
+class ZincFollower:
+    """Follows a Zinc file that is being appended to, like `tail -f`.
+
+    The header is parsed once, on the first poll that finds it complete.
+    After that, each `poll` reads the file from where the last one stopped
+    and parses only the complete rows appended since, so its cost is
+    proportional to what was appended rather than to the size of the file.
+    A partial last line, e.g. one still being written, is left for a later
+    poll.
+
+        follower = zincio.ZincFollower('live.zinc')
+        while True:
+            new_rows = follower.poll()
+            ...
+            time.sleep(60)
+
+    If the file shrinks, e.g. when it is rotated or rewritten, it is
+    followed again from the start, header included.
+
+    Args:
+        path: Path of the Zinc file. It need not exist yet.
+
+    Attributes:
+        offset: Byte offset in the file of the first row not yet parsed.
+    """
+
+    def __init__(self, path: Union[str, PathLike]):
+        self.path = path
+        self.offset = 0
+        self._header: Optional[GridBuilder] = None
+
+    @property
+    def grid_info(self) -> Dict[str, Any]:
+        """The grid metadata of the file, empty until its header is read."""
+        return self._header.grid_meta if self._header is not None else {}
+
+    @property
+    def column_info(self) -> Dict[str, Dict[str, Any]]:
+        """The column metadata of the file, empty until its header is read.
+        """
+        return self._header.col_meta if self._header is not None else {}
+
+    def poll(self) -> pd.DataFrame:
+        """Parses the complete rows appended since the last poll.
+
+        Returns:
+            The new rows, laid out as the data of a Grid read with
+            `zincio.read`, possibly none. Before the file and its header
+            exist, an empty DataFrame without columns.
+        """
+        data = self._read_new()
+        start = 0
+        header = self._header
+        if header is None:
+            start = _header_end(data)
+            if start < 0:
+                return pd.DataFrame()
+            header = ZincParser(ZincTokenizer(io.StringIO(
+                data[:start].decode('utf-8')))).parse_header()
+        # Only complete lines; the rest is read again next time
+        end = max(data.rfind(b'\n') + 1, start)
+        text = data[start:end].decode('utf-8')
+        parser = ZincParser(ZincTokenizer(io.StringIO(text)))
+        rows = parser.parse_rows(header).data
+        # Only now, so that rows that fail to parse are not skipped
+        self._header = header
+        self.offset += end
+        return rows
+
+    def _read_new(self) -> bytes:
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return b''
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            if size < self.offset:
+                # Rotated or rewritten; start over
+                self.offset = 0
+                self._header = None
+            f.seek(self.offset)
+            return f.read(size - self.offset)
+
+
+def _header_end(data: bytes) -> int:
+    """Returns the offset just past the two header lines, or -1."""
+    first = data.find(b'\n')
+    if first < 0:
+        return -1
+    second = data.find(b'\n', first + 1)
+    return second + 1 if second >= 0 else -1
@@ -1,28 +1,62 @@
+import io
+import json
 import logging
+import os
 import numpy as np  # type: ignore
 import pandas as pd  # type: ignore
+import shutil
 
+from array import array
 from os import PathLike
+from pathlib import Path
 from pandas.api.types import CategoricalDtype  # type: ignore
-from typing import Any, Dict, List, Optional, Union
-
-from .dtypes import Boolean, Number, Scalar, String, MARKER, NULL, NA
+from typing import Any, Callable, Dict, IO, List, Optional, Tuple, Union
+
+from .column_stats import ColumnStats, compute_column_stats
+from .dtypes import (
+    Boolean,
+    Marker,
+    Null,
+    Number,
+    Ref,
+    Scalar,
+    String,
+    MARKER,
+    NULL,
+    NA,
+    quote,
+)
+from .filter import FilterLike, as_filter
+from .refs import RefIndex, as_ref, ref_uids
+from .tz import haystack_tz, localize
 
 
 ID_COLTAG = 'id'
+TS_COLTAG = 'ts'
+TZ_COLTAG = 'tz'
 KIND_COLTAG = 'kind'
 UNIT_COLTAG = 'unit'
 ENUM_COLTAG = 'enum'
 
 NUMBER_KIND = String("Number")
 STRING_KIND = String("Str")
+BOOL_KIND = String("Bool")
+
+# Str and Ref columns are stored as Categoricals unless they have more than
+# this many distinct values per non-null cell, when codes no longer pay off.
+CATEGORY_RATIO = 0.5
+# Interval, in rows, at which to drop value dictionaries that have grown past
+# CATEGORY_RATIO while parsing, so unique columns like `id` stop costing more.
+_DICT_CHECK_ROWS = 1024
+# Number of rows formatted at a time when writing Zinc
+_WRITE_ROWS = 100_000
 
 
 def _stringify_tag(k, v):
     if v is MARKER:
         return str(k)
     elif isinstance(v, String):
-        return f"{k}:\"{v}\""
+        return f"{k}:{quote(v.value)}"
     else:
         return f"{k}:{v}"
 
@@ -56,6 +90,11 @@ class Grid:
         column_info: A Dict[str, Dict[str, Any]] containing metadata about each
             column. Included are details such as what units a column
             represents, or the Point ID associated with the column.
+        column_stats: The ColumnStats of each data column, by label, if
+            gathered while reading with `column_stats=True`; otherwise None.
+        id_dis: The display names of the `id`s of an entity grid, by uid,
+            for those ids that have one, as `@p1 "Dis"` in Zinc. The index
+            holds only the uids, so that rows can be looked up by them.
     """
 
     def __init__(
@@ -64,11 +103,119 @@ class Grid:
             version: int,
             grid_info: Dict[str, Any],
             column_info: Dict[str, Dict[str, Any]],
-            data: pd.DataFrame):
+            data: pd.DataFrame,
+            id_dis: Optional[Dict[str, str]] = None):
         self.version = version  # type: int
         self.grid_info = grid_info  # type: Dict[str, Any]
         self.column_info = column_info  # type: Dict[str, Dict[str, Any]]
         self.data = data
+        self.column_stats: Optional[Dict[Any, ColumnStats]] = None
+        self.id_dis: Dict[str, str] = id_dis if id_dis is not None else {}
+
+    @classmethod
+    def from_pandas(
+            cls,
+            df: Union[pd.DataFrame, pd.Series],
+            *,
+            tz: Optional[str] = None,
+            units: Optional[Dict[Any, str]] = None,
+            point_ids: Optional[Dict[Any, Any]] = None,
+            grid_info: Optional[Dict[str, Any]] = None) -> 'Grid':
+        """Makes a history or entity Grid of a DataFrame, deriving its
+        column_info.
+
+        The DataFrame becomes the Grid's `data` without a copy, and is
+        streamed straight out by `to_zinc`. Its index is named `ts` or `id`,
+        as in the grids `read` returns.
+
+        A frame with a DatetimeIndex makes a history grid. Any other frame
+        makes an entity grid, with one row per entity, laid out as `read`
+        returns them: boolean columns are marker tags, Ref and str columns
+        are best made categorical, and the index, if not a RangeIndex, is
+        the `id` of each row.
+
+        Args:
+            df: DataFrame or Series. A naive DatetimeIndex is taken to be
+                UTC.
+            tz: Haystack name of the time zone to write timestamps in, e.g.
+                `New_York`. Defaults to that of the index, or UTC.
+            units: Unit of each numeric column, by column name.
+            point_ids: Ref or id of the point of each column, by column name,
+                e.g. `p1`, `@p1` or `@p1 "Dis"` as `read` names columns.
+                History grids only.
+            grid_info: Grid metadata, e.g. `hisStart`.
+        Returns:
+            For a history grid, a Grid whose column_info has a `ts` column
+            followed by `v0`, `v1`, etc, one for each column in order, tagged
+            with its `id`, `kind` and `unit` where known. For an entity grid,
+            one whose columns are named as those of `df`, preceded by `id`.
+        """
+        if isinstance(df, pd.Series):
+            df = df.to_frame()
+        units = units or {}
+        point_ids = point_ids or {}
+        for given in (units, point_ids):
+            unknown = set(given).difference(df.columns)
+            if unknown:
+                raise ValueError(f"No such columns: {sorted(unknown)}")
+        if not isinstance(df.index, pd.DatetimeIndex):
+            if point_ids:
+                raise ValueError("point_ids are only for history grids")
+            return cls._entities_from_pandas(df, units, grid_info)
+        if df.index.name != TS_COLTAG:
+            # As read returns them, and rollup and concat expect
+            df = df.rename_axis(TS_COLTAG, copy=False)
+        if tz is None:
+            tz = haystack_tz(df.index.tz) if df.index.tz is not None else None
+        column_info: Dict[str, Dict[str, Any]] = {
+            TS_COLTAG: {TZ_COLTAG: String(tz or 'UTC')}}
+        for i, col in enumerate(df.columns):
+            info: Dict[str, Any] = {}
+            if col in point_ids:
+                info[ID_COLTAG] = as_ref(point_ids[col])
+            dtype = df[col].dtype
+            if pd.api.types.is_bool_dtype(dtype):
+                info[KIND_COLTAG] = BOOL_KIND
+            elif pd.api.types.is_numeric_dtype(dtype):
+                info[KIND_COLTAG] = NUMBER_KIND
+            else:
+                info[KIND_COLTAG] = STRING_KIND
+            if col in units:
+                info[UNIT_COLTAG] = String(units[col])
+            column_info[f'v{i}'] = info
+        return cls(
+            version=3,
+            grid_info=dict(grid_info or {}),
+            column_info=column_info,
+            data=df)
+
+    @classmethod
+    def _entities_from_pandas(
+            cls,
+            df: pd.DataFrame,
+            units: Dict[Any, str],
+            grid_info: Optional[Dict[str, Any]]) -> 'Grid':
+        column_info: Dict[str, Dict[str, Any]] = {}
+        if not isinstance(df.index, pd.RangeIndex):
+            if df.index.name not in (None, ID_COLTAG):
+                raise ValueError(
+                    f"The index of an entity frame is its {ID_COLTAG!r}, "
+                    f"not {df.index.name!r}")
+            if df.index.name is None:
+                df = df.rename_axis(ID_COLTAG, copy=False)
+            column_info[ID_COLTAG] = {}
+        for col in df.columns:
+            name = str(col)
+            if name in column_info:
+                raise ValueError(f"Duplicate column {name!r}")
+            column_info[name] = {}
+            if col in units:
+                column_info[name][UNIT_COLTAG] = String(units[col])
+        return cls(
+            version=3,
+            grid_info=dict(grid_info or {}),
+            column_info=column_info,
+            data=df)
 
     def __repr__(self):
         return (f"Grid<\n"
@@ -78,6 +225,170 @@ class Grid:
                 + self.data.__repr__()
                 + ">")
 
+    def filter(self, flt: FilterLike) -> 'Grid':
+        """Returns a Grid of the rows matching a Haystack filter.
+
+        The filter is compiled once and evaluated over all rows at once. Tags
+        are looked up among the columns (and the `id` index of entity grids),
+        and `->` dereferences refs through the `id`s of this Grid's rows.
+
+        Args:
+            flt: str or Filter
+                A Haystack filter, e.g. `point and siteRef==@s1`, or a Filter
+                previously obtained from `zincio.filter.compile_filter`.
+        Returns:
+            A Grid with the same metadata, restricted to the matching rows.
+        """
+        mask = as_filter(flt).mask(self.data, self.column_info)
+        return Grid(
+            version=self.version,
+            grid_info=self.grid_info,
+            column_info=self.column_info,
+            data=self.data[mask],
+            id_dis=self.id_dis)
+
+    def select_columns(self, flt: FilterLike) -> 'Grid':
+        """Returns a Grid of the columns whose tags match a Haystack filter.
+
+        The filter is evaluated over `column_info`, for instance
+        `point and unit=="°F"`. The `ts` column of history grids and the `id`
+        column of entity grids are always kept.
+
+        Args:
+            flt: str or Filter
+                A Haystack filter, or a Filter previously obtained from
+                `zincio.filter.compile_filter`.
+        Returns:
+            A Grid with the same grid metadata, restricted to the matching
+            columns.
+        """
+        names = list(self.column_info)
+        key = 'ts' if 'ts' in self.column_info else ID_COLTAG
+        candidates = [n for n in names if n != key]
+        tags, tags_info = _tags_frame(
+            [self.column_info[n] for n in candidates])
+        mask = as_filter(flt).mask(tags, tags_info)
+        keep = [n for n, m in zip(candidates, mask) if m]
+        column_info = {
+            n: self.column_info[n] for n in names if n == key or n in keep}
+        if key == 'ts':
+            # Data columns are renamed by id, so select them by position
+            positions = [i for i, m in enumerate(mask) if m]
+            data = self.data.iloc[:, positions]
+        else:
+            data = self.data[keep]
+        return Grid(
+            version=self.version,
+            grid_info=self.grid_info,
+            column_info=column_info,
+            data=data,
+            id_dis=self.id_dis)
+
+    @property
+    def ref_index(self) -> RefIndex:
+        """A hash index from the `id`s of this entity grid to row positions.
+
+        Built on first access and reused until `data` is replaced.
+
+        Raises:
+            ValueError: if this is not an entity grid indexed by `id`.
+        """
+        data = self.data
+        cached = getattr(self, '_ref_index', None)
+        if cached is not None and cached[0] is data:
+            return cached[1]
+        if data.index.name != ID_COLTAG:
+            raise ValueError("Only entity grids indexed by id have refs")
+        index = RefIndex(data.index)
+        self._ref_index = (data, index)
+        return index
+
+    def follow(self, tag: str, *targets: 'Grid') -> 'Grid':
+        """Follows the refs in column `tag` to the rows they refer to.
+
+        Every row of this Grid is matched with the row its `tag` ref points
+        to, searching `targets` in order. The match is a single vectorized
+        lookup in each target's `ref_index`. Since the result is aligned with
+        this Grid's rows, calls can be chained to walk a ref graph:
+
+            sites_of_points = points.follow('equipRef', equips).follow(
+                'siteRef', sites)
+
+        Args:
+            tag: Name of a ref column of this Grid, e.g. `equipRef`.
+            targets: One or more entity Grids to look the refs up in. The
+                first Grid containing a ref wins.
+        Returns:
+            A Grid with this Grid's index and the targets' columns, holding
+            the referenced rows. Rows whose ref is missing or dangling are
+            missing throughout.
+        """
+        if not targets:
+            raise ValueError("At least one target Grid is required")
+        uids = ref_uids(self.data[tag])
+        positions = np.full(len(uids), -1)
+        source = np.full(len(uids), -1)
+        for i, target in enumerate(targets):
+            found = target.ref_index.positions(uids)
+            hit = (source < 0) & (found >= 0)
+            positions[hit] = found[hit]
+            source[hit] = i
+        frames = []
+        for i, target in enumerate(targets):
+            rows = source == i
+            frame = target.data.iloc[positions[rows]]
+            frame.index = np.flatnonzero(rows)
+            frames.append(frame)
+        data = pd.concat(frames) if len(frames) > 1 else frames[0]
+        data = data.reindex(np.arange(len(uids)))
+        data.index = self.data.index
+        column_info: Dict[str, Dict[str, Any]] = {}
+        for target in targets:
+            for k, v in target.column_info.items():
+                column_info.setdefault(k, v)
+        return Grid(
+            version=self.version,
+            grid_info={},
+            column_info=column_info,
+            data=data,
+            id_dis=self.id_dis)
+
+    def referrers(self, other: 'Grid', tag: str) -> 'Grid':
+        """Returns the rows of `other` whose `tag` refers to this Grid's rows.
+
+        For instance, `equips.referrers(points, 'equipRef')` returns the
+        points of `equips`, in a single vectorized lookup.
+        """
+        mask = self.ref_index.positions(other.data[tag]) >= 0
+        return Grid(
+            version=other.version,
+            grid_info=other.grid_info,
+            column_info=other.column_info,
+            data=other.data[mask],
+            id_dis=other.id_dis)
+
+    def rollup(
+            self,
+            interval: Union[str, pd.Timedelta],
+            fold: str = 'avg') -> 'Grid':
+        """Rolls this history grid up into fixed intervals.
+
+        Bins are assigned in one vectorized pass over the int64 timestamps,
+        aligned to the wall clock of the `ts` time zone. Column tags such as
+        `unit` and the time zone are kept. See `zincio.Rollup` to roll up a
+        chunked read in bounded memory.
+
+        Args:
+            interval: Width of each interval, e.g. '15min' or '1h'.
+            fold: One of 'avg', 'min', 'max', 'sum' and 'count'.
+        Returns:
+            A Grid with one row per interval that has any rows.
+        """
+        from .rollup import Rollup
+        rollup = Rollup(interval, fold)
+        rollup.add(self)
+        return rollup.result()
+
     def to_pandas(self, squeeze=True) -> Union[pd.DataFrame, pd.Series]:
         """Returns the tabular data in this Grid as a DataFrame or Series.
 
@@ -106,18 +417,72 @@ class Grid:
         """
         if path is not None:
             with open(path, "w", encoding="utf-8") as f:
-                f.write(self._grid_info_str())
-                f.write("\n")
-                f.write(self._column_info_str())
-                f.write("\n")
-                self._zinc_format_data().to_csv(f, mode="a", header=False)
+                self._write_zinc(f)
             return None
         else:
-            return "\n".join([
-                self._grid_info_str(),
-                self._column_info_str(),
-                self._zinc_format_data().to_csv(header=False)
-            ])
+            buf = io.StringIO()
+            self._write_zinc(buf)
+            return buf.getvalue()
+
+    def to_zinc_partitioned(
+            self,
+            directory: Union[str, PathLike],
+            freq: str = 'D') -> List[Path]:
+        """Writes a history grid as one Zinc file per time period.
+
+        Rows are split by the period they fall in, in the time zone of the
+        `ts` column, and each period is written to `<period>.zinc` in
+        `directory`, e.g. `2021-03-14.zinc`. Each file has the grid meta of
+        this Grid with its `hisStart` and `hisEnd` set to the bounds of its
+        period, so that `zincio.read_dataset` can select files by time from
+        their headers alone.
+
+        Args:
+            directory: Directory to write to, created if need be. Files of
+                the same periods are overwritten.
+            freq: A pandas period frequency, e.g. 'D' for days, 'h' for hours
+                or 'M' for months.
+        Returns:
+            The paths written, in time order.
+        """
+        from .dataset import write_partitioned
+        return write_partitioned(self, directory, freq)
+
+    def to_json(self, path: Optional[PathLike] = None) -> Optional[str]:
+        """Writes the object as Haystack JSON (Hayson).
+
+        Columns are encoded in bulk, e.g. each category of a categorical
+        column only once. The result reads back with `zincio.read_json`.
+
+        Args:
+            path: str or file handle, default None
+                File path or object. If None is provided, the result is
+                returned as a string. Otherwise, object is written to file.
+        Returns:
+            The JSON string representation of the grid if path is None,
+            otherwise None.
+        """
+        from .hayson import to_json
+        obj = to_json(self)
+        if path is not None:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(obj, f, ensure_ascii=False)
+            return None
+        return json.dumps(obj, ensure_ascii=False)
+
+    def _write_zinc(self, f: IO[str], header: bool = True) -> None:
+        """Writes this Grid as Zinc to a text stream.
+
+        Without `header`, only the rows are written, e.g. to append a chunk to
+        a grid whose header has already been written.
+        """
+        from .zinc_writer import write_rows
+        if header:
+            f.write(self._grid_info_str())
+            f.write("\n")
+            f.write(self._column_info_str())
+            f.write("\n")
+        write_rows(f, self.data, self.column_info, self.id_dis)
 
     def _grid_info_str(self) -> str:
         return " ".join([
@@ -130,32 +495,124 @@ class Grid:
             cols.append(" ".join(tagpairs))
         return ",".join(cols)
 
-    def _zinc_format_data(self) -> pd.DataFrame:
-        df: pd.DataFrame = self.data.copy()
-        for i, colinfo in enumerate(self.column_info.values()):
-            # Format datetime index as appropriate
-            if i == 0:
-                # TODO: Don't use a Python for loop! For the life of me, i
-                # cannot find a way to do this in Pandas/NumPy. There is no
-                # obvious builtin vectorized version.
-                df.index = [t.isoformat() for t in df.index.to_pydatetime()]
-                if 'tz' in colinfo:
-                    df.index += " " + str(colinfo['tz'])
-            # Append units to columns where relevant
-            elif i >= 1:
-                colname: str = df.columns[i-1]
-                if "unit" in colinfo:
-                    notna: pd.Series = df[colname].notna()
-                    unit: str = str(colinfo["unit"])
-                    df.loc[notna, colname] = (
-                        df.loc[notna, colname].astype(str) + unit)
-        return df
+
+class LazyGrid(Grid):
+    """A Grid whose tabular data is only parsed when first accessed.
+
+    The grid and column metadata are available immediately. The rows are
+    parsed by `loader` the first time `data` (or anything that depends on it,
+    such as `to_pandas()`) is touched. Until then, `to_zinc()` copies the
+    original Zinc content through verbatim rather than re-serializing it,
+    provided the metadata has not been modified in the meantime, nor the
+    size or modification time of the source file.
+
+    Obtain instances via `zincio.read(..., lazy=True)`.
+    """
+
+    def __init__(
+            self,
+            *,
+            version: int,
+            grid_info: Dict[str, Any],
+            column_info: Dict[str, Dict[str, Any]],
+            loader: Callable[[], Grid],
+            source_path: Optional[Union[str, bytes, PathLike]] = None,
+            source_identity: Optional[Tuple[int, int]] = None,
+            source_text: Optional[str] = None):
+        self._data: Optional[pd.DataFrame] = None
+        self._loader = loader
+        self._source_path = source_path
+        # As of the read, to detect the file changing before passthrough
+        self._read_identity = source_identity
+        self._source_text = source_text
+        # Snapshot of the metadata, to detect modifications before passthrough
+        self._orig_grid_info = dict(grid_info)
+        self._orig_column_info = {k: dict(v) for k, v in column_info.items()}
+        self.version = version
+        self.grid_info = grid_info
+        self.column_info = column_info
+        self.column_stats = None
+        self.id_dis = {}
+
+    @property
+    def data(self) -> pd.DataFrame:
+        if self._data is None:
+            grid = self._loader()
+            self.column_stats = grid.column_stats
+            self.id_dis = grid.id_dis
+            # Building may derive column tags (e.g. units of entity columns)
+            for col, tags in grid.column_info.items():
+                for k, v in tags.items():
+                    self.column_info.setdefault(col, {}).setdefault(k, v)
+            self._data = grid.data
+        return self._data
+
+    @data.setter
+    def data(self, data: pd.DataFrame) -> None:
+        self._data = data
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the tabular data has been parsed yet."""
+        return self._data is not None
+
+    def to_zinc(self, path: Optional[PathLike] = None) -> Optional[str]:
+        if (self.loaded or not self._metadata_untouched()
+                or not self._source_unchanged()):
+            return super().to_zinc(path)
+        if path is None:
+            if self._source_path is not None:
+                with open(self._source_path, encoding="utf-8") as f:
+                    return f.read()
+            return self._source_text
+        if self._source_path is not None:
+            shutil.copyfile(self._source_path, path)
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(str(self._source_text))
+        return None
+
+    def _metadata_untouched(self) -> bool:
+        return (self.grid_info == self._orig_grid_info
+                and self.column_info == self._orig_column_info)
+
+    def _source_unchanged(self) -> bool:
+        if self._source_path is None:
+            return True
+        identity = _source_identity(self._source_path)
+        return identity is not None and identity == self._read_identity
+
+
+def _source_identity(
+        path: Union[str, bytes, PathLike]) -> Optional[Tuple[int, int]]:
+    """Returns the size and modification time in ns of a file, if it exists.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
 
 
 class GridBuilder:
     """Builder for Grid.
 
     Collects all necessary information before constructing the Grid.
+
+    History grids (those with a `ts` column) are collected densely. Entity
+    grids, whose columns are mostly sparse tags, are collected sparsely: only
+    the non-null cells of each column are kept, along with their row numbers.
+
+    The `ts` column of a history grid may hold raw Zinc datetime text, which
+    `build` localises in one vectorized step to the time zone declared by
+    its `tz` tag. Text at a fixed interval, perhaps but for the first and
+    last rows, is recognised as such and never parsed row by row; the index
+    of a wholly regular grid has its `freq` set.
+
+    Each column also has a value dictionary, in `value_dicts`, from token
+    type and raw text to Scalar. The parser uses it to allocate each distinct
+    Str or Ref only once, and `build` turns it into the categories of the
+    column.
     """
 
     def __init__(self, version: int):
@@ -163,6 +620,16 @@ class GridBuilder:
         self.grid_meta: Dict[str, Any] = {}
         self.col_meta: Dict[str, Dict[str, Scalar]] = {}
         self.cols: Dict[str, List[Scalar]] = {}
+        # Entity grids only: row numbers of the cells in self.cols
+        self.col_rows: Dict[str, array] = {}
+        self.num_rows: int = 0
+        self.entity: bool = False
+        # Whether build() gathers the ColumnStats of the data
+        self.gather_stats: bool = False
+        # By column position; None once a column proves high-cardinality
+        self.value_dicts: List[Optional[Dict[Any, Scalar]]] = []
+        # Entity grids only: display names of the ids that have one, by uid
+        self.id_dis: Dict[str, str] = {}
 
     def add_meta(self, grid_meta: Dict[str, Any]):
         self.grid_meta = grid_meta
@@ -170,19 +637,82 @@ class GridBuilder:
     def add_col(self, colname: str, col: Dict[str, Scalar]):
         self.col_meta[colname] = col
         self.cols[colname] = []
+        self.col_rows[colname] = array('q')
+        self.value_dicts.append({})
+        self.entity = 'ts' not in self.col_meta
 
     def add_row(self, row: List[Scalar]):
-        for k, v in zip(self.cols, row):
-            self.cols[k].append(v)
+        if self.entity:
+            n = self.num_rows
+            for k, v in zip(self.cols, row):
+                if v is not NULL:
+                    self.cols[k].append(v)
+                    self.col_rows[k].append(n)
+        else:
+            for k, v in zip(self.cols, row):
+                self.cols[k].append(v)
+        self.num_rows += 1
+        if self.num_rows % _DICT_CHECK_ROWS == 0:
+            self._close_value_dicts()
+
+    def _close_value_dicts(self) -> None:
+        limit = CATEGORY_RATIO * self.num_rows
+        for i, lookup in enumerate(self.value_dicts):
+            if lookup is not None and len(lookup) > limit:
+                self.value_dicts[i] = None
 
     def build(self) -> Grid:
         """Constructs and returns a Grid.
 
         A GridBuilder instance cannot be safely reused!
         """
-        idx = [x.value for x in self.cols.pop('ts')]
-        df = pd.DataFrame(data=self.cols, index=idx)
-        df.index.name = 'ts'
+        if self.entity:
+            df = self._build_entity_frame()
+        else:
+            df = self._build_his_frame()
+            self._sanitize(df)
+        grid = Grid(
+            version=self.version,
+            grid_info=self.grid_meta,
+            column_info=self.col_meta,
+            data=df,
+            id_dis=self.id_dis)
+        if self.gather_stats:
+            grid.column_stats = compute_column_stats(df)
+        return grid
+
+    def _build_his_frame(self) -> pd.DataFrame:
+        ts_info = self.col_meta[TS_COLTAG]
+        tz = str(ts_info[TZ_COLTAG]) if TZ_COLTAG in ts_info else None
+        cells = self.cols.pop(TS_COLTAG)
+        # Raw Zinc text from the parser, or Datetimes; str() makes them alike
+        text = pd.Series(cells, dtype=object).astype(str)
+        missing = np.fromiter(
+            (v is NULL for v in cells), dtype=bool, count=len(cells))
+        if missing.any():
+            # Localised to NaT
+            text[missing] = None
+        idx = localize(text, tz)
+        data: Dict[str, Any] = {}
+        for col, lookup in zip(self.col_meta, self.value_dicts):
+            if col not in self.cols:
+                continue
+            values = self.cols.pop(col)
+            colinfo = self.col_meta[col]
+            data[col] = values
+            if (colinfo.get(KIND_COLTAG) == NUMBER_KIND
+                    or ENUM_COLTAG in colinfo):
+                continue
+            encoded = _dictionary_encode(values, lookup) if lookup else None
+            if encoded is not None:
+                data[col] = pd.Categorical.from_codes(*encoded)
+                continue
+            kinds = {type(v) for v in values}
+            if String in kinds and kinds <= {String, Null}:
+                # Plain strs, as in the categories of encoded columns
+                data[col] = [None if v is NULL else v.value for v in values]
+        df = pd.DataFrame(data=data, index=idx)
+        df.index.name = TS_COLTAG
         # Rename columns with ID tag, if available
         renaming = {}
         for col in df.columns:
@@ -190,17 +720,140 @@ class GridBuilder:
             if ID_COLTAG in v:
                 renaming[col] = str(v[ID_COLTAG])
         df.rename(columns=renaming, inplace=True)
+        return df
+
+    def _build_entity_frame(self) -> pd.DataFrame:
+        n = self.num_rows
+        index = pd.RangeIndex(n)
+        data = {}
+        for col, lookup in zip(list(self.cols), self.value_dicts):
+            values = self.cols.pop(col)
+            rows = np.frombuffer(self.col_rows.pop(col), dtype=np.int64)
+            if col == ID_COLTAG:
+                ids = np.full(n, None, dtype=object)
+                ids[rows] = [
+                    v.uid if isinstance(v, Ref) else str(v) for v in values]
+                index = pd.Index(ids, name=ID_COLTAG)
+                self.id_dis = {
+                    v.uid: v.display_name for v in values
+                    if isinstance(v, Ref) and v.display_name is not None}
+            else:
+                data[col] = _entity_column(
+                    values, rows, n, self.col_meta[col], lookup)
+        return pd.DataFrame(data, index=index)
+
+    def _sanitize(self, df: pd.DataFrame) -> None:
         for i, col in enumerate(self.col_meta):
             # i == 0 corresponds to the index; skip
             if i > 0:
                 colinfo = self.col_meta[col]
                 cname = df.columns[i-1]
                 df[cname] = _sanitize_series(df[cname], colinfo)
-        return Grid(
-            version=self.version,
-            grid_info=self.grid_meta,
-            column_info=self.col_meta,
-            data=df)
+
+
+def _tags_frame(tags: List[Dict[str, Scalar]]):
+    """Builds an entity frame with one row per dict of tags.
+
+    Returns:
+        The frame, and the column metadata derived while building it.
+    """
+    gb = GridBuilder(3)
+    names = list(dict.fromkeys(k for t in tags for k in t))
+    for name in names:
+        gb.add_col(name, {})
+    gb.entity = True
+    for t in tags:
+        gb.add_row([t.get(name, NULL) for name in names])
+    return gb._build_entity_frame(), gb.col_meta
+
+
+def _maybe_sparse(dense: np.ndarray, nnz: int, fill_value: Any) -> Any:
+    # A sparse array stores each present value plus a 4-byte position
+    itemsize = dense.dtype.itemsize
+    if nnz * (itemsize + 4) < len(dense) * itemsize:
+        return pd.arrays.SparseArray(dense, fill_value=fill_value)
+    return dense
+
+
+def _dictionary_encode(
+        values: List[Scalar],
+        lookup: Optional[Dict[Any, Scalar]]) -> Optional[tuple]:
+    """Encodes a column of Strs or of Refs against its value dictionary.
+
+    Args:
+        values: The cells of the column, NULL where missing.
+        lookup: The column's value dictionary. If empty, e.g. when rows were
+            added without a parser, it is derived from `values`.
+    Returns:
+        The codes, -1 where missing, and the categories: Strs as `str`, and
+        Refs as they are. None if the column holds anything other than
+        Strs or Refs of a single kind, or has too many distinct values.
+    """
+    if lookup is None:
+        return None
+    if not lookup:
+        lookup = {id(v): v for v in values if v is not NULL}
+    kinds = {type(v) for v in lookup.values()}
+    if kinds != {String} and kinds != {Ref}:
+        return None
+    unwrap = kinds == {String}
+    # Equal values may have been interned under different token text
+    categories: Dict[Any, int] = {}
+    code_of = {
+        id(v): categories.setdefault(v.value if unwrap else v, len(categories))
+        for v in lookup.values()}
+    codes = np.fromiter(
+        (code_of.get(id(v), -1) for v in values), dtype=np.int64,
+        count=len(values))
+    missing = np.flatnonzero(codes < 0)
+    if any(values[i] is not NULL for i in missing):
+        return None
+    if len(categories) > CATEGORY_RATIO * (len(values) - len(missing)):
+        return None
+    codes = codes.astype(np.min_scalar_type(-len(categories) - 1))
+    return codes, list(categories)
+
+
+def _entity_column(
+        values: List[Scalar],
+        rows: np.ndarray,
+        n: int,
+        colinfo: Dict[str, Any],
+        lookup: Optional[Dict[Any, Scalar]]) -> Any:
+    """Converts the non-null cells of an entity grid column to an array.
+
+    Markers become boolean columns, numbers with a single unit become float
+    columns (each sparse when that is smaller), and strings and refs become
+    categoricals unless most of them are distinct. Anything else is left as
+    an object column of Scalars.
+    """
+    kinds = {type(v) for v in values}
+    if kinds == {Marker}:
+        dense = np.zeros(n, dtype=bool)
+        dense[rows] = True
+        return _maybe_sparse(dense, len(rows), False)
+    if kinds == {Number}:
+        units = {v.units for v in values}  # type: ignore
+        if len(units) == 1:
+            unit = units.pop()
+            if unit is not None:
+                colinfo.setdefault(UNIT_COLTAG, String(unit))
+            dense = np.full(n, np.nan)
+            dense[rows] = [v.value for v in values]
+            return _maybe_sparse(dense, len(rows), np.nan)
+    if kinds == {String} or kinds == {Ref}:
+        encoded = _dictionary_encode(values, lookup)
+        if encoded is not None:
+            present, categories = encoded
+            codes = np.full(n, -1, dtype=present.dtype)
+            codes[rows] = present
+            return pd.Categorical.from_codes(codes, categories)
+    obj = np.full(n, None, dtype=object)
+    if kinds == {Boolean} or kinds == {String}:
+        obj[rows] = [v.value for v in values]
+    else:
+        obj[rows] = values
+    return obj
 
 
 def _pandasify(val: Scalar) -> Any:
@@ -0,0 +1,478 @@
+"""Reading and writing Grids as Haystack JSON, a.k.a. Hayson.
+
+See https://project-haystack.org/doc/docHaystack/Json. Values other than
+strings, booleans and unitless numbers are JSON objects tagged with a
+`_kind`, e.g. `{"_kind": "number", "val": 68.5, "unit": "°F"}`.
+
+The rows of a grid are decoded a column at a time: the kinds present in a
+column are found once, and numbers, markers, strings and refs, which make up
+nearly all real data, are unpacked into numpy arrays in bulk. Other columns
+are decoded value by value into Scalars, as the Zinc reader would.
+"""
+
+import json
+import operator
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from .dtypes import (
+    Boolean,
+    Coord,
+    Datetime,
+    Marker,
+    Na,
+    Null,
+    Number,
+    Ref,
+    Remove,
+    Scalar,
+    String,
+    Uri,
+    BOOL_FALSE,
+    BOOL_TRUE,
+    MARKER,
+    NA,
+    NULL,
+    REMOVE,
+)
+from .grid import (
+    CATEGORY_RATIO,
+    ENUM_COLTAG,
+    ID_COLTAG,
+    KIND_COLTAG,
+    NUMBER_KIND,
+    TS_COLTAG,
+    TZ_COLTAG,
+    UNIT_COLTAG,
+    Grid,
+    _entity_column,
+    _maybe_sparse,
+    _sanitize_series,
+)
+from .tz import format_index, haystack_tz, iana_zone, localize
+from .zinc_parser import (
+    FilePathOrBuffer,
+    ZincErrorGridException,
+    ZincParseException,
+    _handle_buf,
+)
+
+# The `_kind` of plain JSON values
+_PLAIN_KINDS = {
+    str: 'str',
+    bool: 'bool',
+    int: 'number',
+    float: 'number',
+    type(None): None,
+}
+
+_VAL = operator.itemgetter('val')
+_UNIT = operator.methodcaller('get', 'unit')
+
+# Numbers that JSON cannot represent are written as strings
+_SPECIAL_NUMBERS = {
+    'INF': float('inf'),
+    '-INF': float('-inf'),
+    'NaN': float('nan'),
+}
+
+
+def read_json(filepath_or_buffer: FilePathOrBuffer) -> Grid:
+    """Reads a Haystack JSON (Hayson) file or buffer to a Grid.
+
+    The Grid has the same shape and types as one read from Zinc with
+    `zincio.read`, so either format can be used interchangeably.
+
+    Arguments:
+        filepath_or_buffer: str, path object, or file-like object
+            Accepts any path-like object that can be opened or a file-like
+            object that has a read() method.
+    """
+    with _handle_buf(filepath_or_buffer) as buf:
+        return _grid_from_json(json.load(buf))
+
+
+def to_json(grid: Grid) -> Dict[str, Any]:
+    """Returns `grid` as a Hayson object, ready for `json.dump`."""
+    meta: Dict[str, Any] = {'ver': f'{grid.version}.0'}
+    meta.update((k, _encode(v)) for k, v in grid.grid_info.items())
+    names = list(grid.column_info)
+    cols = [
+        {'name': name,
+         'meta': {k: _encode(v) for k, v in grid.column_info[name].items()}}
+        for name in names]
+    data = grid.data
+    values: List[List[Any]] = []
+    if TS_COLTAG in grid.column_info:
+        ts_info = grid.column_info[TS_COLTAG]
+        tz = str(ts_info[TZ_COLTAG]) if TZ_COLTAG in ts_info else None
+        values.append(_encode_ts(data.index, tz))
+        # Data columns are renamed by id, so match them by position
+        for name, col in zip(names[1:], data.columns):
+            values.append(_encode_column(
+                data[col], grid.column_info[name], False))
+    else:
+        for name in names:
+            if name == ID_COLTAG and data.index.name == ID_COLTAG:
+                values.append([
+                    None if uid is None else _encode_id(uid, grid.id_dis)
+                    for uid in data.index])
+            elif name in data.columns:
+                values.append(_encode_column(
+                    data[name], grid.column_info[name], True))
+            else:
+                values.append([None] * len(data))
+        for col in data.columns:
+            if col not in grid.column_info:
+                cols.append({'name': col, 'meta': {}})
+                names.append(col)
+                values.append(_encode_column(data[col], {}, True))
+    rows = [
+        {k: v for k, v in zip(names, row) if v is not None}
+        for row in zip(*values)]
+    return {'_kind': 'grid', 'meta': meta, 'cols': cols, 'rows': rows}
+
+
+def _grid_from_json(obj: Dict[str, Any]) -> Grid:
+    meta = dict(obj.get('meta') or {})
+    version = _check_version(meta.pop('ver', '3.0'))
+    grid_info = _decode_dict(meta)
+    if 'err' in grid_info:
+        raise ZincErrorGridException("Error grid received")
+    cols = obj.get('cols') or []
+    if not cols:
+        raise ZincParseException("No columns defined")
+    column_info: Dict[str, Dict[str, Scalar]] = {
+        col['name']: _decode_dict(col.get('meta') or {}) for col in cols}
+    rows = obj.get('rows') or []
+    columns = {name: [row.get(name) for row in rows] for name in column_info}
+    id_dis: Dict[str, str] = {}
+    if TS_COLTAG in column_info:
+        data = _his_frame(columns, column_info)
+    else:
+        data = _entity_frame(columns, column_info, len(rows), id_dis)
+    return Grid(
+        version=version,
+        grid_info=grid_info,
+        column_info=column_info,
+        data=data,
+        id_dis=id_dis)
+
+
+def _check_version(ver: Any) -> int:
+    if ver == '3.0':
+        return 3
+    if ver == '2.0':
+        return 2
+    raise ZincParseException(f"Unsupported Haystack version {ver}")
+
+
+def _his_frame(
+        columns: Dict[str, List[Any]],
+        column_info: Dict[str, Dict[str, Scalar]]) -> pd.DataFrame:
+    ts_info = column_info[TS_COLTAG]
+    tz = str(ts_info[TZ_COLTAG]) if TZ_COLTAG in ts_info else None
+    stamps = columns.pop(TS_COLTAG)
+    if tz is None:
+        tz = next((
+            v['tz'] for v in stamps if v is not None and 'tz' in v), None)
+    # The offsets fix the instants, so the text needs no zone names
+    if None in stamps:
+        text = [None if v is None else v['val'] for v in stamps]
+    else:
+        text = list(map(_VAL, stamps))
+    index = localize(pd.Series(text, dtype=object), tz)
+    index.name = TS_COLTAG
+    n = len(index)
+    data: Dict[str, Any] = {}
+    for name, values in columns.items():
+        colinfo = column_info[name]
+        kinds, rows = _kinds(values)
+        kind = colinfo.get(KIND_COLTAG)
+        if kinds <= {'number'} and (kinds or kind == NUMBER_KIND) and (
+                kind in (None, NUMBER_KIND)):
+            numbers, _ = _numbers(_take(values, rows))
+            if len(numbers) == n:
+                # Whole numbers stay integers, as for Zinc
+                data[name] = numbers
+                continue
+            dense = np.full(n, np.nan)
+            dense[rows] = numbers
+            data[name] = dense
+            continue
+        if len(kinds) == 1 and kinds <= {'str', 'ref'} and (
+                kind != NUMBER_KIND and ENUM_COLTAG not in colinfo):
+            encoded = _categorical(_take(values, rows), rows, n)
+            if encoded is not None:
+                data[name] = encoded
+                continue
+            if kinds == {'str'}:
+                # Plain strs, as in the categories of encoded columns
+                data[name] = values
+                continue
+        # Anything else is decoded and typed just as for Zinc
+        scalars = pd.Series([_decode(v) for v in values], dtype=object)
+        data[name] = _sanitize_series(scalars, colinfo).array
+    df = pd.DataFrame(data, index=index)
+    renaming = {
+        name: str(column_info[name][ID_COLTAG])
+        for name in df.columns if ID_COLTAG in column_info[name]}
+    return df.rename(columns=renaming)
+
+
+def _entity_frame(
+        columns: Dict[str, List[Any]],
+        column_info: Dict[str, Dict[str, Scalar]],
+        n: int,
+        id_dis: Dict[str, str]) -> pd.DataFrame:
+    """Builds the frame of an entity grid, indexed by `id` uid.
+
+    The display names of the ids are added to `id_dis`.
+    """
+    index = pd.RangeIndex(n)
+    data: Dict[str, Any] = {}
+    for name, values in columns.items():
+        colinfo = column_info[name]
+        kinds, rows = _kinds(values)
+        present = _take(values, rows)
+        if name == ID_COLTAG:
+            ids = np.full(n, None, dtype=object)
+            ids[rows] = [v['val'] if type(v) is dict else v for v in present]
+            index = pd.Index(ids, name=ID_COLTAG)
+            id_dis.update(
+                (v['val'], v['dis']) for v in present
+                if type(v) is dict and v.get('dis') is not None)
+            continue
+        if kinds == {'marker'}:
+            dense = np.zeros(n, dtype=bool)
+            dense[rows] = True
+            data[name] = _maybe_sparse(dense, len(rows), False)
+            continue
+        if kinds == {'number'}:
+            numbers, units = _numbers(present)
+            if len(units) == 1:
+                unit = units.pop()
+                if unit is not None:
+                    colinfo.setdefault(UNIT_COLTAG, String(unit))
+                dense = np.full(n, np.nan)
+                dense[rows] = numbers
+                data[name] = _maybe_sparse(dense, len(rows), np.nan)
+                continue
+        if kinds == {'str'} or kinds == {'ref'}:
+            encoded = _categorical(present, rows, n)
+            if encoded is not None:
+                data[name] = encoded
+                continue
+        data[name] = _entity_column(
+            [_decode(v) for v in present], rows, n, colinfo, {})
+    return pd.DataFrame(data, index=index)
+
+
+def _kinds(values: List[Any]) -> Tuple[set, np.ndarray]:
+    """Returns the kinds present in a column, and the rows holding values."""
+    kinds = np.array([
+        v.get('_kind') if type(v) is dict else _PLAIN_KINDS.get(type(v), '')
+        for v in values], dtype=object)
+    present = pd.notna(kinds)
+    return set(kinds[present]), np.flatnonzero(present)
+
+
+def _take(values: List[Any], rows: np.ndarray) -> List[Any]:
+    return values if len(rows) == len(values) else [values[i] for i in rows]
+
+
+def _numbers(values: List[Any]) -> Tuple[np.ndarray, set]:
+    """Unpacks plain or tagged numbers into their values and units.
+
+    Columns of only plain or only tagged numbers, nearly all of them, are
+    unpacked in bulk. Plain numbers stay integers if all of them are whole,
+    as for Zinc; anything else is a float, including the special numbers
+    'INF', '-INF' and 'NaN', which numpy parses along with the rest.
+    """
+    tagged = list(map(type, values)).count(dict)
+    if not tagged:
+        numbers = np.array(values)
+        if numbers.dtype.kind not in 'if':
+            # e.g. integers too large for int64
+            numbers = numbers.astype(float)
+        return numbers, {None}
+    if tagged == len(values):
+        return (
+            np.array(list(map(_VAL, values)), dtype=float),
+            set(map(_UNIT, values)))
+    vals = [v['val'] if type(v) is dict else v for v in values]
+    units = {v.get('unit') if type(v) is dict else None for v in values}
+    return np.array(
+        [_SPECIAL_NUMBERS.get(x, x) for x in vals], dtype=float), units
+
+
+def _categorical(
+        values: List[Any], rows: np.ndarray, n: int) -> Optional[Any]:
+    """Dictionary-encodes strings or refs, or returns None if too distinct.
+
+    Strings become `str` categories and refs become Ref categories, as for
+    Zinc.
+    """
+    refs = type(values[0]) is dict
+    if refs:
+        keys = [(v['val'], v.get('dis')) for v in values]
+        codes, uniques = pd.factorize(pd.Series(keys, dtype=object))
+    else:
+        codes, uniques = pd.factorize(np.array(values, dtype=object))
+    if len(uniques) > CATEGORY_RATIO * len(values):
+        return None
+    categories = [Ref(*key) for key in uniques] if refs else list(uniques)
+    dense = np.full(n, -1, dtype=np.min_scalar_type(-len(categories) - 1))
+    dense[rows] = codes
+    return pd.Categorical.from_codes(dense, categories)
+
+
+def _decode_dict(tags: Dict[str, Any]) -> Dict[str, Scalar]:
+    return {k: _decode(v) for k, v in tags.items()}
+
+
+def _decode(v: Any) -> Scalar:
+    """Decodes a single Hayson value to a Scalar."""
+    if v is None:
+        return NULL
+    if v is True:
+        return BOOL_TRUE
+    if v is False:
+        return BOOL_FALSE
+    if isinstance(v, (int, float)):
+        return Number(v)
+    if isinstance(v, str):
+        return String(v)
+    if isinstance(v, list):
+        raise NotImplementedError("List-valued Scalars not supported!")
+    kind = v.get('_kind')
+    if kind == 'marker':
+        return MARKER
+    if kind == 'na':
+        return NA
+    if kind == 'remove':
+        return REMOVE
+    if kind == 'number':
+        val = v['val']
+        return Number(_SPECIAL_NUMBERS.get(val, val), v.get('unit'))
+    if kind == 'ref':
+        return Ref(v['val'], v.get('dis'))
+    if kind == 'uri':
+        return Uri(v['val'])
+    if kind == 'dateTime':
+        ts = pd.Timestamp(v['val'])
+        tz = v.get('tz', '')
+        zone = iana_zone(tz) if tz else None
+        if zone is not None:
+            ts = ts.tz_convert(zone)
+        return Datetime(ts, tz)
+    if kind == 'coord':
+        return Coord(float(v['lat']), float(v['lng']))
+    if kind is None or kind == 'dict':
+        raise NotImplementedError("Dict-valued Scalars not supported!")
+    raise NotImplementedError(f"{kind} values not supported!")
+
+
+def _encode(v: Any) -> Any:
+    """Encodes a Scalar, or a plain value from a DataFrame, as Hayson."""
+    if v is None or v is pd.NA or isinstance(v, Null):
+        return None
+    if isinstance(v, Na):
+        return {'_kind': 'na'}
+    if isinstance(v, Marker):
+        return {'_kind': 'marker'}
+    if isinstance(v, Remove):
+        return {'_kind': 'remove'}
+    if isinstance(v, Number):
+        return _encode_number(v.value, v.units)
+    if isinstance(v, Ref):
+        out = {'_kind': 'ref', 'val': v.uid}
+        if v.display_name is not None:
+            out['dis'] = v.display_name
+        return out
+    if isinstance(v, Uri):
+        return {'_kind': 'uri', 'val': v.value}
+    if isinstance(v, Datetime):
+        out = {'_kind': 'dateTime', 'val': v.value.isoformat()}
+        if v.tz:
+            out['tz'] = v.tz
+        return out
+    if isinstance(v, Coord):
+        return {'_kind': 'coord', 'lat': v.lat, 'lng': v.lng}
+    if isinstance(v, (Boolean, String)):
+        return v.value
+    if isinstance(v, Scalar):
+        return str(v)
+    if isinstance(v, np.generic):
+        v = v.item()
+    if isinstance(v, float):
+        return None if np.isnan(v) else _encode_number(v, None)
+    return v
+
+
+def _encode_id(uid: Any, id_dis: Dict[str, str]) -> Dict[str, Any]:
+    if isinstance(uid, Ref):
+        return _encode(uid)
+    out = {'_kind': 'ref', 'val': uid}
+    if uid in id_dis:
+        out['dis'] = id_dis[uid]
+    return out
+
+
+def _encode_number(value: Any, unit: Optional[str]) -> Any:
+    if isinstance(value, float) and not np.isfinite(value):
+        value = 'NaN' if np.isnan(value) else (
+            'INF' if value > 0 else '-INF')
+    elif unit is None:
+        return value
+    out = {'_kind': 'number', 'val': value}
+    if unit is not None:
+        out['unit'] = unit
+    return out
+
+
+def _encode_ts(index: pd.DatetimeIndex, tz: Optional[str]) -> List[Any]:
+    if tz is None:
+        tz = haystack_tz(index.tz) if index.tz is not None else None
+    text = format_index(index, '')
+    # NaT is formatted empty, and written as a missing ts
+    if not tz:
+        return [{'_kind': 'dateTime', 'val': s} if s else None for s in text]
+    return [
+        {'_kind': 'dateTime', 'val': s, 'tz': tz} if s else None
+        for s in text]
+
+
+def _encode_column(
+        series: pd.Series,
+        colinfo: Dict[str, Any],
+        entity: bool) -> List[Any]:
+    """Encodes a column of data as Hayson, None where missing."""
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        cat = series.array
+        categories = np.array(
+            [_encode(c) for c in cat.categories] + [None], dtype=object)
+        # Code -1 (missing) picks the trailing None
+        return categories[cat.codes].tolist()
+    if pd.api.types.is_bool_dtype(dtype):
+        flags = series.to_numpy(dtype=bool)
+        if entity:
+            # Marker columns of entity grids
+            marker = {'_kind': 'marker'}
+            return [marker if f else None for f in flags]
+        return flags.tolist()
+    if pd.api.types.is_numeric_dtype(dtype):
+        unit = str(colinfo[UNIT_COLTAG]) if UNIT_COLTAG in colinfo else None
+        values = series.to_numpy()
+        missing = pd.isna(values)
+        numbers = values.tolist()
+        if unit is None and np.isfinite(values[~missing]).all():
+            encoded = numbers
+        else:
+            encoded = [_encode_number(x, unit) for x in numbers]
+        return [None if m else x for m, x in zip(missing, encoded)]
+    return [_encode(v) for v in series]
@@ -0,0 +1,112 @@
+"""Encoding of wide DataFrames as Zinc hisWrite requests, in bulk."""
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+
+from .dtypes import Ref
+from .tz import format_index, haystack_tz, iana_zone
+
+
+def encode_his_write(
+        df: Union[pd.DataFrame, pd.Series],
+        point_ids: Union[Mapping[Any, Any], Sequence[Any]],
+        *,
+        tz: Optional[str] = None,
+        units: Optional[Mapping[Any, str]] = None,
+        multi_point: bool = False) -> List[bytes]:
+    """Encodes the columns of a DataFrame as hisWrite grids, all at once.
+
+    The timestamps are formatted once for all points, and the values of all
+    columns in one pass over a single 2D array, so no per-point DataFrame
+    or Grid is ever made. Each payload is utf-8 Zinc, ready to be POSTed as
+    is to a Haystack server's `hisWrite` op.
+
+    Args:
+        df: Values to write, one column per point, with a DatetimeIndex. A
+            naive index is taken to be UTC. Missing values are not written.
+        point_ids: The Ref or id of the point of each column, either by
+            column name or as a sequence in column order.
+        tz: Haystack name of the time zone to write timestamps in, e.g.
+            `New_York`. Defaults to that of the index, or UTC.
+        units: Unit of each column, by column name.
+        multi_point: Whether to encode all points in one multi-point grid,
+            with columns `v0`, `v1`, etc, rather than one grid per point.
+    Returns:
+        One payload per column, in column order, or a single payload if
+        `multi_point`.
+    """
+    if isinstance(df, pd.Series):
+        df = df.to_frame()
+    if not isinstance(df.index, pd.DatetimeIndex):
+        raise ValueError("Only frames with a DatetimeIndex can be written")
+    if isinstance(point_ids, Mapping):
+        refs = [_ref(point_ids[col]) for col in df.columns]
+    else:
+        refs = [_ref(ref) for ref in point_ids]
+    if len(refs) != len(df.columns):
+        raise ValueError(
+            f"Expected {len(df.columns)} point ids, not {len(refs)}")
+    units = units or {}
+
+    ts = np.array(_format_ts(df.index, tz), dtype=object)
+    values = df.to_numpy(dtype=float, na_value=np.nan)
+    present = ~np.isnan(values)
+    text = _format_numbers(values)
+    # INF and -INF take no unit
+    finite = np.isfinite(values)
+    for j, col in enumerate(df.columns):
+        if col in units:
+            text[:, j] = np.where(
+                finite[:, j], text[:, j] + units[col], text[:, j])
+
+    if multi_point:
+        head = 'ver:"3.0"\nts,' + ','.join(
+            f'v{j} id:{ref}' for j, ref in enumerate(refs)) + '\n'
+        rows = ts
+        for j in range(len(refs)):
+            rows = rows + ',' + text[:, j]
+        return [_payload(head, rows[present.any(axis=1)])]
+
+    payloads = []
+    for j, ref in enumerate(refs):
+        rows = present[:, j]
+        payloads.append(_payload(
+            f'ver:"3.0" id:{ref}\nts,val\n', ts[rows] + ',' + text[rows, j]))
+    return payloads
+
+
+def _ref(v: Any) -> str:
+    uid = v.uid if isinstance(v, Ref) else str(v).lstrip('@')
+    return '@' + uid
+
+
+def _format_ts(index: pd.DatetimeIndex, tz: Optional[str]) -> List[str]:
+    if tz is None:
+        tz = haystack_tz(index.tz) if index.tz is not None else None
+        tz = tz or 'UTC'
+    zone = iana_zone(tz)
+    if zone is not None:
+        if index.tz is None:
+            index = index.tz_localize('UTC')
+        index = index.tz_convert(zone)
+    return format_index(index, tz)
+
+
+# Zinc spellings of the numbers numpy formats differently
+_SPECIAL: Dict[str, str] = {'inf': 'INF', '-inf': '-INF'}
+
+
+def _format_numbers(values: np.ndarray) -> np.ndarray:
+    """Formats a 2D array of floats as Zinc numbers, '' where missing."""
+    text = values.astype(str).astype(object)
+    text[np.isnan(values)] = ''
+    infinite = np.isinf(values)
+    if infinite.any():
+        text[infinite] = [_SPECIAL[s] for s in text[infinite]]
+    return text
+
+
+def _payload(head: str, rows: np.ndarray) -> bytes:
+    return (head + '\n'.join(rows) + '\n').encode('utf-8')
@@ -0,0 +1,109 @@
+"""Hash indexes over Ref uids, for vectorized joins between entity grids."""
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+from typing import Any, Iterable, Optional, Union
+
+from .dtypes import Ref
+from .tokens import TokenType
+from .zinc_tokenizer import ZincTokenizerException, tokenize
+
+
+def ref_uid(v: Any) -> Optional[str]:
+    """Returns the uid of a Ref, or a str taken to be a uid already."""
+    if isinstance(v, Ref):
+        return v.uid
+    if isinstance(v, str):
+        return v
+    return None
+
+
+def as_ref(v: Any) -> Ref:
+    """Returns a Ref as it is, or the Ref a str id stands for.
+
+    The str may be a bare uid, `@p1`, or `@p1 "Dis"`, as `zincio.read` names
+    the columns of history grids, with the display name escaped as in Zinc.
+    """
+    if isinstance(v, Ref):
+        return v
+    text = '@' + str(v).lstrip('@')
+    try:
+        found = list(tokenize(text))
+    except ZincTokenizerException:
+        found = []
+    # A single Ref token, followed by the end of the text
+    if len(found) != 2 or found[0].ttype is not TokenType.REF:
+        raise ValueError(f"Not a Ref: {v!r}")
+    uid, _, dis = found[0].val.partition(' ')
+    return Ref(uid, dis or None)
+
+
+def ref_uids(values: Union[pd.Series, pd.Index, Iterable]) -> np.ndarray:
+    """Returns an object array of the uids of `values`, None where missing.
+
+    Categorical values are converted once per category rather than once per
+    element.
+    """
+    if isinstance(values, (pd.Series, pd.Index)) and isinstance(
+            values.dtype, pd.CategoricalDtype):
+        cat = values.array
+        uids = np.array(
+            [ref_uid(c) for c in cat.categories] + [None], dtype=object)
+        # Code -1 (missing) picks the trailing None
+        return uids[cat.codes]
+    return np.array([ref_uid(v) for v in values], dtype=object)
+
+
+class RefIndex:
+    """A hash index from Ref uid to row position.
+
+    Duplicate uids resolve to their first occurrence. Build one per grid, via
+    `Grid.ref_index`, and reuse it for any number of lookups.
+    """
+
+    def __init__(self, uids: Union[pd.Index, Iterable]):
+        if isinstance(uids, pd.Index) and uids.dtype == object:
+            # Already uids, e.g. the id index of an entity grid
+            index = uids
+        else:
+            index = pd.Index(ref_uids(uids))
+        if index.is_unique:
+            self._index = index
+            self._positions: Optional[np.ndarray] = None
+        else:
+            first = np.flatnonzero(~index.duplicated())
+            self._index = index[first]
+            self._positions = first
+        # Build the hash table now rather than on first lookup
+        self._index.get_indexer(self._index[:1])
+        self._size = len(index)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, ref: Any) -> bool:
+        return ref_uid(ref) in self._index
+
+    def __repr__(self) -> str:
+        return f"RefIndex({len(self._index)} uids)"
+
+    def get(self, ref: Any) -> int:
+        """Returns the row position of `ref`, or -1 if not present."""
+        return int(self.positions([ref])[0])
+
+    def positions(
+            self, refs: Union[pd.Series, pd.Index, Iterable]) -> np.ndarray:
+        """Returns the row positions of `refs`, -1 where not present.
+
+        Args:
+            refs: Refs or uids, e.g. a `siteRef` column. Missing values map
+                to -1.
+        """
+        uids = ref_uids(refs)
+        found = self._index.get_indexer(uids)
+        # A missing ref never matches, even if some row has no id
+        found[pd.isna(uids)] = -1
+        if self._positions is not None:
+            found = np.where(found >= 0, self._positions[found], -1)
+        return found
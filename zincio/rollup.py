@@ -0,0 +1,258 @@
+"""Vectorized rollups of history grids into fixed intervals."""
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .grid import Grid, KIND_COLTAG, NUMBER_KIND, UNIT_COLTAG
+
+FOLDS = ('avg', 'min', 'max', 'sum', 'count')
+
+# The partial aggregates each fold needs, which can be merged across chunks
+_STATS = {
+    'avg': ('count', 'sum'),
+    'min': ('min',),
+    'max': ('max',),
+    'sum': ('count', 'sum'),
+    'count': ('count',),
+}
+
+_DAY = pd.Timedelta('1D').value
+
+Partials = Dict[str, np.ndarray]
+
+
+class Rollup:
+    """Rolls history grids up into fixed intervals, one chunk at a time.
+
+    Each grid added is reduced to per-interval partial aggregates right away
+    and merged into those of the grids before it, so memory is bounded by the
+    number of intervals rather than rows. This makes a Rollup a streaming
+    stage for `read_chunked`:
+
+        rollup = Rollup('15min', 'avg')
+        for chunk in zincio.read_chunked(path):
+            rollup.add(chunk)
+        grid = rollup.result()
+
+    Intervals are aligned to the wall clock in the time zone of the `ts`
+    index, so daily rollups run from local midnight to midnight, including
+    across DST transitions. Intervals without any rows are omitted.
+
+    Args:
+        interval: Width of each interval, as a `pd.Timedelta` or anything it
+            accepts, e.g. '15min' or '1h'.
+        fold: One of 'avg', 'min', 'max', 'sum' and 'count'. Numeric columns
+            are folded; other columns are only kept to be counted.
+    """
+
+    def __init__(self, interval: Union[str, pd.Timedelta], fold: str):
+        if fold not in FOLDS:
+            raise ValueError(f"fold must be one of {FOLDS}, not {fold!r}")
+        self.interval = pd.Timedelta(interval)
+        if self.interval.value <= 0:
+            raise ValueError("interval must be positive")
+        self.fold = fold
+        self._template: Optional[Grid] = None
+        self._keys = _Running(())
+        self._partials: Dict[Any, _Running] = {}
+
+    def add(self, grid: Grid) -> None:
+        """Folds the rows of a history grid into the rollup."""
+        if grid.data.index.name != 'ts':
+            raise ValueError("Only history grids with a ts index can be "
+                             "rolled up")
+        if self._template is None:
+            self._template = grid
+        keys, inv = np.unique(
+            _bin_keys(grid.data.index, self.interval.value),
+            return_inverse=True)
+        self._keys.add(keys, {})
+        # Only numeric columns can be folded other than by count
+        for col in grid.data.columns:
+            series = grid.data[col]
+            if not _foldable(series, self.fold):
+                continue
+            present = series.notna().to_numpy()
+            rows = dict(count=present.astype(float))
+            if self.fold != 'count':
+                values = series.to_numpy(dtype=float, na_value=np.nan)
+                rows.update(
+                    sum=np.where(present, values, 0.0),
+                    min=values,
+                    max=values)
+            stats = _STATS[self.fold]
+            self._partials.setdefault(col, _Running(stats)).add(
+                keys, _merge(inv, len(keys), rows, stats))
+
+    def result(self) -> Grid:
+        """Returns a Grid with one row per interval that has any rows.
+
+        Column tags, including `unit`, and the time zone are carried over
+        from the first grid added. Counts are unitless Numbers.
+        """
+        template = self._template
+        if template is None:
+            raise ValueError("No grids have been added")
+        keys, _ = self._keys.total()
+        data = {}
+        for col, running in self._partials.items():
+            # A column may be missing from chunks where it was unfoldable
+            col_keys, merged = running.total()
+            empty = 0.0 if self.fold == 'count' else np.nan
+            values = np.full(len(keys), empty)
+            values[np.searchsorted(keys, col_keys)] = _finish(
+                merged, self.fold)
+            data[col] = values
+
+        column_info: Dict[str, Dict[str, Any]] = {}
+        infos = list(template.column_info.items())
+        column_info[infos[0][0]] = dict(infos[0][1])
+        for (name, info), col in zip(infos[1:], template.data.columns):
+            if col not in data:
+                continue
+            info = dict(info)
+            if self.fold == 'count':
+                info.pop(UNIT_COLTAG, None)
+                if KIND_COLTAG in info:
+                    info[KIND_COLTAG] = NUMBER_KIND
+            column_info[name] = info
+
+        return Grid(
+            version=template.version,
+            grid_info=dict(template.grid_info),
+            column_info=column_info,
+            data=pd.DataFrame(
+                data,
+                index=_bin_index(keys, template.data.index, self.interval)))
+
+
+class _Running:
+    """The interval keys and partial aggregates of a column, as merged so far.
+
+    Chunks of a history are normally in time order, so once a chunk has been
+    added, only its last interval can still gain rows. The intervals before
+    it are closed: they are kept as they are and never merged again. Only
+    the open last interval is merged with the next chunk, unless that chunk
+    reaches back into the closed ones, when everything is merged.
+    """
+
+    def __init__(self, stats: Tuple[str, ...]):
+        self.stats = stats
+        self.closed: List[Tuple[np.ndarray, Partials]] = []
+        self.open: List[Tuple[np.ndarray, Partials]] = []
+
+    def add(self, keys: np.ndarray, partials: Partials) -> None:
+        """Merges in the partials of a chunk, keyed by sorted unique keys."""
+        if not len(keys):
+            return
+        parts = self.open + [(keys, partials)]
+        if self.closed and keys[0] <= self.closed[-1][0][-1]:
+            parts = self.closed + parts
+            self.closed = []
+        keys, merged = self._combine(parts)
+        if len(keys) > 1:
+            self.closed.append(
+                (keys[:-1], {s: v[:-1] for s, v in merged.items()}))
+        self.open = [(keys[-1:], {s: v[-1:] for s, v in merged.items()})]
+
+    def total(self) -> Tuple[np.ndarray, Partials]:
+        """Returns all keys, in order, and their partial aggregates."""
+        parts = self.closed + self.open
+        if not parts:
+            return np.empty(0, dtype=np.int64), {
+                s: np.empty(0) for s in self.stats}
+        return (
+            np.concatenate([k for k, _ in parts]),
+            {s: np.concatenate([p[s] for _, p in parts])
+             for s in self.stats})
+
+    def _combine(
+            self,
+            parts: List[Tuple[np.ndarray, Partials]]
+    ) -> Tuple[np.ndarray, Partials]:
+        keys, inv = np.unique(
+            np.concatenate([k for k, _ in parts]), return_inverse=True)
+        return keys, _merge(
+            inv, len(keys),
+            {s: np.concatenate([p[s] for _, p in parts]) for s in self.stats},
+            self.stats)
+
+
+def _foldable(series: pd.Series, fold: str) -> bool:
+    return fold == 'count' or pd.api.types.is_numeric_dtype(series.dtype)
+
+
+def _wall_and_utc_nanos(index: pd.Index) -> Tuple[np.ndarray, np.ndarray]:
+    if not isinstance(index, pd.DatetimeIndex):
+        index = pd.to_datetime(index, utc=True)
+    wall = index.tz_localize(None) if index.tz is not None else index
+    utc = index.tz_convert('UTC').tz_localize(None) if index.tz else index
+    return (
+        wall.to_numpy(dtype='datetime64[ns]').view(np.int64),
+        utc.to_numpy(dtype='datetime64[ns]').view(np.int64))
+
+
+def _bin_keys(index: pd.Index, interval: int) -> np.ndarray:
+    """Assigns each timestamp to the start of its interval.
+
+    Intervals shorter than a day are keyed by their UTC start, so the two
+    wall-clock hours repeated when DST ends stay apart. Longer intervals are
+    keyed by their wall-clock start, so a day spanning a DST transition
+    stays whole.
+    """
+    wall, utc = _wall_and_utc_nanos(index)
+    start = wall // interval * interval
+    if interval < _DAY:
+        return start - (wall - utc)
+    return start
+
+
+def _bin_index(
+        keys: np.ndarray,
+        template: pd.Index,
+        interval: pd.Timedelta) -> pd.DatetimeIndex:
+    tz = getattr(template, 'tz', None)
+    if interval.value < _DAY:
+        index = pd.DatetimeIndex(keys, tz='UTC', name='ts')
+        return index.tz_convert(tz) if tz is not None else index.tz_localize(
+            None)
+    index = pd.DatetimeIndex(keys, name='ts')
+    if tz is None:
+        return index
+    # An ambiguous wall-clock start is the earlier, DST, instant
+    return index.tz_localize(
+        tz, ambiguous=np.ones(len(keys), dtype=bool),
+        nonexistent='shift_forward')
+
+
+def _merge(
+        inv: np.ndarray,
+        n: int,
+        parts: Partials,
+        stats: Tuple[str, ...]) -> Partials:
+    """Combines the partial aggregates in `parts` by group `inv`."""
+    out: Partials = {}
+    for stat in ('count', 'sum'):
+        if stat in stats:
+            out[stat] = np.bincount(inv, weights=parts[stat], minlength=n)
+    if 'min' in stats or 'max' in stats:
+        order = np.argsort(inv, kind='stable')
+        # Every group in range(n) has at least one member
+        starts = np.flatnonzero(np.diff(inv[order], prepend=-1))
+        for stat, ufunc in (('min', np.fmin), ('max', np.fmax)):
+            if stat in stats:
+                out[stat] = ufunc.reduceat(parts[stat][order], starts)
+    return out
+
+
+def _finish(merged: Partials, fold: str) -> np.ndarray:
+    if fold == 'count':
+        return merged['count']
+    if fold == 'avg':
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return merged['sum'] / merged['count']
+    if fold == 'sum':
+        return np.where(merged['count'] > 0, merged['sum'], np.nan)
+    return merged[fold]
@@ -0,0 +1,149 @@
+"""Opt-in instrumentation for Zinc reads.
+
+Nothing in this module is touched unless a `ParseStats` instance is passed to
+`zincio.read`. Instrumentation is layered on via subclasses of the tokenizer
+and grid builder, so the uninstrumented code paths carry no extra cost.
+"""
+
+import time
+import tracemalloc
+
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+from .grid import Grid, GridBuilder
+from .tokens import Token, TokenType
+from .zinc_tokenizer import ZincTokenizer
+
+
+PHASES = ('io', 'tokenize', 'parse_values', 'build', 'sanitize', 'total')
+
+
+class ParseStats:
+    """Statistics collected while reading a Zinc grid.
+
+    Pass an instance to `zincio.read(path, stats=...)`; it is filled in as the
+    read proceeds. Note that the tokenizer and value parser are interleaved, so
+    `phase_times['tokenize']` is excluded from `phase_times['parse_values']`,
+    and whatever remains of `phase_times['total']` is spent in the parser's
+    structural bookkeeping (commas, newlines and so on).
+
+    Attributes:
+        bytes_read: Size of the Zinc input, in bytes.
+        rows: Number of grid rows parsed so far.
+        cells: Number of grid cells parsed so far.
+        tokens: Count of tokens emitted by the tokenizer, by TokenType.
+        phase_times: Wall time in seconds spent in each of `PHASES`.
+        peak_memory: Peak memory allocated during the read, in bytes, as
+            measured by `tracemalloc`. None unless `trace_memory` is set.
+    """
+
+    def __init__(
+            self,
+            *,
+            trace_memory: bool = False,
+            progress: Optional[Callable[['ParseStats'], None]] = None,
+            progress_every: int = 10000):
+        """Constructor.
+
+        Args:
+            trace_memory: bool, default False
+                Whether to measure peak allocated memory with `tracemalloc`.
+                This slows down the read considerably and skews the phase
+                timings, so it is off by default.
+            progress: callable, default None
+                Called with this object every `progress_every` rows.
+            progress_every: int, default 10000
+                Number of rows between calls to `progress`.
+        """
+        self.trace_memory = trace_memory
+        self.progress = progress
+        self.progress_every = progress_every
+        self.bytes_read: int = 0
+        self.rows: int = 0
+        self.cells: int = 0
+        self.tokens: Dict[TokenType, int] = Counter()
+        self.phase_times: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.peak_memory: Optional[int] = None
+
+    def __repr__(self) -> str:
+        times = ", ".join(f"{k}={v:.4f}s" for k, v in self.phase_times.items())
+        return (f"ParseStats(bytes_read={self.bytes_read}, rows={self.rows}, "
+                f"cells={self.cells}, tokens={sum(self.tokens.values())}, "
+                f"peak_memory={self.peak_memory}, {times})")
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Context manager adding the wall time of its body to `name`."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_times[name] += time.perf_counter() - t0
+
+    @contextmanager
+    def measure(self) -> Iterator[None]:
+        """Context manager wrapping an entire read."""
+        started = False
+        if self.trace_memory:
+            started = not tracemalloc.is_tracing()
+            if started:
+                tracemalloc.start()
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        try:
+            with self.phase('total'):
+                yield
+        finally:
+            if self.trace_memory:
+                self.peak_memory = tracemalloc.get_traced_memory()[1] - base
+                if started:
+                    tracemalloc.stop()
+
+
+class InstrumentedTokenizer(ZincTokenizer):
+    """ZincTokenizer that counts tokens and times tokenization."""
+
+    def __init__(self, buf, stats: ParseStats) -> None:
+        self._stats = stats
+        super().__init__(buf)
+
+    def __next__(self) -> Token:
+        t0 = time.perf_counter()
+        tok = super().__next__()
+        self._stats.phase_times['tokenize'] += time.perf_counter() - t0
+        self._stats.tokens[tok.ttype] += 1
+        return tok
+
+
+class InstrumentedGridBuilder(GridBuilder):
+    """GridBuilder that counts rows and cells and times the build phases."""
+
+    def __init__(self, version: int, stats: ParseStats):
+        super().__init__(version)
+        self._stats = stats
+
+    def add_row(self, row):
+        super().add_row(row)
+        stats = self._stats
+        stats.rows += 1
+        stats.cells += len(row)
+        if stats.progress is not None and (
+                stats.rows % stats.progress_every == 0):
+            stats.progress(stats)
+
+    def build(self) -> Grid:
+        with self._stats.phase('build'):
+            return super().build()
+
+    def _sanitize(self, df):
+        # Sanitization runs inside build(); keep the two phases disjoint.
+        t0 = time.perf_counter()
+        try:
+            super()._sanitize(df)
+        finally:
+            elapsed = time.perf_counter() - t0
+            self._stats.phase_times['sanitize'] += elapsed
+            self._stats.phase_times['build'] -= elapsed
@@ -1,4 +1,5 @@
 from enum import auto, Enum
+from typing import Optional, Tuple, Union
 
 
 class TokenType(Enum):
@@ -67,6 +68,21 @@ class NumberToken(Token):
         self.val = val
         self.unit_index = unit_index
 
+    def quantity(self) -> Tuple[Union[int, float], Optional[str]]:
+        """Returns the value of the number, and its unit if it has one.
+
+        Numbers with a fraction or an exponent are floats, others ints.
+
+        Raises:
+            ValueError: if the text before the unit is not a number.
+        """
+        raw, unit = self.val, None
+        if self.unit_index > 0:
+            raw, unit = self.val[:self.unit_index], self.val[self.unit_index:]
+        if '.' in raw or 'e' in raw or 'E' in raw:
+            return float(raw), unit
+        return int(raw), unit
+
     def __repr__(self):
         return (f"{self.__class__}({self.ttype.__repr__()}, "
                 f"{self.val.__repr__()}, unit_index={self.unit_index}")
@@ -0,0 +1,168 @@
+"""Streaming conversion of Zinc to other formats."""
+
+import gzip
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+from contextlib import nullcontext
+from os import PathLike
+from typing import Any, Dict, IO, Union
+
+from .dtypes import (
+    Boolean,
+    Datetime,
+    Marker,
+    Number,
+    Ref,
+    Scalar,
+    String,
+    Uri,
+    NULL,
+    NA,
+)
+from .grid import Grid, ID_COLTAG
+from .tz import format_index
+from .zinc_parser import FilePathOrBuffer, read, read_chunked
+
+FORMATS = ('csv', 'zinc.gz', 'npz')
+
+
+def transcode(
+        src: FilePathOrBuffer,
+        dst: Union[str, PathLike, IO],
+        format: str = 'csv',
+        chunksize: int = 10_000) -> int:
+    """Converts a Zinc file to another format.
+
+    For 'csv' and 'zinc.gz', rows are decoded and written out `chunksize` at
+    a time, so only one batch is ever held in memory, whatever the size of
+    the input.
+
+    CSV values are written plainly, for loaders that know nothing of
+    Haystack: numbers without their units, markers as True, refs, including
+    the `id` index of entity grids, as `@id`, and timestamps, including the
+    `ts` index, as ISO 8601 in UTC.
+
+    'npz' writes a compressed NumPy archive, which needs the whole grid in
+    memory. It holds the `index` (datetime64 in UTC for history grids), the
+    `columns` names, and each column as `c0`, `c1`, etc: numbers as floats
+    without units, and anything else as strings, written as for CSV.
+
+    Arguments:
+        src: Path or buffer of the Zinc grid to convert.
+        dst: Path to write to, or a buffer: text for 'csv', binary
+            otherwise.
+        format: Output format, one of 'csv', 'zinc.gz' and 'npz'.
+        chunksize: Number of rows per batch.
+    Returns:
+        The number of rows written.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"format must be one of {FORMATS}, not {format!r}")
+    if format == 'npz':
+        return _write_npz(read(src), dst)
+    out: Any
+    if format == 'csv':
+        if isinstance(dst, (str, PathLike)):
+            out = open(dst, 'w', encoding='utf-8', newline='')
+        else:
+            out = nullcontext(dst)
+    else:
+        out = gzip.open(dst, 'wt', encoding='utf-8')
+    rows = 0
+    with out as f:
+        for i, chunk in enumerate(read_chunked(src, chunksize)):
+            if format == 'csv':
+                frame = _plain_frame(chunk.data)
+                frame.to_csv(
+                    f, header=i == 0, index=frame.index.name is not None)
+            else:
+                chunk._write_zinc(f, header=i == 0)
+            rows += len(chunk.data)
+    return rows
+
+
+def _write_npz(grid: Grid, dst: Union[str, PathLike, IO]) -> int:
+    frame = _plain_frame(grid.data, datetimes=False)
+    index = frame.index
+    arrays: Dict[str, np.ndarray] = {}
+    if isinstance(index, pd.DatetimeIndex):
+        if index.tz is not None:
+            index = index.tz_convert('UTC').tz_localize(None)
+        arrays['index'] = index.to_numpy(dtype='datetime64[ns]')
+    else:
+        arrays['index'] = _strings(index)
+    arrays['columns'] = np.array([str(c) for c in frame.columns])
+    for i, col in enumerate(frame.columns):
+        values = frame[col]
+        if values.dtype == object:
+            arrays[f'c{i}'] = _strings(values)
+        else:
+            arrays[f'c{i}'] = values.to_numpy()
+    if isinstance(dst, (str, PathLike)):
+        # np.savez_compressed would append .npz to a name without it
+        with open(dst, 'wb') as f:
+            np.savez_compressed(f, **arrays)
+    else:
+        np.savez_compressed(dst, **arrays)
+    return len(frame)
+
+
+def _strings(values: Any) -> np.ndarray:
+    return pd.Series(values, dtype=object).fillna('').astype(str).to_numpy(
+        dtype=str)
+
+
+def _plain_frame(df: pd.DataFrame, datetimes: bool = True) -> pd.DataFrame:
+    """Returns `df` with Haystack values replaced by plain ones.
+
+    See `transcode` for how each kind of value is written. Unless
+    `datetimes`, a DatetimeIndex is left as it is.
+    """
+    data = {}
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            cat = series.array
+            plain = np.array(
+                [_plain(c) for c in cat.categories] + [None], dtype=object)
+            # Code -1 (missing) picks the trailing None
+            data[col] = plain[cat.codes]
+        elif series.dtype == object:
+            data[col] = series.map(_plain).to_numpy()
+        elif pd.api.types.is_bool_dtype(series.dtype):
+            data[col] = series.to_numpy(dtype=bool)
+        else:
+            # Each batch infers its own dtypes; floats keep them consistent
+            data[col] = series.to_numpy(dtype=float, na_value=np.nan)
+    index = df.index
+    if datetimes and isinstance(index, pd.DatetimeIndex):
+        index = pd.Index(
+            format_index(index.tz_convert('UTC') if index.tz else index, ''),
+            name=index.name)
+    elif index.name == ID_COLTAG:
+        # Ids are bare uids in the index, but written like Ref cells
+        ids = index.to_numpy(dtype=object)
+        present = pd.notna(ids)
+        ids[present] = np.char.add('@', ids[present].astype(str))
+        index = pd.Index(ids, name=index.name)
+    return pd.DataFrame(data, index=index, columns=df.columns)
+
+
+def _plain(v: Any) -> Any:
+    if v is None or v is NULL or v is NA:
+        return None
+    if not isinstance(v, Scalar):
+        return v
+    if isinstance(v, Datetime):
+        ts = v.value
+        ts = ts.tz_convert('UTC') if ts.tzinfo else ts.tz_localize('UTC')
+        return ts.isoformat().replace('+00:00', 'Z')
+    if isinstance(v, Ref):
+        return '@' + v.uid
+    if isinstance(v, Marker):
+        return True
+    if isinstance(v, (Number, String, Uri, Boolean)):
+        return v.value
+    return str(v)
@@ -0,0 +1,253 @@
+"""Mapping between Haystack time zone names and IANA time zones.
+
+Haystack names a time zone by the city part of its IANA name, e.g.
+`Los_Angeles` for `America/Los_Angeles`, or `GMT+5` for `Etc/GMT+5`.
+"""
+
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+try:
+    from zoneinfo import available_timezones
+except ImportError:  # Python < 3.9
+    from pytz import all_timezones_set  # type: ignore
+
+    def available_timezones():  # type: ignore
+        return all_timezones_set
+
+# IANA regions whose zones have Haystack names
+_REGIONS = {
+    'Africa', 'America', 'Antarctica', 'Arctic', 'Asia', 'Atlantic',
+    'Australia', 'Europe', 'Indian', 'Pacific', 'Etc',
+}
+
+
+@lru_cache(maxsize=1)
+def _zones() -> Dict[str, str]:
+    zones: Dict[str, str] = {}
+    # Sorted, so that a name found in several regions maps predictably
+    for name in sorted(available_timezones()):
+        region, _, rest = name.partition('/')
+        if region in _REGIONS and rest:
+            zones.setdefault(rest.rsplit('/', 1)[-1], name)
+    zones['UTC'] = 'Etc/UTC'
+    return zones
+
+
+@lru_cache(maxsize=None)
+def iana_zone(name: str) -> Optional[str]:
+    """Returns the IANA zone for a Haystack time zone name, if there is one.
+
+    Names that are already IANA zones are returned as they are.
+    """
+    if name in _zones():
+        return _zones()[name]
+    if '/' in name and name in available_timezones():
+        return name
+    return None
+
+
+@lru_cache(maxsize=None)
+def haystack_tz(zone: Any) -> Optional[str]:
+    """Returns the Haystack name of a time zone, or None if it has none.
+
+    Args:
+        zone: An IANA zone name, or a tzinfo as found on a tz-aware index.
+    """
+    name = str(zone)
+    if name in ('UTC', 'Etc/UTC'):
+        return 'UTC'
+    city = name.rsplit('/', 1)[-1]
+    if _zones().get(city) is not None and '/' in name:
+        return city
+    return None
+
+
+# Rows below which a series is simply parsed, string by string
+_MIN_REGULAR_ROWS = 8
+# Expected timestamps formatted at a time when checking a regular series
+_CHECK_ROWS = 65_536
+_DAY_NS = 86_400 * 1_000_000_000
+# Since pandas 2.0, to_datetime holds all strings to the format of the first
+# unless told they are ISO 8601, e.g. with and without fractional seconds
+_ISO8601: Dict[str, str] = (
+    {'format': 'ISO8601'} if int(pd.__version__.split('.')[0]) >= 2 else {})
+
+
+def localize(text: Any, tz: Optional[str] = None) -> pd.DatetimeIndex:
+    """Parses Zinc datetimes into a tz-aware index, in one vectorized step.
+
+    Most history is sampled at a fixed interval. Such a series is recognised
+    from a handful of parsed timestamps and confirmed by formatting the
+    timestamps it should hold and comparing them with the text, which is
+    many times faster than parsing each string. An irregular first or last
+    sample, as when a history starts or ends between intervals, does not
+    prevent this.
+
+    Args:
+        text: Zinc datetime strings, e.g. `2020-11-01T01:30:00-07:00
+            Los_Angeles`. The Haystack time zone name is optional. Missing
+            values, None or NaN, become NaT.
+        tz: The Haystack name of the time zone to convert to. Defaults to the
+            name in the first string.
+    Returns:
+        A DatetimeIndex in the IANA zone for `tz`. The UTC offsets in the
+        strings fix the instants, so this is exact across DST transitions.
+        If the zone is unknown, the index is in UTC. The index of a series
+        at a fixed interval throughout has its `freq` set to the interval.
+    """
+    values = pd.Series(text, dtype=object).to_numpy()
+    if tz is None:
+        first = next((v for v in values if isinstance(v, str)), None)
+        tz = _zone_name(first) if first is not None else None
+    zone = iana_zone(tz) if isinstance(tz, str) else None
+    index = _localize_regular(values, zone or 'UTC')
+    if index is None:
+        index = _localize_each(values, zone or 'UTC')
+    return index
+
+
+def _localize_each(values: np.ndarray, zone: str) -> pd.DatetimeIndex:
+    parts = pd.Series(values, dtype=object).str.split(' ', n=1, expand=True)
+    # Splitting no strings at all yields no columns
+    stamps = parts[0].to_numpy() if parts.shape[1] else []
+    utc = pd.DatetimeIndex(pd.to_datetime(stamps, utc=True, **_ISO8601))
+    return utc.tz_convert(zone)
+
+
+def _localize_regular(
+        values: np.ndarray, zone: str) -> Optional[pd.DatetimeIndex]:
+    """Localizes a series at a fixed interval, or returns None if it is not.
+
+    The interval is that between the second and third timestamps. The first
+    and last timestamps may be off it.
+    """
+    n = len(values)
+    if n < _MIN_REGULAR_ROWS:
+        return None
+    ends = _localize_each(values[[0, 1, 2, n - 2, n - 1]], zone)
+    if ends.hasnans:
+        return None
+    step = ends[2] - ends[1]
+    if step <= pd.Timedelta(0):
+        return None
+    lo = 0 if ends[1] - ends[0] == step else 1
+    hi = n if ends[4] - ends[3] == step else n - 1
+    if ends[3] - ends[1] != step * (n - 3):
+        return None
+    # Formatted in the zone named in the text, to compare like with like.
+    # Text without a name can only be compared in the zone converted to.
+    name = _zone_name(values[lo])
+    text_zone = iana_zone(name) if name else zone
+    if text_zone is None:
+        return None
+    regular = pd.date_range(
+        ends[lo].tz_convert(text_zone), periods=hi - lo, freq=step)
+    for start in range(0, hi - lo, _CHECK_ROWS):
+        expected = format_index(
+            regular[start:start + _CHECK_ROWS], name or '')
+        found = values[lo + start:lo + start + len(expected)]
+        if not (np.array(expected, dtype=object) == found).all():
+            return None
+    regular = regular.tz_convert(zone)
+    if lo == 0 and hi == n:
+        return regular
+    head = ends[:1] if lo else ends[:0]
+    tail = ends[4:] if hi < n else ends[:0]
+    return head.append(regular).append(tail)
+
+
+def _zone_name(text: str) -> Optional[str]:
+    # The Haystack name after the datetime, if any
+    parts = text.split(' ', 1)
+    return parts[1] if len(parts) > 1 else None
+
+
+def format_index(index: pd.DatetimeIndex, tz: Optional[str] = None) -> List:
+    """Formats a DatetimeIndex as Zinc datetimes, in bulk.
+
+    Args:
+        index: A tz-aware DatetimeIndex. A naive index is taken to be UTC.
+        tz: The Haystack time zone name to append. Defaults to the name of
+            the index's time zone.
+    Returns:
+        The formatted timestamps, with an empty string, a null cell in Zinc,
+        for each NaT.
+    """
+    missing = np.asarray(index.isna())
+    if missing.any():
+        text = np.full(len(index), '', dtype=object)
+        text[~missing] = format_index(index[~missing], tz)
+        return list(text)
+    if index.tz is None:
+        index = index.tz_localize('UTC')
+    if tz is None:
+        tz = haystack_tz(index.tz)
+    wall = index.tz_localize(None).to_numpy(dtype='datetime64[ns]')
+    utc = index.tz_convert('UTC').tz_localize(None).to_numpy(
+        dtype='datetime64[ns]')
+    nanos = wall.view(np.int64)
+    unit: Any
+    if not (nanos % 1_000_000_000).any():
+        unit = 's'
+    elif not (nanos % 1_000_000).any():
+        unit = 'ms'
+    else:
+        unit = 'ns'
+    out = None
+    if index.freq is not None or _steady(utc.view(np.int64)):
+        out = _format_by_day(nanos, unit)
+    if out is None:
+        out = np.datetime_as_string(wall, unit=unit).astype(object)
+    # Few distinct offsets occur, so format each once
+    offsets, inv = np.unique(
+        (nanos - utc.view(np.int64)) // 60_000_000_000, return_inverse=True)
+    out += np.array([_format_offset(m) for m in offsets], dtype=object)[inv]
+    if tz:
+        out += ' ' + tz
+    return list(out)
+
+
+def _steady(nanos: np.ndarray) -> bool:
+    """Whether instants are at a fixed interval, but for the first and last.
+    """
+    if len(nanos) < _MIN_REGULAR_ROWS:
+        return False
+    steps = np.diff(nanos[1:-1])
+    return bool(steps[0] > 0 and (steps == steps[0]).all())
+
+
+def _format_by_day(nanos: np.ndarray, unit: Any) -> Optional[np.ndarray]:
+    """Formats wall times at a fixed interval, a day and a time at a time.
+
+    Such a series repeats the same few times of day over a run of days, so
+    each day and each distinct time of day is formatted only once. Returns
+    None where that would save little, e.g. for a series of a few rows
+    spread over years.
+    """
+    if not len(nanos):
+        return None
+    days = nanos // _DAY_NS
+    first, last = days.min(), days.max()
+    if last - first >= len(nanos):
+        return None
+    times, inv = np.unique(nanos - days * _DAY_NS, return_inverse=True)
+    if len(times) > len(nanos) // 2:
+        return None
+    dates = np.datetime_as_string(
+        np.arange(first, last + 1).astype('datetime64[D]'))
+    # 1970-01-01T12:34:56 to T12:34:56
+    clock = np.datetime_as_string(times.astype('datetime64[ns]'), unit=unit)
+    clock = np.array([t[10:] for t in clock], dtype=object)
+    return dates.astype(object)[days - first] + clock[inv]
+
+
+def _format_offset(minutes: int) -> str:
+    if minutes == 0:
+        return 'Z'
+    sign = '-' if minutes < 0 else '+'
+    hours, mins = divmod(abs(int(minutes)), 60)
+    return f'{sign}{hours:02d}:{mins:02d}'
@@ -1,7 +1,8 @@
 import io
+import time
 from os import PathLike
 import pandas as pd  # type: ignore
-from typing import Dict, IO, List, Optional, Union
+from typing import Any, Dict, IO, Iterator, List, Optional, Union, cast
 
 from .dtypes import (
     NULL,
@@ -21,13 +22,20 @@ from .dtypes import (
     Uri,
     XStr,
 )
-from .grid import Grid, GridBuilder
+from .cache import DEFAULT_CACHE, GridCache
+from .column_stats import compute_column_stats
+from .grid import Grid, GridBuilder, LazyGrid, _source_identity
 from . import tokens
+from .stats import InstrumentedGridBuilder, InstrumentedTokenizer, ParseStats
 from .tokens import NumberToken, Token, TokenType
+from .tz import iana_zone
 from .zinc_tokenizer import ZincTokenizer
 
 # Type alias
-FilePathOrBuffer = Union[str, bytes, int, PathLike, io.StringIO]
+FilePathOrBuffer = Union[str, bytes, int, PathLike, io.TextIOBase]
+
+# Token types whose values repeat down a column, and so are interned
+_INTERNED_TYPES = (TokenType.STRING, TokenType.REF)
 
 
 class ZincParseException(Exception):
@@ -49,29 +57,188 @@ def parse(s: Union[bytes, str]) -> Grid:
     return read(io.StringIO(s))
 
 
-def read(filepath_or_buffer: FilePathOrBuffer) -> Grid:
+def read(
+        filepath_or_buffer: FilePathOrBuffer,
+        lazy: bool = False,
+        stats: Optional[ParseStats] = None,
+        cache: Union[bool, GridCache] = False,
+        column_stats: bool = False) -> Grid:
     """Reads utf-8 encoded Zinc file or buffer to a Grid.
 
     Arguments:
         filepath_or_buffer: str, path object, or file-like object
             Accepts any path-like object that can be opened or a file-like
             object that has a read() method.
+        lazy: bool, default False
+            If True, only the grid meta and column definitions are parsed up
+            front. The rows are parsed the first time the Grid's data is
+            accessed, and writing an untouched Grid back to Zinc copies the
+            original content through verbatim.
+        stats: ParseStats, default None
+            If provided, it is populated with byte, row, cell and token
+            counts, per-phase timings and (optionally) peak memory for this
+            read. For lazy reads, it is populated when the rows are parsed.
+            Cannot be combined with `cache`, as a hit parses nothing.
+        cache: bool or GridCache, default False
+            If True, serve the Grid from the process-wide cache, parsing and
+            caching it on a miss. A GridCache instance may be passed to use
+            that cache instead. Only file paths can be cached, and not in
+            combination with `lazy` or `stats`. Each call returns a private
+            copy that may be modified freely.
+        column_stats: bool, default False
+            If True, the count, null count, min, max, sum and first and last
+            timestamps of each column are gathered as the columns are built,
+            into the Grid's `column_stats`. See `zincio.ColumnStats`.
     """
+    if cache is not False:
+        if lazy:
+            raise ValueError("cache cannot be combined with lazy")
+        if stats is not None:
+            raise ValueError("cache cannot be combined with stats")
+        if not isinstance(filepath_or_buffer, (str, bytes, PathLike)):
+            raise ValueError("Only file paths can be cached")
+        grid_cache = DEFAULT_CACHE if cache is True else cache
+        grid = grid_cache.get(
+            filepath_or_buffer,
+            lambda path: read(path, column_stats=column_stats))
+        if column_stats and grid.column_stats is None:
+            # Cached by a read that did not ask for them
+            grid.column_stats = compute_column_stats(grid.data)
+        return grid
+    if lazy:
+        return _read_lazy(filepath_or_buffer, stats, column_stats)
+    if stats is not None:
+        return _read_instrumented(filepath_or_buffer, stats, column_stats)
     with _handle_buf(filepath_or_buffer) as buf:
-        return ZincParser(ZincTokenizer(buf)).parse()
+        return ZincParser(ZincTokenizer(buf), column_stats).parse()
+
+
+def read_chunked(
+        filepath_or_buffer: FilePathOrBuffer,
+        chunksize: int = 100_000,
+        column_stats: bool = False) -> Iterator[Grid]:
+    """Reads a Zinc file or buffer as a sequence of Grids of bounded size.
+
+    Rows are parsed incrementally, so only one chunk is held in memory at a
+    time, however large the input.
+
+    Arguments:
+        filepath_or_buffer: str, path object, or file-like object
+            Accepts any path-like object that can be opened or a file-like
+            object that has a read() method.
+        chunksize: int, default 100000
+            Maximum number of rows per Grid.
+        column_stats: bool, default False
+            If True, each Grid has the `column_stats` of its rows, which
+            `zincio.merge_column_stats` combines into those of the whole.
+    Returns:
+        An iterator of Grids, each with the full grid and column metadata
+        and up to `chunksize` consecutive rows. A grid without rows yields a
+        single empty Grid.
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be positive")
+    buf = _handle_buf(filepath_or_buffer)
+    return ZincParser(
+        ZincTokenizer(buf), column_stats).parse_chunks(chunksize)
+
+
+def iter_grids(filepath_or_buffer: FilePathOrBuffer) -> Iterator[Grid]:
+    """Reads a Zinc file or buffer holding any number of grids in sequence.
+
+    Batch exports and archives often hold many grids back to back, separated
+    by blank lines or not at all. Grids are parsed one at a time from a single
+    pass over the input, and each is yielded as soon as it is complete, so
+    only one is held in memory at a time. Since Grids can be pickled, they can
+    be handed straight to worker processes as they are read:
+
+        with ProcessPoolExecutor() as pool:
+            results = pool.map(summarize, zincio.iter_grids(path))
+
+    Arguments:
+        filepath_or_buffer: str, path object, or file-like object
+            Accepts any path-like object that can be opened or a file-like
+            object that has a read() method.
+    Returns:
+        An iterator of the Grids, in order.
+    """
+    buf = _handle_buf(filepath_or_buffer)
+    return ZincParser(ZincTokenizer(buf)).parse_grids()
+
+
+def read_all(filepath_or_buffer: FilePathOrBuffer) -> List[Grid]:
+    """Reads every grid of a Zinc file or buffer holding several.
+
+    See `iter_grids`, which yields them one at a time instead.
+    """
+    return list(iter_grids(filepath_or_buffer))
+
+
+def _read_instrumented(
+        filepath_or_buffer: FilePathOrBuffer,
+        stats: ParseStats,
+        column_stats: bool = False) -> Grid:
+    with stats.measure():
+        # Read everything up front so that I/O is timed separately from the
+        # tokenizer, which would otherwise interleave the two.
+        with stats.phase('io'):
+            if isinstance(filepath_or_buffer, io.TextIOBase):
+                text = filepath_or_buffer.read()
+                filepath_or_buffer.close()
+                stats.bytes_read = len(text.encode())
+            else:
+                with open(filepath_or_buffer, 'rb') as f:
+                    raw = f.read()
+                stats.bytes_read = len(raw)
+                text = raw.decode('utf-8')
+        tokenizer = InstrumentedTokenizer(io.StringIO(text), stats)
+        return _InstrumentedZincParser(
+            tokenizer, stats, column_stats).parse()
+
+
+def _read_lazy(
+        filepath_or_buffer: FilePathOrBuffer,
+        stats: Optional[ParseStats] = None,
+        column_stats: bool = False) -> LazyGrid:
+    if isinstance(filepath_or_buffer, (str, bytes, PathLike)):
+        path = filepath_or_buffer
+        # Taken before the header is read, so no change can slip in between
+        identity = _source_identity(path)
+        with _handle_buf(path) as buf:
+            gb = ZincParser(ZincTokenizer(buf)).parse_header()
+        return LazyGrid(
+            version=gb.version,
+            grid_info=gb.grid_meta,
+            column_info=gb.col_meta,
+            loader=lambda: read(
+                path, stats=stats, column_stats=column_stats),
+            source_path=path,
+            source_identity=identity)
+    # Buffers can only be consumed once, so hold on to their content.
+    with _handle_buf(filepath_or_buffer) as buf:
+        text = buf.read()
+    gb = ZincParser(ZincTokenizer(io.StringIO(text))).parse_header()
+    return LazyGrid(
+        version=gb.version,
+        grid_info=gb.grid_meta,
+        column_info=gb.col_meta,
+        loader=lambda: read(
+            io.StringIO(text), stats=stats, column_stats=column_stats),
+        source_text=text)
 
 
 def _handle_buf(filepath_or_buffer: FilePathOrBuffer) -> IO:
-    if isinstance(filepath_or_buffer, io.StringIO):
-        return filepath_or_buffer
+    if isinstance(filepath_or_buffer, io.TextIOBase):
+        return cast(IO, filepath_or_buffer)
     return open(filepath_or_buffer, encoding="utf-8")
 
 
 class ZincParser:
     """ZincParser parses a Zinc-format string into a Grid."""
 
-    def __init__(self, tokenizer: ZincTokenizer):
+    def __init__(self, tokenizer: ZincTokenizer, column_stats: bool = False):
         self._tokenizer: ZincTokenizer = tokenizer
+        self._column_stats = column_stats
         self._cur: Token = tokens.EOF
         self._peek: Token = tokens.EOF
         self._cur_line: int = 0
@@ -88,7 +255,92 @@ class ZincParser:
         finally:
             self._tokenizer._buf.close()
 
+    def parse_header(self) -> GridBuilder:
+        """Parses only the grid meta and column definitions.
+
+        The returned GridBuilder has its grid and column metadata populated,
+        but no rows. The parser is left positioned at the first row.
+        """
+        try:
+            return self._parse_header()
+        finally:
+            self._tokenizer._buf.close()
+
+    def parse_chunks(self, chunksize: int) -> Iterator[Grid]:
+        """Parses the grid as Grids of up to `chunksize` rows each."""
+        try:
+            header = self._parse_header()
+            more, first = True, True
+            while more:
+                gb = self._builder_like(header)
+                more = self._parse_rows(gb, chunksize)
+                if gb.num_rows or first:
+                    yield gb.build()
+                first = False
+            self._verify_eq(tokens.EOF)
+        finally:
+            self._tokenizer._buf.close()
+
+    def parse_rows(self, header: GridBuilder) -> Grid:
+        """Parses rows alone, as those of a grid whose header was parsed
+        earlier by `parse_header`.
+
+        Blank lines are skipped rather than taken to end the grid.
+        """
+        try:
+            gb = self._builder_like(header)
+            while self._cur is not tokens.EOF:
+                while self._cur is tokens.NEWLINE:
+                    self._consume()
+                if self._at_grid_start():
+                    raise ZincParseException("Unexpected grid header in rows")
+                self._parse_rows(gb)
+            return gb.build()
+        finally:
+            self._tokenizer._buf.close()
+
+    def parse_row(self) -> List[Scalar]:
+        """Parses the cells of a single row, with no header to go by.
+
+        Empty cells are NULL. A trailing empty cell is left out.
+        """
+        try:
+            cells: List[Scalar] = []
+            while self._cur not in (tokens.NEWLINE, tokens.EOF):
+                if self._cur is tokens.COMMA:
+                    cells.append(NULL)
+                else:
+                    cells.append(self._parse_val())
+                if self._cur is tokens.COMMA:
+                    self._consume()
+            if self._cur is tokens.NEWLINE:
+                self._consume()
+            self._verify_eq(tokens.EOF)
+            return cells
+        finally:
+            self._tokenizer._buf.close()
+
+    def parse_grids(self) -> Iterator[Grid]:
+        """Parses a stream of grids, yielding each as soon as it is parsed.
+
+        Grids may be separated by blank lines or follow each other directly.
+        """
+        try:
+            while True:
+                while self._cur is tokens.NEWLINE:
+                    self._consume()
+                if self._cur is tokens.EOF:
+                    return
+                yield self._parse_grid()
+        finally:
+            self._tokenizer._buf.close()
+
     def _parse_grid(self) -> Grid:
+        gb = self._parse_header()
+        self._parse_rows(gb)
+        return gb.build()
+
+    def _parse_header(self) -> GridBuilder:
         def _check_version(s: String):
             if s == String('3.0'):
                 return 3
@@ -102,7 +354,8 @@ class ZincParser:
         self._consume()
         self._consume_i(tokens.COLON)
 
-        gb = GridBuilder(_check_version(self._consume_str()))
+        gb = self._new_builder(_check_version(self._consume_str()))
+        gb.gather_stats = self._column_stats
 
         # Grid meta
         if self._cur.ttype is TokenType.ID:
@@ -128,19 +381,56 @@ class ZincParser:
         if num_cols == 0:
             raise ZincParseException("No columns defined")
         self._consume_i(tokens.NEWLINE)
-
-        # Grid rows
+        return gb
+
+    def _new_builder(self, version: int) -> GridBuilder:
+        return GridBuilder(version)
+
+    def _builder_like(self, header: GridBuilder) -> GridBuilder:
+        """Returns an empty builder with the metadata of `header`."""
+        gb = self._new_builder(header.version)
+        gb.gather_stats = self._column_stats
+        gb.add_meta(dict(header.grid_meta))
+        for colname, col_meta in header.col_meta.items():
+            gb.add_col(colname, dict(col_meta))
+        return gb
+
+    def _parse_rows(
+            self, gb: GridBuilder, max_rows: Optional[int] = None) -> bool:
+        """Parses rows into `gb`, stopping after `max_rows` if given.
+
+        Returns:
+            Whether there may be more rows to parse.
+        """
+        num_cols = len(gb.col_meta)
+        # The builder may drop a column's dictionary at any row
+        value_dicts = gb.value_dicts
+        ts_col = -1 if gb.entity else list(gb.col_meta).index('ts')
         while True:
             if self._cur in (tokens.NEWLINE, tokens.EOF):
                 break
+            if self._at_grid_start():
+                # The next grid of a stream follows without a blank line
+                break
+            if max_rows is not None and gb.num_rows >= max_rows:
+                return True
 
             # read cells
-            cells: List[Scalar] = []
+            cells: List[Any] = []
             for i in range(num_cols):
                 if self._cur in (tokens.COMMA, tokens.NEWLINE, tokens.EOF):
                     cells.append(NULL)
+                elif i == ts_col and self._cur.ttype is TokenType.DATETIME:
+                    # Left as text for the builder to convert in bulk
+                    cells.append(self._cur.val)
+                    self._consume()
                 else:
-                    cells.append(self._parse_val())
+                    lookup = value_dicts[i]
+                    if (lookup is not None
+                            and self._cur.ttype in _INTERNED_TYPES):
+                        cells.append(self._parse_interned(lookup))
+                    else:
+                        cells.append(self._parse_val())
                 if i + 1 < num_cols:
                     self._consume_i(tokens.COMMA)
             gb.add_row(cells)
@@ -151,8 +441,25 @@ class ZincParser:
 
         if self._cur is tokens.NEWLINE:
             self._consume_i(tokens.NEWLINE)
-
-        return gb.build()
+        return False
+
+    def _at_grid_start(self) -> bool:
+        return (self._cur.ttype is TokenType.ID and self._cur.val == 'ver'
+                and self._peek is tokens.COLON)
+
+    def _parse_interned(self, lookup: Dict[Any, Scalar]) -> Scalar:
+        """Parses a Str or Ref, reusing the Scalar parsed from equal text.
+
+        The dictionary is keyed by token type as well as text, since a Str
+        and a Ref, e.g. `"abc"` and `@abc`, have the same token text.
+        """
+        key = (self._cur.ttype, self._cur.val)
+        val = lookup.get(key)
+        if val is None:
+            val = lookup[key] = self._parse_val()
+        else:
+            self._consume()
+        return val
 
     def _parse_val(self) -> Scalar:
         if self._cur.ttype is TokenType.RESERVED:
@@ -177,17 +484,8 @@ class ZincParser:
             raise ZincParseException(f"Unrecognized reserved token {v}")
 
         if isinstance(self._cur, NumberToken):
-            uidx = self._cur.unit_index
-            raw = self._cur.val
-            units = None
-            if uidx > 0:
-                raw = self._cur.val[:uidx]
-                units = self._cur.val[uidx:]
             try:
-                if '.' in raw:
-                    qty = float(raw)
-                else:
-                    qty = int(raw)
+                qty, units = self._cur.quantity()
             except ValueError:
                 raise ZincParseException(
                     f"Invalid numeric token {self._cur}")
@@ -265,6 +563,9 @@ class ZincParser:
         self._consume()
         if len(parts) == 2:
             # we have a timestamp and a tz
+            zone = iana_zone(parts[1])
+            if zone is not None:
+                ts = ts.tz_convert(zone)
             return Datetime(ts, parts[1])
         if len(parts) == 1:
             return Datetime(ts)
@@ -338,3 +639,30 @@ class ZincParser:
 
         self._peek = next(self._tokenizer)
         self._peek_line = self._tokenizer.line
+
+
+class _InstrumentedZincParser(ZincParser):
+    """ZincParser that records value-parsing time and build statistics."""
+
+    def __init__(
+            self,
+            tokenizer: InstrumentedTokenizer,
+            stats: ParseStats,
+            column_stats: bool = False):
+        self._stats = stats
+        super().__init__(tokenizer, column_stats)
+
+    def _new_builder(self, version: int) -> GridBuilder:
+        return InstrumentedGridBuilder(version, self._stats)
+
+    def _parse_val(self) -> Scalar:
+        # Exclude the time spent pulling tokens, which is tracked separately
+        times = self._stats.phase_times
+        tokenize_before = times['tokenize']
+        t0 = time.perf_counter()
+        try:
+            return super()._parse_val()
+        finally:
+            elapsed = time.perf_counter() - t0
+            times['parse_values'] += (
+                elapsed - (times['tokenize'] - tokenize_before))
@@ -7,6 +7,12 @@ from .tokens import NumberToken, Token, TokenType
 
 EOF = 'EOF'
 
+# Characters that Str escape sequences stand for, by the letter after `\`
+_ESCAPES = {
+    'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t',
+    '"': '"', '$': '$', "'": "'", '`': '`', '\\': '\\',
+}
+
 
 class ZincTokenizerException(Exception):
     """An exception indicating that the string could not be tokenized."""
@@ -315,16 +321,19 @@ class ZincTokenizer(Iterator[Token]):
                     s.append(self._cur)
                     self._consume()
                 else:
-                    s.append(self._escape())
+                    s.append(self._escape(decode=False))
             else:
                 s.append(self._cur)
                 self._consume()
         return Token(TokenType.URI, ''.join(s))
 
-    def _escape(self) -> str:
+    def _escape(self, decode: bool = True) -> str:
+        """Consumes an escape sequence, returning the character it stands for,
+        or, if not `decode`, the sequence itself (as URIs keep them).
+        """
         self._consume('\\')
-        if self._cur in 'bfnrt"$\'`\\':
-            s = '\\' + self._cur  # type: str
+        if self._cur in _ESCAPES:
+            s = _ESCAPES[self._cur] if decode else '\\' + self._cur
             self._consume()
             return s
         # check for uxxxx